@@ -0,0 +1,177 @@
+from manim import *
+import numpy as np
+import yaml
+from pathlib import Path
+
+from ecel.barnes_hut import campo_desde_config
+from ecel.campo import rgba_desde_densidad
+
+# Cargar configuración desde YAML
+config_path = Path(__file__).parent / "config_ecel.yaml"
+with open(config_path, 'r') as f:
+    CONFIG = yaml.safe_load(f)
+
+
+class DosPlanetas(Scene):
+    """
+    v2.3.1 - Dos planetas acercándose (superposición de halos eCEL)
+
+    - Campo combinado de N masas (ecel/campo.py), no un halo por masa;
+      `campo.jerarquico` en el YAML lo evalúa con el quadtree (ecel/barnes_hut.py)
+    - Océano de puntos: opacidad y tamaño según densidad total
+    - Halo como textura (ImageMobject) recalculada cada frame
+      mientras los planetas se acercan
+    - Planetas y valores en la sección `dos_planetas` del YAML
+    """
+
+    def construct(self):
+        cfg = CONFIG['dos_planetas']
+        planetas_cfg = cfg['planetas']
+
+        campo = campo_desde_config(
+            CONFIG,
+            [p['posicion'] for p in planetas_cfg],
+            [p['radio_visual'] for p in planetas_cfg],
+            [p['densidad'] for p in planetas_cfg],
+        )
+
+        # Título
+        title = Text("Dos Planetas - Halos eCEL", font_size=40)
+        subtitle = Text(
+            "¿Qué pasa cuando los halos se superponen?",
+            font_size=20
+        )
+        subtitle.next_to(title, DOWN)
+
+        self.play(Write(title), Write(subtitle))
+        self.wait(CONFIG['animacion']['duracion_intro'])
+        self.play(FadeOut(title), FadeOut(subtitle))
+
+        # 1. Planetas
+        cuerpos = []
+        for p in planetas_cfg:
+            circulo = Circle(
+                radius=p['radio_visual'],
+                color=p['color'],
+                fill_opacity=0.9,
+                stroke_width=3
+            )
+            label = Text(p['nombre'], font_size=14, color=WHITE).move_to(circulo)
+            cuerpo = VGroup(circulo, label)
+            cuerpo.move_to(np.array([p['posicion'][0], p['posicion'][1], 0]))
+            cuerpos.append(cuerpo)
+
+        self.play(*[GrowFromCenter(c) for c in cuerpos], run_time=CONFIG['animacion']['duracion_masa'])
+
+        # 2. Océano de puntos con densidad combinada
+        oceano = self.crear_oceano_combinado(campo)
+
+        texto_oceano = Text(
+            "Océano eCEL: suma de desplazamientos de ambas masas",
+            font_size=20,
+            color=BLUE_A
+        ).to_edge(UP)
+
+        self.play(
+            FadeIn(oceano),
+            Write(texto_oceano),
+            run_time=CONFIG['animacion']['duracion_oceano']
+        )
+        self.wait(1)
+
+        # 3. Halo combinado como textura
+        tex_cfg = cfg['textura']
+        extent = (
+            -config.frame_width / 2, config.frame_width / 2,
+            -config.frame_height / 2, config.frame_height / 2,
+        )
+
+        def textura():
+            return campo.imagen(
+                extent, tex_cfg['ancho'], tex_cfg['alto'],
+                CONFIG['malla']['color_fondo'], CONFIG['malla']['color_acumulacion'],
+                opacidad_min=0.0,
+                opacidad_max=tex_cfg['opacidad_maxima'],
+                rho_ref=cfg['rho_ref'],
+            )
+
+        halo = ImageMobject(textura())
+        halo.stretch_to_fit_width(config.frame_width)
+        halo.stretch_to_fit_height(config.frame_height)
+        halo.move_to(ORIGIN)
+
+        self.play(FadeOut(oceano), FadeIn(halo), run_time=1.5)
+        self.bring_to_front(*cuerpos)
+
+        # 4. Acercar planetas: el halo se recalcula desde sus posiciones
+        def seguir_planetas(mob):
+            campo.mover(np.array([c.get_center() for c in cuerpos]))
+            mob.pixel_array = textura()
+
+        halo.add_updater(seguir_planetas)
+
+        texto_acerca = Text(
+            "Planetas se acercan → halos se superponen",
+            font_size=20,
+            color=GREEN
+        ).to_edge(DOWN)
+        self.play(Write(texto_acerca))
+
+        acercamiento = cfg['acercamiento']
+        self.play(
+            cuerpos[0].animate.shift(RIGHT * acercamiento),
+            cuerpos[1].animate.shift(LEFT * acercamiento),
+            run_time=cfg['duracion_acercamiento'],
+            rate_func=smooth
+        )
+        halo.clear_updaters()
+        self.wait(CONFIG['animacion']['duracion_final'])
+
+        self.play(
+            FadeOut(halo),
+            *[FadeOut(c) for c in cuerpos],
+            FadeOut(texto_oceano),
+            FadeOut(texto_acerca)
+        )
+
+    def crear_oceano_combinado(self, campo):
+        """
+        Océano eCEL de fondo con opacidad y radio según la densidad
+        combinada de todas las masas. Puntos dentro de un cuerpo no se dibujan.
+        """
+        oceano = VGroup()
+
+        espaciado = CONFIG['malla']['espaciado']
+        radio = CONFIG['malla']['radio_base'] * 0.6
+        opacidad_min = CONFIG['intensidad']['opacidad_minima']
+        opacidad_max = CONFIG['intensidad']['opacidad_maxima']
+        rho_ref = CONFIG['dos_planetas']['rho_ref']
+
+        xs, ys = np.meshgrid(np.arange(-7.5, 7.5, espaciado), np.arange(-4.5, 4.5, espaciado))
+        puntos = np.column_stack([xs.ravel(), ys.ravel()])
+        rho = campo.densidad(puntos)
+
+        t = np.clip(rho / rho_ref, 0.0, 1.0)
+        opacidades = opacidad_min + (opacidad_max - opacidad_min) * t
+        radios = radio * (1 + t)
+        colores = rgba_desde_densidad(
+            rho, CONFIG['malla']['color_fondo'], CONFIG['malla']['color_acumulacion'],
+            rho_ref=rho_ref
+        )
+
+        for (x, y), r, op, rgba, dentro in zip(puntos, radios, opacidades, colores, rho == 0):
+            if dentro:
+                continue
+            dot = Dot(
+                point=np.array([x, y, 0]),
+                radius=r,
+                color=ManimColor.from_rgb(rgba[:3] / 255),
+                fill_opacity=op
+            )
+            oceano.add(dot)
+
+        return oceano
+
+
+# Para renderizar:
+# manim -pql GravityeCEL-v2.3.1.py DosPlanetas
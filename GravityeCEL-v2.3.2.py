@@ -0,0 +1,167 @@
+from manim import *
+import numpy as np
+import yaml
+from pathlib import Path
+
+from ecel.desplazamiento import calcular_factor_desplazamiento
+from ecel.oceano import OceanoDesplazable
+
+# Cargar configuración desde YAML
+config_path = Path(__file__).parent / "config_ecel.yaml"
+with open(config_path, 'r') as f:
+    CONFIG = yaml.safe_load(f)
+
+
+class MasaEnMovimiento(Scene):
+    """
+    v2.3.2 - Movimiento bien hecho (masa cruza océano estático)
+
+    - El océano eCEL queda FIJO (posiciones base en rejilla hash)
+    - La masa se mueve; el halo se recalcula según su posición
+    - Cada frame solo se actualizan las partículas cerca de la
+      posición anterior y la nueva (radio de influencia)
+    - Desplazamiento con área conservada: el eCEL de adentro
+      se acumula en la superficie y se acomoda atrás al pasar
+    """
+
+    def construct(self):
+        nombre = CONFIG['masa_actual']['nombre']
+        densidad = CONFIG['masa_actual']['densidad']
+        radio_visual = CONFIG['masa_actual']['radio_visual']
+        color_masa = CONFIG['masa_actual']['color']
+        mov_cfg = CONFIG['movimiento']
+        factor = calcular_factor_desplazamiento(densidad)
+
+        inicio = np.array([mov_cfg['inicio'][0], mov_cfg['inicio'][1], 0])
+        fin = np.array([mov_cfg['fin'][0], mov_cfg['fin'][1], 0])
+
+        # Título
+        title = Text("Océano eCEL - Masa en Movimiento", font_size=40)
+        subtitle = Text(
+            "El océano queda quieto, el halo sigue a la masa",
+            font_size=20
+        )
+        subtitle.next_to(title, DOWN)
+
+        self.play(Write(title), Write(subtitle))
+        self.wait(CONFIG['animacion']['duracion_intro'])
+        self.play(FadeOut(title), FadeOut(subtitle))
+
+        # 1. Océano eCEL de fondo (posiciones base fijas)
+        oceano_fondo, estado = self.crear_oceano_desplazable(radio_visual, factor)
+
+        texto_oceano = Text(
+            "Océano eCEL uniforme (estado base)",
+            font_size=22,
+            color=BLUE_A
+        ).to_edge(UP)
+
+        self.play(
+            FadeIn(oceano_fondo),
+            Write(texto_oceano),
+            run_time=CONFIG['animacion']['duracion_oceano']
+        )
+
+        # 2. Masa
+        masa = Circle(
+            radius=radio_visual,
+            color=color_masa,
+            fill_opacity=0.9,
+            stroke_width=3
+        )
+        label = Text(nombre, font_size=18, color=WHITE)
+        cuerpo = VGroup(masa, label).move_to(inicio)
+
+        self.play(GrowFromCenter(cuerpo), run_time=CONFIG['animacion']['duracion_masa'])
+
+        # 3. Desplazamiento: el factor sube de 0 al de la densidad real
+        intensidad = ValueTracker(0.0)
+
+        def seguir_masa(grupo):
+            estado.factor = factor * intensidad.get_value()
+            afectados = estado.mover(masa.get_center())
+            self.aplicar_estado(grupo, estado, afectados)
+
+        oceano_fondo.add_updater(seguir_masa)
+
+        texto_desplaza = Text(
+            f"{nombre} desplaza eCEL ({factor*100:.0f}%) → se acumula en la superficie",
+            font_size=20,
+            color=GREEN
+        ).to_edge(DOWN)
+
+        self.play(
+            Write(texto_desplaza),
+            intensidad.animate.set_value(1.0),
+            run_time=CONFIG['animacion']['duracion_desplazamiento']
+        )
+        self.wait(1)
+
+        # 4. La masa cruza el océano; el eCEL se abre adelante y se acomoda atrás
+        texto_mueve = Text(
+            "eCEL se abre adelante, se acomoda atrás",
+            font_size=20,
+            color=YELLOW
+        ).to_edge(DOWN)
+
+        self.play(FadeOut(texto_desplaza), Write(texto_mueve))
+        self.play(
+            cuerpo.animate.move_to(fin),
+            run_time=mov_cfg['duracion'],
+            rate_func=smooth
+        )
+        oceano_fondo.clear_updaters()
+        self.wait(CONFIG['animacion']['duracion_final'])
+
+        self.play(
+            FadeOut(oceano_fondo),
+            FadeOut(cuerpo),
+            FadeOut(texto_oceano),
+            FadeOut(texto_mueve)
+        )
+
+    def crear_oceano_desplazable(self, radio_masa, factor):
+        """Océano eCEL de fondo + su estado de desplazamiento (sin masa aún)."""
+        oceano = VGroup()
+
+        espaciado = CONFIG['malla']['espaciado']
+        radio = CONFIG['malla']['radio_base'] * 0.6
+        opacidad = CONFIG['intensidad']['opacidad_minima']
+        color = CONFIG['malla']['color_fondo']
+
+        xs, ys = np.meshgrid(np.arange(-7.5, 7.5, espaciado), np.arange(-4.5, 4.5, espaciado))
+        puntos = np.column_stack([xs.ravel(), ys.ravel()])
+
+        for x, y in puntos:
+            dot = Dot(
+                point=np.array([x, y, 0]),
+                radius=radio,
+                color=color,
+                fill_opacity=opacidad
+            )
+            oceano.add(dot)
+
+        estado = OceanoDesplazable(
+            puntos,
+            radio_masa=radio_masa,
+            factor=factor,
+            radio_influencia=radio_masa * CONFIG['movimiento']['radio_influencia'],
+            opacidad_min=opacidad,
+            opacidad_max=CONFIG['intensidad']['opacidad_acumulacion'],
+            radio_particula=radio,
+        )
+        return oceano, estado
+
+    def aplicar_estado(self, oceano, estado, indices):
+        """Copia posición, opacidad y tamaño solo a los Dots que cambiaron."""
+        dots = oceano.submobjects
+        for i in indices:
+            dot = dots[i]
+            x, y = estado.posiciones[i]
+            dot.set_width(2 * estado.radios[i])
+            dot.move_to(np.array([x, y, 0]))
+            dot.set_fill(opacity=estado.opacidades[i])
+
+
+# Para renderizar:
+# manim -pql GravityeCEL-v2.3.2.py MasaEnMovimiento
@@ -0,0 +1,184 @@
+from manim import *
+import numpy as np
+import yaml
+from pathlib import Path
+
+from ecel.sph import FluidoSPH
+
+# Cargar configuración desde YAML
+config_path = Path(__file__).parent / "config_ecel.yaml"
+with open(config_path, 'r') as f:
+    CONFIG = yaml.safe_load(f)
+
+
+class EfectoPiscina(Scene):
+    """
+    v2.3.3 - Efecto piscina (océano eCEL como fluido)
+
+    - Las partículas del océano se simulan como fluido SPH
+    - La masa es una frontera móvil: empuja al eCEL
+    - eCEL se comprime y abre adelante, se acomoda atrás (estela)
+    - La simulación se precalcula; la animación solo copia frames
+    - Opacidad según compresión local ρ/ρ0
+    """
+
+    def construct(self):
+        nombre = CONFIG['masa_actual']['nombre']
+        radio_visual = CONFIG['masa_actual']['radio_visual']
+        color_masa = CONFIG['masa_actual']['color']
+        mov_cfg = CONFIG['movimiento']
+
+        inicio = np.array([mov_cfg['inicio'][0], mov_cfg['inicio'][1], 0])
+        fin = np.array([mov_cfg['fin'][0], mov_cfg['fin'][1], 0])
+
+        # Título
+        title = Text("Océano eCEL - Efecto Piscina", font_size=40)
+        subtitle = Text(
+            "El eCEL se abre adelante y se acomoda atrás",
+            font_size=20
+        )
+        subtitle.next_to(title, DOWN)
+
+        self.play(Write(title), Write(subtitle))
+        self.wait(CONFIG['animacion']['duracion_intro'])
+        self.play(FadeOut(title), FadeOut(subtitle))
+
+        # 1. Simulación del fluido (antes de animar)
+        duracion = mov_cfg['duracion']
+        frames_pos, frames_rho = self.simular_piscina(inicio, fin, radio_visual, duracion)
+
+        # 2. Océano eCEL de fondo
+        oceano_fondo = self.crear_oceano_fondo(frames_pos[0])
+
+        texto_oceano = Text(
+            "Océano eCEL como fluido (SPH)",
+            font_size=22,
+            color=BLUE_A
+        ).to_edge(UP)
+
+        self.play(
+            FadeIn(oceano_fondo),
+            Write(texto_oceano),
+            run_time=CONFIG['animacion']['duracion_oceano']
+        )
+
+        # 3. Masa
+        masa = Circle(
+            radius=radio_visual,
+            color=color_masa,
+            fill_opacity=0.9,
+            stroke_width=3
+        )
+        label = Text(nombre, font_size=18, color=WHITE)
+        cuerpo = VGroup(masa, label).move_to(inicio)
+
+        self.play(GrowFromCenter(cuerpo), run_time=CONFIG['animacion']['duracion_masa'])
+
+        # 4. La masa cruza; cada frame se copia el estado simulado
+        tiempo = ValueTracker(0.0)
+        n_frames = len(frames_pos)
+
+        def seguir_fluido(grupo):
+            f = min(int(round(tiempo.get_value() / duracion * (n_frames - 1))), n_frames - 1)
+            self.aplicar_frame(grupo, frames_pos[f], frames_rho[f])
+
+        def seguir_masa(grupo):
+            grupo.move_to(self.trayectoria(inicio, fin, duracion)(tiempo.get_value()))
+
+        oceano_fondo.add_updater(seguir_fluido)
+        cuerpo.add_updater(seguir_masa)
+
+        texto_mueve = Text(
+            "eCEL se comprime adelante, estela atrás",
+            font_size=20,
+            color=YELLOW
+        ).to_edge(DOWN)
+
+        self.play(Write(texto_mueve))
+        self.play(
+            tiempo.animate.set_value(duracion),
+            run_time=duracion,
+            rate_func=linear
+        )
+        oceano_fondo.clear_updaters()
+        cuerpo.clear_updaters()
+        self.wait(CONFIG['animacion']['duracion_final'])
+
+        self.play(
+            FadeOut(oceano_fondo),
+            FadeOut(cuerpo),
+            FadeOut(texto_oceano),
+            FadeOut(texto_mueve)
+        )
+
+    @staticmethod
+    def trayectoria(inicio, fin, duracion):
+        """Posición de la masa en el tiempo t (mismo perfil smooth de Manim)."""
+        def posicion(t):
+            return inicio + (fin - inicio) * smooth(np.clip(t / duracion, 0, 1))
+        return posicion
+
+    def simular_piscina(self, inicio, fin, radio_masa, duracion):
+        """Frames (posiciones, ρ/ρ0) del océano con la masa recorriendo inicio → fin."""
+        piscina = CONFIG['piscina']
+        espaciado = CONFIG['malla']['espaciado']
+
+        xs, ys = np.meshgrid(np.arange(-7.5, 7.5, espaciado), np.arange(-4.5, 4.5, espaciado))
+        puntos = np.column_stack([xs.ravel(), ys.ravel()])
+        # Sin partículas dentro del cuerpo ni en su capa de penalización (h):
+        # si no, la frontera las expulsa de golpe en los primeros pasos
+        radio_libre = max(radio_masa * piscina['min_dist_factor'],
+                          radio_masa + piscina['factor_h'] * espaciado)
+        puntos = puntos[np.linalg.norm(puntos - inicio[:2], axis=1) >= radio_libre]
+
+        fluido = FluidoSPH(
+            puntos,
+            espaciado,
+            extent=(-7.5, 7.5, -4.5, 4.5),
+            rigidez=piscina['rigidez'],
+            viscosidad=piscina['viscosidad'],
+            factor_h=piscina['factor_h'],
+            skin=piscina['skin'],
+            reconstruir_cada=piscina['reconstruir_cada'],
+        )
+        posicion = self.trayectoria(inicio, fin, duracion)
+        return fluido.simular(
+            lambda t: posicion(t)[:2],
+            radio_masa,
+            duracion,
+            fps=config.frame_rate,
+        )
+
+    def crear_oceano_fondo(self, puntos):
+        """Océano eCEL de fondo en las posiciones iniciales del fluido."""
+        oceano = VGroup()
+
+        radio = CONFIG['malla']['radio_base'] * 0.6
+        opacidad = CONFIG['intensidad']['opacidad_minima']
+        color = CONFIG['malla']['color_fondo']
+
+        for x, y in puntos:
+            dot = Dot(
+                point=np.array([x, y, 0]),
+                radius=radio,
+                color=color,
+                fill_opacity=opacidad
+            )
+            oceano.add(dot)
+
+        return oceano
+
+    def aplicar_frame(self, oceano, posiciones, rho):
+        """Mueve los Dots al frame y los aclara según la compresión."""
+        op_min = CONFIG['intensidad']['opacidad_minima']
+        op_max = CONFIG['intensidad']['opacidad_acumulacion']
+        compresion = np.clip((rho - 1) / CONFIG['piscina']['contraste'], 0, 1)
+        opacidades = op_min + (op_max - op_min) * compresion
+
+        for dot, (x, y), opacidad in zip(oceano.submobjects, posiciones, opacidades):
+            dot.move_to(np.array([x, y, 0]))
+            dot.set_fill(opacity=opacidad)
+
+
+# Para renderizar:
+# manim -pql GravityeCEL-v2.3.3.py EfectoPiscina
@@ -0,0 +1,189 @@
+from manim import *
+import numpy as np
+import yaml
+from pathlib import Path
+
+from ecel.campo import rgba_desde_densidad
+from ecel.desplazamiento import calcular_factor_desplazamiento
+from ecel.ondas import EstelaOndas
+
+# Cargar configuración desde YAML
+config_path = Path(__file__).parent / "config_ecel.yaml"
+with open(config_path, 'r') as f:
+    CONFIG = yaml.safe_load(f)
+
+
+class BowRiding(Scene):
+    """
+    v2.3.4 - Bow Riding (gravedad como surfeo de la estela)
+
+    - La masa cava un surco en la superficie del océano eCEL
+    - El surco se propaga como onda (ecuación de onda 2D)
+    - Lunas pequeñas NO se atraen: surfean la pendiente del surco
+    - Todo se precalcula; la animación solo copia frames
+    - Superficie como textura (ImageMobject), lunas como Dots
+    """
+
+    def construct(self):
+        nombre = CONFIG['masa_actual']['nombre']
+        densidad = CONFIG['masa_actual']['densidad']
+        radio_visual = CONFIG['masa_actual']['radio_visual']
+        color_masa = CONFIG['masa_actual']['color']
+        cfg = CONFIG['estela']
+        factor = calcular_factor_desplazamiento(densidad)
+
+        # Título
+        title = Text("Océano eCEL - Bow Riding", font_size=40)
+        subtitle = Text(
+            "Las lunas surfean la estela de la masa",
+            font_size=20
+        )
+        subtitle.next_to(title, DOWN)
+
+        self.play(Write(title), Write(subtitle))
+        self.wait(CONFIG['animacion']['duracion_intro'])
+        self.play(FadeOut(title), FadeOut(subtitle))
+
+        # 1. Simulación de la estela (antes de animar)
+        extent = (
+            -config.frame_width / 2, config.frame_width / 2,
+            -config.frame_height / 2, config.frame_height / 2,
+        )
+        inicio = np.array([-config.frame_width / 4, 0.0])
+        resultado = self.simular_estela(extent, inicio, radio_visual, factor)
+        n_frames = len(resultado['t'])
+        # Una sola escala de brillo para todo el video: el surco más hondo de
+        # la corrida (normalizar por frame inflaría las primeras ondas)
+        rho_ref = max(float(-resultado['altura'].min()), 1e-9)
+
+        # 2. Superficie y cuerpos
+        superficie = ImageMobject(self.textura(resultado['altura'][0], rho_ref))
+        superficie.stretch_to_fit_width(config.frame_width)
+        superficie.stretch_to_fit_height(config.frame_height)
+        superficie.move_to(ORIGIN)
+
+        masa = Circle(
+            radius=radio_visual,
+            color=color_masa,
+            fill_opacity=0.9,
+            stroke_width=3
+        )
+        label = Text(nombre, font_size=18, color=WHITE)
+        cuerpo = VGroup(masa, label).move_to([*inicio, 0])
+
+        lunas = VGroup(*[
+            Dot(point=[x, y, 0], radius=0.06, color=WHITE)
+            for x, y in resultado['cuerpos'][0]
+        ])
+
+        texto_superficie = Text(
+            "Superficie del océano eCEL (surco = más brillante)",
+            font_size=20,
+            color=BLUE_A
+        ).to_edge(UP)
+
+        self.play(
+            FadeIn(superficie),
+            GrowFromCenter(cuerpo),
+            FadeIn(lunas),
+            Write(texto_superficie),
+            run_time=CONFIG['animacion']['duracion_masa']
+        )
+
+        # 3. Reproducción: un índice de frame por tiempo
+        tiempo = ValueTracker(0.0)
+        duracion = cfg['duracion']
+
+        def frame_actual():
+            return min(int(round(tiempo.get_value() / duracion * (n_frames - 1))), n_frames - 1)
+
+        def seguir_superficie(mob):
+            mob.pixel_array = self.textura(resultado['altura'][frame_actual()], rho_ref)
+
+        def seguir_masa(mob):
+            mob.move_to([*resultado['masas'][frame_actual(), 0], 0])
+
+        def seguir_lunas(grupo):
+            for dot, (x, y) in zip(grupo, resultado['cuerpos'][frame_actual()]):
+                dot.move_to([x, y, 0])
+
+        superficie.add_updater(seguir_superficie)
+        cuerpo.add_updater(seguir_masa)
+        lunas.add_updater(seguir_lunas)
+
+        texto_surf = Text(
+            "Sin atracción: las lunas bajan por la pendiente del surco",
+            font_size=20,
+            color=YELLOW
+        ).to_edge(DOWN)
+
+        self.play(Write(texto_surf))
+        self.play(
+            tiempo.animate.set_value(duracion),
+            run_time=duracion,
+            rate_func=linear
+        )
+        for mob in (superficie, cuerpo, lunas):
+            mob.clear_updaters()
+        self.wait(CONFIG['animacion']['duracion_final'])
+
+        self.play(
+            FadeOut(superficie),
+            FadeOut(cuerpo),
+            FadeOut(lunas),
+            FadeOut(texto_superficie),
+            FadeOut(texto_surf)
+        )
+
+    def simular_estela(self, extent, inicio, radio_masa, factor):
+        """Estela de la masa que cruza el cuadro y lunas que la surfean."""
+        cfg = CONFIG['estela']
+        nx, ny = cfg['resolucion']
+        estela = EstelaOndas(
+            extent, nx, ny,
+            velocidad=cfg['velocidad'],
+            alcance=cfg['alcance'],
+            amortiguamiento=cfg['amortiguamiento'],
+            metodo=cfg['metodo'],
+        )
+
+        velocidad_masa = np.array([cfg['velocidad_masa'], 0.0])
+
+        def trayectoria(t):
+            return (inicio + velocidad_masa * t)[None, :]
+
+        # Lunas en reposo a ambos lados del camino de la masa
+        n = cfg['num_lunas']
+        xs = np.linspace(inicio[0] + 1.0, extent[1] - 1.5, n)
+        ys = np.where(np.arange(n) % 2, 1.0, -1.0) * (radio_masa + 0.6)
+        lunas = np.column_stack([xs, ys])
+
+        return estela.simular(
+            trayectoria,
+            radios=[radio_masa],
+            amplitudes=[cfg['amplitud'] * factor],
+            posiciones=lunas,
+            velocidades=np.zeros_like(lunas),
+            duracion=cfg['duracion'],
+            dt=1 / config.frame_rate,
+            acople=cfg['acople'],
+        )
+
+    def textura(self, altura, rho_ref):
+        """
+        Altura (fila 0 = y mínimo) → RGBA; más profundo = más brillante.
+        rho_ref: profundidad con brillo máximo, fija para toda la corrida.
+        """
+        profundidad = np.flipud(-altura)
+        return rgba_desde_densidad(
+            profundidad,
+            CONFIG['malla']['color_fondo'],
+            CONFIG['malla']['color_acumulacion'],
+            opacidad_min=0.15,
+            opacidad_max=CONFIG['intensidad']['opacidad_acumulacion'],
+            rho_ref=rho_ref,
+        )
+
+
+# Para renderizar:
+# manim -pql GravityeCEL-v2.3.4.py BowRiding
@@ -0,0 +1,119 @@
+from manim import *
+import yaml
+from pathlib import Path
+
+from ecel.cache import CacheGeometria
+from ecel.trayectorias import integrar_cacheado
+
+# Cargar configuración desde YAML
+config_path = Path(__file__).parent / "config_ecel.yaml"
+with open(config_path, 'r') as f:
+    CONFIG = yaml.safe_load(f)
+
+CACHE = CacheGeometria.desde_config(CONFIG)
+
+
+class TresCuerpos(Scene):
+    """
+    v2.3.5 - Problema de 3 cuerpos (trayectorias precalculadas)
+
+    - La física se integra ANTES del render (Dormand-Prince) y se
+      guarda en caché con clave = condiciones iniciales + modelo
+    - Re-renderizar con otro estilo no vuelve a integrar
+    - Frames por spline de Hermite: el updater solo indexa una tabla
+    - Órbitas dibujadas con puntos equiespaciados por longitud de arco
+    """
+
+    def construct(self):
+        cfg = CONFIG['tres_cuerpos']
+        cuerpos_cfg = cfg['cuerpos']
+
+        # Título
+        title = Text("Problema de 3 Cuerpos", font_size=40)
+        subtitle = Text(
+            "Trayectorias integradas una vez, reproducidas frame a frame",
+            font_size=20
+        )
+        subtitle.next_to(title, DOWN)
+
+        self.play(Write(title), Write(subtitle))
+        self.wait(CONFIG['animacion']['duracion_intro'])
+        self.play(FadeOut(title), FadeOut(subtitle))
+
+        # 1. Trayectoria (de caché si ya se integró con estas condiciones)
+        trayectoria = integrar_cacheado(
+            CACHE,
+            posiciones=[c['posicion'] for c in cuerpos_cfg],
+            velocidades=[c['velocidad'] for c in cuerpos_cfg],
+            modelo=cfg['modelo'],
+            params_modelo=cfg['params_modelo'],
+            duracion=cfg['duracion_fisica'],
+            muestras_por_segundo=cfg['muestras_por_segundo'],
+        )
+        tabla = trayectoria.frames(config.frame_rate, cfg['duracion'])
+        n_frames = len(tabla)
+
+        # 2. Órbitas completas (tenues) y cuerpos
+        orbitas = VGroup()
+        for b, c in enumerate(cuerpos_cfg):
+            puntos = trayectoria.por_longitud_arco(cfg['puntos_orbita'], cuerpo=b)
+            orbita = VMobject(stroke_color=c['color'], stroke_width=1.5, stroke_opacity=0.35)
+            orbita.set_points_smoothly([[x, y, 0] for x, y in puntos])
+            orbitas.add(orbita)
+
+        cuerpos = VGroup()
+        for b, c in enumerate(cuerpos_cfg):
+            cuerpo = Dot(
+                point=[*tabla[0, b], 0],
+                radius=cfg['radio_visual'],
+                color=c['color']
+            )
+            cuerpos.add(cuerpo)
+
+        texto_modelo = Text(
+            f"Modelo: {cfg['modelo']}",
+            font_size=20,
+            color=BLUE_A
+        ).to_edge(UP)
+
+        self.play(
+            Create(orbitas),
+            *[GrowFromCenter(c) for c in cuerpos],
+            Write(texto_modelo),
+            run_time=CONFIG['animacion']['duracion_masa']
+        )
+
+        # 3. Reproducción: un índice de frame por tiempo de video
+        tiempo = ValueTracker(0.0)
+        estelas = VGroup(*[
+            TracedPath(c.get_center, stroke_color=c_cfg['color'], stroke_width=3,
+                       dissipating_time=1.0)
+            for c, c_cfg in zip(cuerpos, cuerpos_cfg)
+        ])
+        self.add(estelas)
+
+        def seguir_tabla(grupo):
+            f = min(int(round(tiempo.get_value() * config.frame_rate)), n_frames - 1)
+            for b, cuerpo in enumerate(grupo):
+                cuerpo.move_to([*tabla[f, b], 0])
+
+        cuerpos.add_updater(seguir_tabla)
+
+        self.play(
+            tiempo.animate.set_value(cfg['duracion']),
+            run_time=cfg['duracion'],
+            rate_func=linear
+        )
+        cuerpos.clear_updaters()
+        self.wait(CONFIG['animacion']['duracion_final'])
+
+        self.play(
+            FadeOut(orbitas),
+            FadeOut(cuerpos),
+            FadeOut(estelas),
+            FadeOut(texto_modelo)
+        )
+
+
+# Para renderizar:
+# manim -pql GravityeCEL-v2.3.5.py TresCuerpos
@@ -0,0 +1,428 @@
+from manim import *
+import numpy as np
+import yaml
+from pathlib import Path
+
+from ecel.cache import CacheGeometria
+from ecel.desplazamiento import calcular_factor_desplazamiento
+from ecel.geometria import puntos_bezier
+from ecel.halos import geometria_cascada_suave, geometria_homogenea
+from ecel.rayos import (
+    abanico_dispersion,
+    colores_lut,
+    integrar_rayos,
+    integrar_rayos_adaptativo,
+    remuestrear_por_arco,
+)
+
+# Cargar configuración desde YAML
+config_path = Path(__file__).parent / "config_ecel.yaml"
+with open(config_path, 'r') as f:
+    CONFIG = yaml.safe_load(f)
+
+# Geometría de halos cacheada (disco + memoria), clave = hash de parámetros
+CACHE = CacheGeometria.desde_config(CONFIG)
+
+
+class OceanoeCEL(Scene):
+    """
+    v2.3.8 - Dispersión arcoíris con broadcasting
+
+    Basado en v2.3.7:
+    - Tangentes, normales, rampas y desplazamientos de todos los rayos
+      de dispersión en un solo arreglo (num_rays, puntos, 3)
+    - Colores desde una LUT vectorizada (sin búsqueda por rayo)
+    - Curvas Bézier de todos los rayos de una vez (sin set_points_smoothly)
+    - luz.dispersion.num_rays puede subir a 200+ sin notarse en el setup
+    """
+
+    def construct(self):
+        nombre = CONFIG['masa_actual']['nombre']
+        densidad = CONFIG['masa_actual']['densidad']
+        radio_visual = CONFIG['masa_actual']['radio_visual']
+        factor = calcular_factor_desplazamiento(densidad)
+
+        # Título
+        title = Text("Océano eCEL - Efecto Cascada", font_size=40)
+        subtitle = Text(
+            f"eCEL desplazado desplaza más eCEL → Halo extendido",
+            font_size=20
+        )
+        subtitle.next_to(title, DOWN)
+
+        self.play(Write(title), Write(subtitle))
+        self.wait(CONFIG['animacion']['duracion_intro'])
+        self.play(FadeOut(title), FadeOut(subtitle))
+
+        # 1. Crear océano eCEL de fondo
+        oceano_fondo = self.crear_oceano_fondo()
+
+        texto_oceano = Text(
+            "Océano eCEL uniforme (estado base)",
+            font_size=22,
+            color=BLUE_A
+        ).to_edge(UP)
+
+        self.play(
+            FadeIn(oceano_fondo),
+            Write(texto_oceano),
+            run_time=CONFIG['animacion']['duracion_oceano']
+        )
+        self.wait(1)
+
+        # 2. Crear la masa
+        color_masa = CONFIG['masa_actual']['color']
+
+        masa = Circle(
+            radius=radio_visual,
+            color=color_masa,
+            fill_opacity=0.9,
+            stroke_width=3
+        )
+        masa.move_to(ORIGIN)
+
+        label = Text(nombre, font_size=18, color=WHITE)
+        label.move_to(masa.get_center())
+
+        texto_masa = Text(
+            f"Introduciendo {nombre}...",
+            font_size=22,
+            color=YELLOW
+        ).to_edge(DOWN)
+
+        self.play(Write(texto_masa))
+        self.play(
+            GrowFromCenter(masa),
+            Write(label),
+            run_time=CONFIG['animacion']['duracion_masa']
+        )
+
+        atmosfera = None
+        atm_cfg = CONFIG.get('atmosfera', {})
+        if atm_cfg.get('habilitada', False):
+            atmosfera = Circle(
+                radius=radio_visual * atm_cfg['factor_radio'],
+                color=atm_cfg['stroke_color'],
+                stroke_width=atm_cfg['stroke_width'],
+                stroke_opacity=atm_cfg['stroke_opacity'],
+                fill_opacity=atm_cfg['fill_opacity']
+            )
+            atmosfera.move_to(ORIGIN)
+            self.play(FadeIn(atmosfera), run_time=0.6)
+
+        # 3. eCEL desplazado con efecto cascada
+        texto_cascada = Text(
+            f"eCEL desplazado se organiza → Halo extendido ({factor*100:.0f}%)",
+            font_size=20,
+            color=GREEN
+        ).to_edge(DOWN)
+
+        self.play(FadeOut(texto_masa), Write(texto_cascada))
+
+        # Crear halo completo con efecto cascada y difuminación suave
+        ecel_cascada = self.crear_ecel_cascada_suave(
+            masa.get_center(), densidad, radio_visual
+        )
+
+        self.play(
+            FadeIn(ecel_cascada, scale=0.5),
+            run_time=CONFIG['animacion']['duracion_desplazamiento'],
+            rate_func=smooth
+        )
+
+        self.wait(1)
+
+        # Rayo de luz curvado por gradiente 1/r²
+        if CONFIG.get('luz', {}).get('habilitada', False):
+            if CONFIG['luz'].get('abanico', {}).get('habilitado', False):
+                abanico = self.crear_abanico_rayos(ORIGIN, radio_visual)
+                self.play(Create(abanico), run_time=1.5)
+            rayo = self.crear_rayo_luz(ORIGIN, radio_visual)
+            if rayo is not None:
+                self.play(FadeIn(rayo), run_time=1.2)
+
+        # 4. FADE OUT del fondo - solo queda masa + halo
+        texto_sin_fondo = Text(
+            "Fondo desaparece → Solo halo visible",
+            font_size=20,
+            color=WHITE
+        ).to_edge(DOWN)
+
+        self.play(
+            FadeOut(oceano_fondo),
+            FadeOut(texto_oceano),
+            FadeOut(texto_cascada),
+            Write(texto_sin_fondo),
+            run_time=1.5
+        )
+
+        self.wait(2)
+
+        # 5. Texto final
+        texto_final = Text(
+            f"Halo extendido sin ruido de fondo\n"
+            "ρ_total = ρ_nivel1 + ρ_nivel2 + ρ_nivel3 + ...",
+            font_size=18,
+            color=YELLOW
+        ).to_edge(DOWN)
+
+        self.play(FadeOut(texto_sin_fondo), Write(texto_final))
+        self.wait(CONFIG['animacion']['duracion_final'])
+
+        # Fade out final
+        fadeouts = [
+            FadeOut(masa),
+            FadeOut(label),
+            FadeOut(ecel_cascada),
+            FadeOut(texto_final),
+        ]
+        if atmosfera is not None:
+            fadeouts.append(FadeOut(atmosfera))
+        self.play(*fadeouts)
+
+    def crear_oceano_fondo(self):
+        """Océano eCEL de fondo uniforme."""
+        oceano = VGroup()
+
+        espaciado = CONFIG['malla']['espaciado']
+        radio = CONFIG['malla']['radio_base'] * 0.6
+        opacidad = CONFIG['intensidad']['opacidad_minima']
+        color = CONFIG['malla']['color_fondo']
+
+        for x in np.arange(-7.5, 7.5, espaciado):
+            for y in np.arange(-4.5, 4.5, espaciado):
+                dot = Dot(
+                    point=np.array([x, y, 0]),
+                    radius=radio,
+                    color=color,
+                    fill_opacity=opacidad
+                )
+                oceano.add(dot)
+
+        return oceano
+
+    def crear_ecel_cascada_suave(self, centro, densidad, radio_masa):
+        """
+        Crea halo con DIFUMINACIÓN SUAVE.
+
+        La geometría (puntos, radios, opacidades) sale de la caché;
+        aquí solo se trasladan los puntos al centro y se crean los Dots.
+        """
+        centro_arr = np.array([centro[0], centro[1], 0]) if not isinstance(centro, np.ndarray) else centro
+
+        factor = calcular_factor_desplazamiento(densidad)
+        params = {
+            'factor': factor,
+            'radio_masa': radio_masa,
+            'radio_particula': CONFIG['malla']['radio_base'],
+            'opacidad_max': CONFIG['intensidad']['opacidad_acumulacion'],
+        }
+        geo = CACHE.obtener(
+            'halo_cascada_suave', params,
+            lambda: geometria_cascada_suave(**params)
+        )
+
+        return dots_desde_geometria(
+            geo, centro_arr,
+            lambda t: interpolate_color(BLUE_B, PURPLE_A, t)
+        )
+
+    def crear_rayo_luz(self, centro, radio_masa):
+        """Rayo de luz curvado por gradiente 1/r² con efecto arcoíris."""
+        cfg = CONFIG['luz']
+        start = np.array([cfg['start'][0], cfg['start'][1]])
+
+        camino = self.integrar_caminos(start[None], centro, radio_masa)[0]
+        puntos = [np.array([x, y, 0.0]) for x, y in camino]
+
+        if len(puntos) < 2:
+            return None
+
+        base = VMobject()
+        base.set_points_smoothly(puntos)
+        base.set_stroke(color=WHITE, width=cfg['stroke_width'], opacity=cfg['core_opacity'])
+
+        glow = VGroup()
+        for width, opacity in zip(cfg['glow_widths'], cfg['glow_opacities']):
+            layer = base.copy()
+            layer.set_color_by_gradient(*cfg['colors_rainbow'])
+            layer.set_stroke(width=width, opacity=opacity)
+            glow.add(layer)
+
+        dispersion_cfg = cfg.get('dispersion', {})
+        dispersion = VGroup()
+        if dispersion_cfg.get('enabled', False):
+            colors = cfg['colors_rainbow']
+            num_rays = dispersion_cfg.get('num_rays', len(colors))
+
+            caminos = abanico_dispersion(
+                puntos, num_rays,
+                base_offset=dispersion_cfg['base_offset'],
+                max_offset=dispersion_cfg['max_offset'],
+                ramp_power=dispersion_cfg['ramp_power'],
+                tail_boost=dispersion_cfg.get('tail_boost', 0.0),
+            )
+            curvas = puntos_bezier(caminos)
+            lut = colores_lut(colors, num_rays)
+
+            for curva, rgb in zip(curvas, lut):
+                ray = VMobject()
+                ray.set_points(curva)
+                ray.set_stroke(
+                    color=ManimColor.from_rgb(rgb),
+                    width=dispersion_cfg['stroke_width'],
+                    opacity=dispersion_cfg['opacity']
+                )
+                dispersion.add(ray)
+
+        return VGroup(glow, dispersion, base)
+
+    def integrar_caminos(self, inicios, centro, radio_masa):
+        """
+        Caminos (M, steps, 2) de los rayos que parten de `inicios` (M, 2).
+
+        Con luz.adaptativo habilitado se integra con paso adaptativo hasta
+        salir del cuadro y se remuestrea a `steps` puntos equiespaciados.
+        """
+        cfg = CONFIG['luz']
+        adaptativo = cfg.get('adaptativo', {})
+        if not adaptativo.get('habilitado', False):
+            return integrar_rayos(
+                inicios, cfg['dir'], centro, radio_masa,
+                k=cfg['k_curvatura'],
+                speed=cfg['speed'],
+                dt=cfg['dt'],
+                steps=cfg['steps'],
+                min_dist_factor=cfg['min_dist_factor'],
+            )
+
+        margen = adaptativo['margen']
+        extent = (
+            -config.frame_width / 2 - margen, config.frame_width / 2 + margen,
+            -config.frame_height / 2 - margen, config.frame_height / 2 + margen,
+        )
+        caminos, _ = integrar_rayos_adaptativo(
+            inicios, cfg['dir'], centro, radio_masa,
+            k=cfg['k_curvatura'],
+            speed=cfg['speed'],
+            min_dist_factor=cfg['min_dist_factor'],
+            extent=extent,
+            t_max=cfg['steps'] * cfg['dt'],
+            rtol=adaptativo['rtol'],
+            atol=adaptativo['atol'],
+            dt_max=adaptativo['dt_max'],
+        )
+        return np.array([remuestrear_por_arco(c, cfg['steps']) for c in caminos])
+
+    def crear_abanico_rayos(self, centro, radio_masa):
+        """Abanico de rayos paralelos que pasan a distintas alturas de la masa."""
+        cfg = CONFIG['luz']
+        abanico_cfg = cfg['abanico']
+        n = abanico_cfg['num_rayos']
+
+        alturas = np.linspace(abanico_cfg['y_min'], abanico_cfg['y_max'], n)
+        inicios = np.column_stack([np.full(n, cfg['start'][0]), alturas])
+        caminos = self.integrar_caminos(inicios, centro, radio_masa)
+
+        abanico = VGroup()
+        for camino in caminos:
+            rayo = VMobject()
+            rayo.set_points_as_corners(np.hstack([camino, np.zeros((len(camino), 1))]))
+            rayo.set_stroke(
+                color=abanico_cfg['color'],
+                width=abanico_cfg['stroke_width'],
+                opacity=abanico_cfg['opacity']
+            )
+            abanico.add(rayo)
+        return abanico
+
+
+class ComparacionDensidades(Scene):
+    """
+    Compara el efecto de desplazamiento para diferentes densidades.
+    Distribución homogénea (v2.1.1) con geometría cacheada.
+    """
+
+    def construct(self):
+        title = Text("Comparación: Distribución Homogénea", font_size=36)
+        self.play(Write(title))
+        self.wait(1)
+        self.play(title.animate.to_edge(UP).scale(0.7))
+
+        # Tres materiales
+        materiales = [
+            ("Agua", 1.0, BLUE_A),
+            ("Tierra", 5.5, BLUE_D),
+            ("Plomo", 11.3, GRAY)
+        ]
+
+        grupos = VGroup()
+
+        for i, (nombre, densidad, color) in enumerate(materiales):
+            factor = calcular_factor_desplazamiento(densidad)
+            x_pos = -4 + i * 4
+
+            masa = Circle(radius=0.5, color=color, fill_opacity=0.9)
+            masa.move_to(np.array([x_pos, 0, 0]))
+
+            label = Text(f"{nombre}\nρ={densidad}", font_size=14)
+            label.next_to(masa, DOWN, buff=0.3)
+
+            pct = Text(f"{factor*100:.0f}%", font_size=20, color=YELLOW)
+            pct.next_to(masa, UP, buff=0.3)
+
+            grupo = VGroup(masa, label, pct)
+            grupos.add(grupo)
+
+        self.play(FadeIn(grupos))
+        self.wait(1)
+
+        # Crear eCEL homogéneo para cada uno
+        for i, (nombre, densidad, color) in enumerate(materiales):
+            x_pos = -4 + i * 4
+            centro = np.array([x_pos, 0, 0])
+
+            ecel = self.crear_ecel_homogeneo_simple(centro, densidad, 0.5)
+            self.play(FadeIn(ecel, scale=0.5), run_time=0.8)
+
+        self.wait(3)
+
+    def crear_ecel_homogeneo_simple(self, centro, densidad, radio_masa):
+        """Versión simplificada del eCEL homogéneo (geometría cacheada)."""
+        params = {
+            'factor': calcular_factor_desplazamiento(densidad),
+            'radio_masa': radio_masa,
+            'radio_particula': 0.025,
+            'opacidad_max': 0.9,
+            'num_capas': 6,
+            'min_particulas': 6,
+        }
+        geo = CACHE.obtener(
+            'halo_homogeneo', params,
+            lambda: geometria_homogenea(**params)
+        )
+        return dots_desde_geometria(geo, centro, lambda t: BLUE_B)
+
+
+def dots_desde_geometria(geo, centro, color_fn):
+    """Convierte la geometría cacheada de un halo en un VGroup de Dots."""
+    ecel = VGroup()
+    colores = {}
+    for (x, y), radio, opacidad, t in zip(
+        geo['puntos'], geo['radios'], geo['opacidades'], geo['t_color']
+    ):
+        if t not in colores:
+            colores[t] = color_fn(t)
+        dot = Dot(
+            point=np.array([centro[0] + x, centro[1] + y, 0]),
+            radius=radio,
+            color=colores[t],
+            fill_opacity=opacidad
+        )
+        ecel.add(dot)
+    return ecel
+
+
+# Para renderizar:
+# manim -pql GravityeCEL-v2.3.8.py OceanoeCEL
+# manim -pql GravityeCEL-v2.3.8.py ComparacionDensidades
@@ -0,0 +1,142 @@
+from manim import *
+import numpy as np
+import yaml
+from pathlib import Path
+
+from ecel.barnes_hut import campo_desde_config
+from ecel.campo import rgba_desde_densidad
+from ecel.refraccion import IndiceRefraccion
+
+# Cargar configuración desde YAML
+config_path = Path(__file__).parent / "config_ecel.yaml"
+with open(config_path, 'r') as f:
+    CONFIG = yaml.safe_load(f)
+
+
+class LuzRefraccion(Scene):
+    """
+    v2.3.9 - Rayo de luz que se dobla (índice de refracción eCEL)
+
+    - La luz va más lento donde hay más eCEL: n = 1 + alfa ρ
+    - ρ es el campo combinado de todas las masas (ecel/campo.py, o
+      ecel/barnes_hut.py con `campo.jerarquico`)
+    - n y ∇ln n se precalculan una vez en una rejilla
+    - Rayos por la ecuación eikonal con búsquedas bilineales:
+      el costo por paso no depende del número de masas
+    """
+
+    def construct(self):
+        cfg = CONFIG['refraccion']
+        planetas_cfg = CONFIG['dos_planetas']['planetas']
+
+        campo = campo_desde_config(
+            CONFIG,
+            [p['posicion'] for p in planetas_cfg],
+            [p['radio_visual'] for p in planetas_cfg],
+            [p['densidad'] for p in planetas_cfg],
+        )
+
+        # Título
+        title = Text("Luz en el Océano eCEL", font_size=40)
+        subtitle = Text(
+            "Más eCEL → luz más lenta → el rayo se dobla",
+            font_size=20
+        )
+        subtitle.next_to(title, DOWN)
+
+        self.play(Write(title), Write(subtitle))
+        self.wait(CONFIG['animacion']['duracion_intro'])
+        self.play(FadeOut(title), FadeOut(subtitle))
+
+        # 1. Índice de refracción sobre la rejilla
+        extent = (
+            -config.frame_width / 2, config.frame_width / 2,
+            -config.frame_height / 2, config.frame_height / 2,
+        )
+        nx, ny = cfg['resolucion']
+        indice = IndiceRefraccion.desde_campo(campo, extent, nx, ny, alfa=cfg['alfa'])
+
+        textura = rgba_desde_densidad(
+            np.flipud(indice.n - 1),
+            CONFIG['malla']['color_fondo'],
+            CONFIG['malla']['color_acumulacion'],
+            opacidad_min=0.0,
+            opacidad_max=CONFIG['dos_planetas']['textura']['opacidad_maxima'],
+            rho_ref=cfg['alfa'] * CONFIG['dos_planetas']['rho_ref'],
+        )
+        fondo_n = ImageMobject(textura)
+        fondo_n.stretch_to_fit_width(config.frame_width)
+        fondo_n.stretch_to_fit_height(config.frame_height)
+        fondo_n.move_to(ORIGIN)
+
+        texto_n = Text(
+            "Índice de refracción n = 1 + α ρ_eCEL",
+            font_size=20,
+            color=BLUE_A
+        ).to_edge(UP)
+
+        # 2. Planetas
+        cuerpos = VGroup()
+        for p in planetas_cfg:
+            circulo = Circle(
+                radius=p['radio_visual'],
+                color=p['color'],
+                fill_opacity=0.9,
+                stroke_width=3
+            )
+            label = Text(p['nombre'], font_size=14, color=WHITE).move_to(circulo)
+            cuerpo = VGroup(circulo, label)
+            cuerpo.move_to(np.array([p['posicion'][0], p['posicion'][1], 0]))
+            cuerpos.add(cuerpo)
+
+        self.play(
+            FadeIn(fondo_n),
+            *[GrowFromCenter(c) for c in cuerpos],
+            Write(texto_n),
+            run_time=CONFIG['animacion']['duracion_masa']
+        )
+        self.wait(1)
+
+        # 3. Abanico de rayos paralelos
+        rayos = self.crear_rayos(indice)
+
+        texto_rayos = Text(
+            "Rayos paralelos se curvan hacia las masas",
+            font_size=20,
+            color=YELLOW
+        ).to_edge(DOWN)
+
+        self.play(Write(texto_rayos))
+        self.play(Create(rayos), run_time=3, rate_func=linear)
+        self.bring_to_front(cuerpos)
+        self.wait(CONFIG['animacion']['duracion_final'])
+
+        self.play(
+            FadeOut(fondo_n),
+            FadeOut(cuerpos),
+            FadeOut(rayos),
+            FadeOut(texto_n),
+            FadeOut(texto_rayos)
+        )
+
+    def crear_rayos(self, indice):
+        """Abanico de rayos trazados por la ecuación eikonal."""
+        cfg = CONFIG['refraccion']
+        n = cfg['num_rayos']
+        alturas = np.linspace(cfg['y_min'], cfg['y_max'], n)
+        inicios = np.column_stack([np.full(n, cfg['inicio_x']), alturas])
+
+        resultado = indice.trazar(inicios, [1.0, 0.0], ds=cfg['ds'], pasos=cfg['pasos'])
+
+        rayos = VGroup()
+        for camino, validos in zip(resultado['caminos'], resultado['validos']):
+            puntos = np.hstack([camino[:validos], np.zeros((validos, 1))])
+            rayo = VMobject()
+            rayo.set_points_as_corners(puntos)
+            rayo.set_stroke(color=cfg['color'], width=cfg['stroke_width'], opacity=cfg['opacity'])
+            rayos.add(rayo)
+        return rayos
+
+
+# Para renderizar:
+# manim -pql GravityeCEL-v2.3.9.py LuzRefraccion
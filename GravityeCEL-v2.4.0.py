@@ -0,0 +1,171 @@
+from manim import *
+import numpy as np
+import yaml
+from pathlib import Path
+
+from ecel.cache import CacheGeometria
+from ecel.lente import (Lente, RenderLente, fondo_estrellas, mapa_deflexion_cacheado,
+                        perfil_deflexion)
+
+# Cargar configuración desde YAML
+config_path = Path(__file__).parent / "config_ecel.yaml"
+with open(config_path, 'r') as f:
+    CONFIG = yaml.safe_load(f)
+
+
+class LenteGravitacional(Scene):
+    """
+    v2.4.0 - Lente gravitacional eCEL (anillo de Einstein y arcos)
+
+    - Un rayo por píxel trazado hacia atrás hasta un fondo de estrellas
+    - α(b) sale de integrar rayos con la física de crear_rayo_luz (en caché)
+    - Con la masa quieta el mapa píxel → fuente se cachea: deslizar la
+      fuente solo vuelve a muestrear
+    - La imagen se calcula por franjas de filas en un pool de procesos que
+      vive toda la escena; el fondo y el mapa se comparten una sola vez
+    """
+
+    def construct(self):
+        cfg = CONFIG['lente']
+        masa_cfg = CONFIG['masa_actual']
+        radio_visual = masa_cfg['radio_visual']
+        cache = CacheGeometria.desde_config(CONFIG)
+
+        extent = (
+            -config.frame_width / 2, config.frame_width / 2,
+            -config.frame_height / 2, config.frame_height / 2,
+        )
+        nx, ny = cfg['resolucion']
+        fondo = fondo_estrellas(
+            *cfg['fondo']['resolucion'],
+            num_estrellas=cfg['fondo']['num_estrellas'],
+            semilla=cfg['fondo']['semilla'],
+            paso_rejilla=cfg['fondo']['paso_rejilla'],
+        )
+
+        perfil = perfil_deflexion(cache, CONFIG['luz'], radio_visual)
+        lente = Lente([[0.0, 0.0]], [radio_visual], [perfil], cfg['distancia_fuente'])
+        # Con la masa quieta el mapa píxel → fuente se cachea
+        mapa = mapa_deflexion_cacheado(cache, lente, extent, nx, ny, procesos=cfg['procesos'])
+
+        # Un solo pool para toda la escena: el fondo y el mapa viajan una vez
+        with RenderLente(fondo, extent, nx, ny, mapa=mapa, procesos=cfg['procesos']) as render:
+            self.animar(render, fondo, extent, lente)
+
+    def animar(self, render, fondo, extent, lente):
+        """Secuencia de la escena; `render` ya tiene el fondo y el mapa en el pool."""
+        cfg = CONFIG['lente']
+        masa_cfg = CONFIG['masa_actual']
+        radio_visual = masa_cfg['radio_visual']
+
+        # Título
+        title = Text("Lente Gravitacional eCEL", font_size=40)
+        subtitle = Text(
+            "El fondo visto a través de la masa: arcos y anillo de Einstein",
+            font_size=20
+        )
+        subtitle.next_to(title, DOWN)
+
+        self.play(Write(title), Write(subtitle))
+        self.wait(CONFIG['animacion']['duracion_intro'])
+        self.play(FadeOut(title), FadeOut(subtitle))
+
+        # 1. Fondo sin lente
+        imagen = self.imagen_pantalla(np.flipud(fondo))
+        texto_fondo = Text("Fondo de estrellas", font_size=20, color=BLUE_A).to_edge(UP)
+        self.play(FadeIn(imagen), Write(texto_fondo), run_time=CONFIG['animacion']['duracion_oceano'])
+
+        # 2. Aparece la masa: mapa de deflexión cacheado
+        lenteada = self.imagen_pantalla(render(extent))
+
+        cuerpo = Circle(
+            radius=radio_visual,
+            color=masa_cfg['color'],
+            fill_opacity=0.9,
+            stroke_width=3
+        )
+        label = Text(masa_cfg['nombre'], font_size=18, color=WHITE).move_to(cuerpo)
+        masa = VGroup(cuerpo, label)
+
+        theta_e = lente.radio_einstein()
+        texto_lente = Text(
+            f"Anillo de Einstein: θ_E ≈ {theta_e / radio_visual:.2f} R" if theta_e
+            else "Sin anillo de Einstein a esta distancia",
+            font_size=20,
+            color=YELLOW
+        ).to_edge(DOWN)
+
+        self.play(
+            FadeTransform(imagen, lenteada),
+            GrowFromCenter(masa),
+            Write(texto_lente),
+            run_time=CONFIG['animacion']['duracion_masa']
+        )
+        self.wait(1)
+
+        # 3. La fuente se desliza: solo se vuelve a muestrear el mapa
+        desplazamiento = ValueTracker(0.0)
+
+        def deslizar_fuente(mob):
+            dx = desplazamiento.get_value()
+            extent_fuente = (extent[0] + dx, extent[1] + dx, extent[2], extent[3])
+            mob.pixel_array = render(extent_fuente)
+
+        lenteada.add_updater(deslizar_fuente)
+        self.play(
+            desplazamiento.animate.set_value(cfg['desplazamiento_fuente']),
+            run_time=4,
+            rate_func=there_and_back
+        )
+        lenteada.clear_updaters()
+
+        # 4. La masa cruza: el perfil α(b) cacheado se reinterpola por frame
+        cruce = cfg['cruce']
+        inicio = np.array([*cruce['inicio'], 0.0])
+        fin = np.array([*cruce['fin'], 0.0])
+        tiempo = ValueTracker(0.0)
+
+        def posicion():
+            return inicio + (fin - inicio) * smooth(tiempo.get_value() / cruce['duracion'])
+
+        def seguir_masa(mob):
+            mob.pixel_array = render(extent, lente=lente.movida([masa.get_center()[:2]]))
+
+        lenteada.add_updater(seguir_masa)
+        self.play(masa.animate.move_to(inicio), run_time=1)
+        masa.add_updater(lambda m: m.move_to(posicion()))
+
+        texto_cruce = Text(
+            "La masa cruza: las estrellas de atrás se estiran en arcos",
+            font_size=20,
+            color=YELLOW
+        ).to_edge(DOWN)
+        self.play(FadeTransform(texto_lente, texto_cruce))
+        self.play(
+            tiempo.animate.set_value(cruce['duracion']),
+            run_time=cruce['duracion'],
+            rate_func=linear
+        )
+        lenteada.clear_updaters()
+        masa.clear_updaters()
+        self.wait(CONFIG['animacion']['duracion_final'])
+
+        self.play(
+            FadeOut(lenteada),
+            FadeOut(masa),
+            FadeOut(texto_fondo),
+            FadeOut(texto_cruce)
+        )
+
+    @staticmethod
+    def imagen_pantalla(rgba):
+        """ImageMobject (fila 0 arriba) estirado a todo el cuadro."""
+        imagen = ImageMobject(rgba)
+        imagen.stretch_to_fit_width(config.frame_width)
+        imagen.stretch_to_fit_height(config.frame_height)
+        imagen.move_to(ORIGIN)
+        return imagen
+
+
+# Para renderizar:
+# manim -pql GravityeCEL-v2.4.0.py LenteGravitacional
@@ -0,0 +1,107 @@
+from manim import *
+import yaml
+from pathlib import Path
+
+from ecel.cache import CacheGeometria
+from ecel.causticas import imagen_magnificacion, mapa_magnificacion_cacheado
+from ecel.lente import Lente, perfil_deflexion
+
+# Cargar configuración desde YAML
+config_path = Path(__file__).parent / "config_ecel.yaml"
+with open(config_path, 'r') as f:
+    CONFIG = yaml.safe_load(f)
+
+
+class Causticas(Scene):
+    """
+    v2.4.2 - Cáusticas y mapa de magnificación (disparo de rayos)
+
+    - Millones de rayos desde el plano de la lente hasta el plano de la fuente
+    - Histograma de llegadas → magnificación μ; las cáusticas son las líneas
+      donde μ se dispara
+    - Bloques de filas con memoria acotada repartidos entre procesos
+    - Primero una masa sola (cáustica puntual), luego la lente binaria
+    """
+
+    def construct(self):
+        cfg = CONFIG['causticas']
+        cache = CacheGeometria.desde_config(CONFIG)
+        masas = cfg['masas']
+
+        # Título
+        title = Text("Cáusticas eCEL", font_size=40)
+        subtitle = Text(
+            "Donde la lente concentra la luz de la fuente",
+            font_size=20
+        )
+        subtitle.next_to(title, DOWN)
+
+        self.play(Write(title), Write(subtitle))
+        self.wait(CONFIG['animacion']['duracion_intro'])
+        self.play(FadeOut(title), FadeOut(subtitle))
+
+        # 1. Masa sola: cáustica puntual en el centro
+        sola = self.mapa([{'posicion': [0.0, 0.0], 'radio': masas[0]['radio']}], cache)
+        texto = Text(
+            "Una masa: toda la luz se concentra en un punto",
+            font_size=20,
+            color=BLUE_A
+        ).to_edge(UP)
+
+        self.play(FadeIn(sola), Write(texto), run_time=CONFIG['animacion']['duracion_oceano'])
+        self.wait(1)
+
+        # 2. Lente binaria: la cáustica se abre en curvas con cúspides
+        binaria = self.mapa(masas, cache)
+        texto_binaria = Text(
+            "Dos masas: curvas cáusticas con cúspides",
+            font_size=20,
+            color=YELLOW
+        ).to_edge(UP)
+
+        self.play(
+            FadeTransform(sola, binaria),
+            FadeTransform(texto, texto_binaria),
+            run_time=CONFIG['animacion']['duracion_desplazamiento']
+        )
+
+        texto_mu = Text(
+            "Brillo = magnificación μ (escala logarítmica)",
+            font_size=18,
+            color=WHITE
+        ).to_edge(DOWN)
+        self.play(Write(texto_mu))
+        self.wait(CONFIG['animacion']['duracion_final'])
+
+        self.play(FadeOut(binaria), FadeOut(texto_binaria), FadeOut(texto_mu))
+
+    def mapa(self, masas, cache):
+        """ImageMobject del mapa de magnificación (cacheado) para estas masas."""
+        cfg = CONFIG['causticas']
+        nx, ny = cfg['resolucion']
+        rayos_x, rayos_y = cfg['rayos']
+
+        perfiles = [perfil_deflexion(cache, CONFIG['luz'], m['radio']) for m in masas]
+        lente = Lente(
+            [m['posicion'] for m in masas],
+            [m['radio'] for m in masas],
+            perfiles,
+            CONFIG['lente']['distancia_fuente'],
+        )
+        datos = mapa_magnificacion_cacheado(
+            cache, lente, tuple(cfg['extent_fuente']), nx, ny,
+            tuple(cfg['extent_rayos']), rayos_x, rayos_y,
+            procesos=CONFIG['lente']['procesos'],
+            filas_por_bloque=cfg['filas_por_bloque'],
+        )
+
+        imagen = ImageMobject(imagen_magnificacion(datos['magnificacion'], colores=cfg['colores']))
+        x_min, x_max, y_min, y_max = cfg['extent_fuente']
+        imagen.stretch_to_fit_width(config.frame_width)
+        imagen.stretch_to_fit_height(config.frame_width * (y_max - y_min) / (x_max - x_min))
+        imagen.move_to(ORIGIN)
+        return imagen
+
+
+# Para renderizar:
+# manim -pql GravityeCEL-v2.4.2.py Causticas
@@ -0,0 +1,190 @@
+from manim import *
+import numpy as np
+import yaml
+from pathlib import Path
+
+from ecel.agujero_negro import (
+    CAPTURADO,
+    DESVIADO,
+    b_critico,
+    imagen_sombra,
+    integrar_fotones,
+    masa_efectiva,
+    radio_colapso,
+)
+from ecel.lente import fondo_estrellas
+
+# Cargar configuración desde YAML
+config_path = Path(__file__).parent / "config_ecel.yaml"
+with open(config_path, 'r') as f:
+    CONFIG = yaml.safe_load(f)
+
+
+class AgujeroNegro(Scene):
+    """
+    v2.4.3 - Formación del horizonte de eventos
+
+    - La masa se comprime: R ∝ ρ^(-1/3) y M crece con el desplazamiento eCEL
+    - Fotones paralelos por la ecuación de Binet u'' + u = 3 M u²,
+      integrados todos juntos en cada frame (cientos en milisegundos)
+    - Cada fotón: capturado (rojo), desviado (amarillo) u orbitando (blanco)
+    - Al final, la sombra y el anillo de fotones sobre un fondo de estrellas
+    """
+
+    def construct(self):
+        cfg = CONFIG['agujero_negro']
+        masa_cfg = CONFIG['masa_actual']
+        radio_inicial = masa_cfg['radio_visual']
+
+        # Título
+        title = Text("Agujero Negro eCEL", font_size=40)
+        subtitle = Text(
+            "Desplazamiento total del eCEL → horizonte de eventos",
+            font_size=20
+        )
+        subtitle.next_to(title, DOWN)
+
+        self.play(Write(title), Write(subtitle))
+        self.wait(CONFIG['animacion']['duracion_intro'])
+        self.play(FadeOut(title), FadeOut(subtitle))
+
+        densidad = ValueTracker(cfg['densidad_inicial'])
+
+        def estado_actual():
+            rho = densidad.get_value()
+            return (masa_efectiva(rho, cfg['masa_maxima']),
+                    radio_colapso(rho, radio_inicial, cfg['densidad_inicial']))
+
+        # 1. Cuerpo, horizonte y esfera de fotones siguen a la densidad
+        def crear_cuerpo():
+            _, radio = estado_actual()
+            return Circle(radius=radio, color=masa_cfg['color'], fill_opacity=0.9, stroke_width=3)
+
+        def crear_horizonte():
+            masa, radio = estado_actual()
+            r_s = 2 * masa
+            horizonte = Circle(radius=r_s, color=WHITE, stroke_width=2)
+            horizonte.set_fill(BLACK, opacity=1.0 if r_s >= radio else 0.0)
+            horizonte.set_stroke(opacity=1.0 if r_s >= radio else 0.3)
+            esfera = DashedVMobject(Circle(radius=3 * masa, color=GRAY, stroke_width=1.5), num_dashes=40)
+            return VGroup(esfera, horizonte)
+
+        cuerpo = always_redraw(crear_cuerpo)
+        horizonte = always_redraw(crear_horizonte)
+        fotones = always_redraw(lambda: self.crear_fotones(*estado_actual()))
+
+        texto_densidad = always_redraw(lambda: Text(
+            f"ρ = {densidad.get_value():.0f}   M = {estado_actual()[0]:.2f}   "
+            f"r_s = {2 * estado_actual()[0]:.2f}   R = {estado_actual()[1]:.2f}",
+            font_size=18,
+            color=BLUE_A
+        ).to_edge(UP))
+
+        self.play(
+            FadeIn(cuerpo),
+            FadeIn(horizonte),
+            Write(texto_densidad),
+            run_time=CONFIG['animacion']['duracion_masa']
+        )
+        self.play(Create(fotones), run_time=1.5)
+
+        texto_colapso = Text(
+            "La masa se comprime: el eCEL desplazado crece",
+            font_size=20,
+            color=YELLOW
+        ).to_edge(DOWN)
+        self.play(Write(texto_colapso))
+
+        # 2. Colapso: los fotones se recalculan en cada frame
+        self.play(
+            densidad.animate.set_value(cfg['densidad_final']),
+            run_time=cfg['duracion_colapso'],
+            rate_func=smooth
+        )
+        masa_final, _ = estado_actual()
+
+        texto_horizonte = Text(
+            f"Horizonte formado: los fotones con b < 3√3 M = {b_critico(masa_final):.2f} caen",
+            font_size=20,
+            color=RED_A
+        ).to_edge(DOWN)
+        self.play(FadeTransform(texto_colapso, texto_horizonte))
+        self.wait(1)
+
+        # 3. Lo que ve un observador lejano: sombra y anillo de fotones
+        sombra_cfg = cfg['sombra']
+        nx, ny = sombra_cfg['resolucion']
+        fondo_cfg = CONFIG['lente']['fondo']
+        extent = (
+            -config.frame_width / 2, config.frame_width / 2,
+            -config.frame_height / 2, config.frame_height / 2,
+        )
+        fondo = fondo_estrellas(
+            *fondo_cfg['resolucion'],
+            num_estrellas=fondo_cfg['num_estrellas'],
+            semilla=fondo_cfg['semilla'],
+            paso_rejilla=fondo_cfg['paso_rejilla'],
+        )
+        sombra = ImageMobject(imagen_sombra(
+            masa_final, extent, nx, ny, fondo, extent, sombra_cfg['distancia_fuente']
+        ))
+        sombra.stretch_to_fit_width(config.frame_width)
+        sombra.stretch_to_fit_height(config.frame_height)
+        sombra.move_to(ORIGIN)
+
+        texto_sombra = Text(
+            "Sombra y anillo de fotones vistos desde lejos",
+            font_size=20,
+            color=YELLOW
+        ).to_edge(DOWN)
+
+        for mob in (cuerpo, horizonte, fotones, texto_densidad):
+            mob.clear_updaters()
+        self.play(
+            FadeIn(sombra),
+            FadeOut(fotones),
+            FadeOut(cuerpo),
+            FadeOut(horizonte),
+            FadeTransform(texto_horizonte, texto_sombra),
+            run_time=2
+        )
+        self.wait(CONFIG['animacion']['duracion_final'])
+
+        self.play(FadeOut(sombra), FadeOut(texto_densidad), FadeOut(texto_sombra))
+
+    def crear_fotones(self, masa, radio):
+        """Paquete de fotones paralelos integrado con la ecuación de Binet."""
+        cfg = CONFIG['agujero_negro']
+        alturas = np.linspace(-cfg['y_max'], cfg['y_max'], cfg['num_fotones'])
+        r_max = np.hypot(config.frame_width, config.frame_height) / 2
+
+        fotones = integrar_fotones(
+            alturas, masa,
+            dphi=cfg['dphi'],
+            vueltas_max=cfg['vueltas_max'],
+            guardar_caminos=True,
+            r_max=r_max,
+            radio_cuerpo=radio,
+        )
+        colores = {
+            CAPTURADO: cfg['colores']['capturado'],
+            DESVIADO: cfg['colores']['desviado'],
+        }
+
+        grupo = VGroup()
+        for camino, estado in zip(fotones['caminos'], fotones['estado']):
+            if len(camino) < 2:
+                continue
+            rayo = VMobject()
+            rayo.set_points_as_corners(np.hstack([camino, np.zeros((len(camino), 1))]))
+            rayo.set_stroke(
+                color=colores.get(estado, cfg['colores']['orbitando']),
+                width=cfg['stroke_width'],
+                opacity=cfg['opacity']
+            )
+            grupo.add(rayo)
+        return grupo
+
+
+# Para renderizar:
+# manim -pql GravityeCEL-v2.4.3.py AgujeroNegro
@@ -5,33 +5,82 @@ Proyecto: GRF-RGB / ThöEv-RθB
 Objetivo: Buscar cromaticidad en lensing gravitacional (arcoíris gravitacionales)
 
 Uso:
-    python download_sdss_photometry.py
+    python download_sdss_photometry.py [--workers 4] [--rate 2.0] [--url URL] [--fresh]
 
 El script:
 1. Lee las coordenadas de los 700 lentes SDSS
-2. Hace queries al servidor SkyServer de SDSS
+2. Hace queries al servidor SkyServer de SDSS (varias en vuelo a la vez,
+   con un limitador de tasa compartido)
 3. Descarga fotometría ugriz para cada lente
-4. Guarda todo en un CSV para análisis
+4. Agrega al CSV las filas de cada lente apenas termina y anota el lente
+   en un archivo de estado; al relanzar solo se consulta lo que falta
 """
 
 import argparse
 import csv
+import os
+import threading
 import time
 import urllib.request
 import urllib.parse
 import json
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from pathlib import Path
 
 # Configuración
 SCRIPT_DIR = Path(__file__).resolve().parent
 INPUT_FILE = SCRIPT_DIR / 'sdss_lenses_coords.csv'
 OUTPUT_FILE = Path.cwd() / 'sdss_lenses_photometry.csv'
+STATE_FILE = OUTPUT_FILE.with_suffix('.state')  # lentes ya terminados
 SEARCH_RADIUS = 5  # arcsec - radio de búsqueda alrededor de cada lente
+WORKERS = 4  # queries en vuelo a la vez
+RATE = 2.0  # queries por segundo (equivale a la pausa fija de 0.5 s de antes)
 
 # URL del servidor SDSS SkyServer
 SDSS_URL = "https://skyserver.sdss.org/dr17/SkyServerWS/SearchTools/RadialSearch"
 
-def query_sdss_photometry(ra, dec, radius_arcsec=5):
+OUTPUT_COLUMNS = [
+    'lens_name', 'lens_ra', 'lens_dec', 'lens_z',
+    'sdss_objid', 'sdss_ra', 'sdss_dec', 'sdss_type',
+    'u', 'g', 'r', 'i', 'z',
+    'u_err', 'g_err', 'r_err', 'i_err', 'z_err',
+    'distance_arcsec'
+]
+
+
+class TokenBucket:
+    """
+    Limitador de tasa compartido entre hilos: `rate` tokens por segundo,
+    hasta `capacity` acumulados. Cada query toma un token antes de salir;
+    si no hay, el hilo espera lo justo para que se genere uno.
+
+    Con capacity=1 las queries salen espaciadas 1/rate como la pausa fija
+    anterior, pero la latencia de cada respuesta se solapa con las demás.
+    """
+
+    def __init__(self, rate, capacity=1):
+        if rate <= 0:
+            raise ValueError("rate debe ser positivo")
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+def query_sdss_photometry(ra, dec, radius_arcsec=5, url=SDSS_URL, limiter=None):
     """
     Consulta al servidor SDSS para obtener fotometría ugriz
     cerca de una coordenada dada.
@@ -43,15 +92,153 @@ def query_sdss_photometry(ra, dec, radius_arcsec=5):
         'format': 'json'
     }
     
-    url = SDSS_URL + '?' + urllib.parse.urlencode(params)
+    url = url + '?' + urllib.parse.urlencode(params)
     
+    if limiter is not None:
+        limiter.acquire()
     try:
         with urllib.request.urlopen(url, timeout=30) as response:
             data = json.loads(response.read().decode())
             return data
     except Exception as e:
-        print(f"  Error en query: {e}")
+        print(f"  Error en query ({ra:.4f}, {dec:.4f}): {e}")
+        return None
+
+
+def lens_key(name, ra, dec):
+    """Clave de un lente: el nombre solo no alcanza (hay nombres repetidos)."""
+    return (name, float(ra), float(dec))
+
+
+def trim_partial_line(path):
+    """
+    Corta una última línea sin salto de línea (el proceso murió a mitad de
+    escribirla): si no, lo próximo que se agregue quedaría pegado a ella.
+    """
+    if not path.exists() or path.stat().st_size == 0:
+        return
+    with open(path, 'rb+') as f:
+        f.seek(-1, os.SEEK_END)
+        if f.read(1) == b'\n':
+            return
+        # Buscar hacia atrás el último salto de línea completo
+        end = f.seek(0, os.SEEK_END)
+        while end > 0:
+            start = max(end - 8192, 0)
+            f.seek(start)
+            cut = f.read(end - start).rfind(b'\n')
+            if cut >= 0:
+                f.truncate(start + cut + 1)
+                return
+            end = start
+        f.truncate(0)
+
+
+def load_state(state_file):
+    """Claves de los lentes terminados en corridas anteriores."""
+    done = set()
+    if state_file.exists():
+        with open(state_file, 'r', newline='') as f:
+            for row in csv.reader(f):
+                try:
+                    done.add(lens_key(*row))
+                except (TypeError, ValueError):
+                    continue  # línea ilegible: el lente se vuelve a consultar
+    return done
+
+
+def row_key(row):
+    """
+    Clave del lente de una fila del CSV, o None si la fila quedó truncada
+    (el proceso murió a mitad de writerows: faltan columnas o no parsean).
+    """
+    if None in row.values() or None in row:
         return None
+    try:
+        return lens_key(row['lens_name'], row['lens_ra'], row['lens_dec'])
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+def rebuild_state(output_file, state_file):
+    """
+    Reconstruye el estado a partir de las filas completas del CSV cuando el
+    CSV existe pero el estado no (CSV del downloader anterior, que lo
+    escribía entero al final, o estado borrado a mano). Sin esto
+    drop_unfinished tiraría todas las filas. Los lentes sin datos no dejan
+    filas y se vuelven a consultar. Devuelve la cantidad de lentes anotados.
+    """
+    if state_file.exists() or not output_file.exists() or output_file.stat().st_size == 0:
+        return 0
+    done = set()
+    with open(output_file, 'r', newline='') as f, open(state_file, 'w', newline='') as state:
+        state_writer = csv.writer(state)
+        for row in csv.DictReader(f):
+            key = row_key(row)
+            if key is not None and key not in done:
+                done.add(key)
+                state_writer.writerow([row['lens_name'], row['lens_ra'], row['lens_dec']])
+    return len(done)
+
+
+def drop_unfinished(output_file, done):
+    """
+    Quita del CSV las filas de lentes que no llegaron al estado (corte entre
+    escribir las filas y anotar el lente) y las filas truncadas, para que al
+    reintentarlos no se dupliquen. Recorre el archivo fila a fila: la memoria
+    no crece con él.
+    """
+    if not output_file.exists():
+        return 0
+    tmp_file = output_file.with_suffix('.tmp')
+    dropped = 0
+    with open(output_file, 'r', newline='') as f, open(tmp_file, 'w', newline='') as out:
+        reader = csv.DictReader(f)
+        writer = csv.DictWriter(out, fieldnames=OUTPUT_COLUMNS)
+        writer.writeheader()
+        for row in reader:
+            if row_key(row) in done:
+                writer.writerow(row)
+            else:
+                dropped += 1
+    if dropped:
+        os.replace(tmp_file, output_file)
+    else:
+        tmp_file.unlink()
+    return dropped
+
+
+def build_rows(lens, data):
+    """Una fila del CSV por objeto SDSS encontrado alrededor del lente."""
+    rows = []
+    # Puede haber múltiples objetos cerca - guardar todos
+    for obj in data:
+        try:
+            rows.append({
+                'lens_name': lens['name'],
+                'lens_ra': float(lens['RA']),
+                'lens_dec': float(lens['DEC']),
+                'lens_z': lens['zlens'],
+                'sdss_objid': obj.get('objid', ''),
+                'sdss_ra': obj.get('ra', ''),
+                'sdss_dec': obj.get('dec', ''),
+                'sdss_type': obj.get('type', ''),
+                'u': obj.get('u', ''),
+                'g': obj.get('g', ''),
+                'r': obj.get('r', ''),
+                'i': obj.get('i', ''),
+                'z': obj.get('z', ''),
+                'u_err': obj.get('err_u', ''),
+                'g_err': obj.get('err_g', ''),
+                'r_err': obj.get('err_r', ''),
+                'i_err': obj.get('err_i', ''),
+                'z_err': obj.get('err_z', ''),
+                'distance_arcsec': obj.get('distance', '') 
+            })
+        except Exception as e:
+            print(f"  Error procesando objeto: {e}")
+    return rows
+
 
 def parse_args():
     parser = argparse.ArgumentParser(
@@ -70,6 +257,28 @@ def parse_args():
         default=None,
         help="Procesa solo la fila indicada (1-based).",
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=WORKERS,
+        help=f"Queries en vuelo a la vez (por defecto {WORKERS}).",
+    )
+    parser.add_argument(
+        "--rate",
+        type=float,
+        default=RATE,
+        help=f"Maximo de queries por segundo, compartido entre workers (por defecto {RATE}).",
+    )
+    parser.add_argument(
+        "--url",
+        default=SDSS_URL,
+        help="Endpoint RadialSearch (por ejemplo, un servidor local de prueba).",
+    )
+    parser.add_argument(
+        "--fresh",
+        action="store_true",
+        help="Ignora el progreso guardado: borra el CSV y el estado y empieza de cero.",
+    )
     return parser.parse_args()
 
 
@@ -99,98 +308,127 @@ def main():
             raise ValueError("--limit debe ser un entero positivo")
         lenses = lenses[: args.limit]
 
+    if args.workers <= 0:
+        raise ValueError("--workers debe ser un entero positivo")
+    if args.rate <= 0:
+        raise ValueError("--rate debe ser positivo")
+
+    # Progreso de corridas anteriores
+    if args.fresh:
+        for path in (OUTPUT_FILE, STATE_FILE):
+            if path.exists():
+                path.unlink()
+    for path in (OUTPUT_FILE, STATE_FILE):
+        trim_partial_line(path)
+    rebuilt = rebuild_state(OUTPUT_FILE, STATE_FILE)
+    done_keys = load_state(STATE_FILE)
+    dropped = drop_unfinished(OUTPUT_FILE, done_keys)
+    total = len(lenses)
+    lenses = [lens for lens in lenses
+              if lens_key(lens['name'], lens['RA'], lens['DEC']) not in done_keys]
+    skipped = total - len(lenses)
+
     print(f"Lentes a procesar: {len(lenses)}")
+    if rebuilt:
+        print(f"Estado reconstruido desde el CSV existente: {rebuilt} lentes "
+              f"(usar --fresh para descargar todo de nuevo)")
+    if skipped:
+        print(f"Lentes ya terminados (se saltean): {skipped}")
+    if dropped:
+        print(f"Filas incompletas descartadas del CSV: {dropped}")
     print(f"Radio de búsqueda: {SEARCH_RADIUS} arcsec")
+    print(f"Workers: {args.workers}, tasa maxima: {args.rate} queries/s")
+    print(f"Archivo de salida: {OUTPUT_FILE}")
     print()
-    
-    # Preparar archivo de salida
-    output_columns = [
-        'lens_name', 'lens_ra', 'lens_dec', 'lens_z',
-        'sdss_objid', 'sdss_ra', 'sdss_dec', 'sdss_type',
-        'u', 'g', 'r', 'i', 'z',
-        'u_err', 'g_err', 'r_err', 'i_err', 'z_err',
-        'distance_arcsec'
-    ]
-    
-    results = []
+
+    limiter = TokenBucket(args.rate)
     errors = []
+    failed = []
+    n_objects = 0
     
     print("Iniciando descarga...")
     print("-" * 60)
     
-    for i, lens in enumerate(lenses):
-        name = lens['name']
-        ra = float(lens['RA'])
-        dec = float(lens['DEC'])
-        zlens = lens['zlens']
-        
-        print(f"[{i+1}/{len(lenses)}] {name} (RA={ra:.4f}, DEC={dec:.4f})")
-        
-        # Query SDSS
-        data = query_sdss_photometry(ra, dec, SEARCH_RADIUS)
-        
-        if data and len(data) > 0:
-            # Puede haber múltiples objetos cerca - guardar todos
-            for obj in data:
-                try:
-                    result = {
-                        'lens_name': name,
-                        'lens_ra': ra,
-                        'lens_dec': dec,
-                        'lens_z': zlens,
-                        'sdss_objid': obj.get('objid', ''),
-                        'sdss_ra': obj.get('ra', ''),
-                        'sdss_dec': obj.get('dec', ''),
-                        'sdss_type': obj.get('type', ''),
-                        'u': obj.get('u', ''),
-                        'g': obj.get('g', ''),
-                        'r': obj.get('r', ''),
-                        'i': obj.get('i', ''),
-                        'z': obj.get('z', ''),
-                        'u_err': obj.get('err_u', ''),
-                        'g_err': obj.get('err_g', ''),
-                        'r_err': obj.get('err_r', ''),
-                        'i_err': obj.get('err_i', ''),
-                        'z_err': obj.get('err_z', ''),
-                        'distance_arcsec': obj.get('distance', '') 
-                    }
-                    results.append(result)
-                except Exception as e:
-                    print(f"  Error procesando objeto: {e}")
-            
-            print(f"  -> {len(data)} objetos encontrados")
-        else:
-            print(f"  -> Sin datos")
-            errors.append(name)
-        
-        # Pausa para no sobrecargar el servidor
-        time.sleep(0.5)
-        
-        # Guardar progreso cada 50 lentes
-        if (i + 1) % 50 == 0:
-            print()
-            print(f"Progreso: {i+1}/{len(lenses)} ({100*(i+1)/len(lenses):.1f}%)")
-            print(f"Objetos encontrados: {len(results)}")
+    new_file = not OUTPUT_FILE.exists() or OUTPUT_FILE.stat().st_size == 0
+    with open(OUTPUT_FILE, 'a', newline='') as out, open(STATE_FILE, 'a', newline='') as state, \
+            ThreadPoolExecutor(max_workers=args.workers) as executor:
+        writer = csv.DictWriter(out, fieldnames=OUTPUT_COLUMNS)
+        state_writer = csv.writer(state)
+        if new_file:
+            writer.writeheader()
+        # Ventana acotada: nunca hay más de 2 × workers queries pendientes, así
+        # que la memoria de Futures y respuestas JSON no crece con el catálogo
+        pending = iter(lenses)
+        in_flight = {}
+
+        def submit_next():
+            lens = next(pending, None)
+            if lens is not None:
+                future = executor.submit(query_sdss_photometry, float(lens['RA']),
+                                         float(lens['DEC']), SEARCH_RADIUS, args.url, limiter)
+                in_flight[future] = lens
+
+        for _ in range(2 * args.workers):
+            submit_next()
+        count = 0
+        try:
+            # Las respuestas llegan en cualquier orden; el contador es de terminadas
+            while in_flight:
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    lens = in_flight.pop(future)
+                    data = future.result()
+                    submit_next()
+                    count += 1
+                    
+                    print(f"[{count}/{len(lenses)}] {lens['name']} "
+                          f"(RA={float(lens['RA']):.4f}, DEC={float(lens['DEC']):.4f})")
+                    
+                    if data is None:
+                        # Falló la query: no se anota, se reintenta en la próxima corrida
+                        print("  -> Error, queda pendiente")
+                        failed.append(lens['name'])
+                        continue
+                    if len(data) > 0:
+                        rows = build_rows(lens, data)
+                        writer.writerows(rows)
+                        n_objects += len(rows)
+                        print(f"  -> {len(data)} objetos encontrados")
+                    else:
+                        print("  -> Sin datos")
+                        errors.append(lens['name'])
+                    # Primero las filas, después el estado: un corte entre los dos
+                    # deja filas huérfanas que drop_unfinished limpia al relanzar.
+                    # El fsync garantiza ese orden también en disco
+                    out.flush()
+                    os.fsync(out.fileno())
+                    state_writer.writerow([lens['name'], lens['RA'], lens['DEC']])
+                    state.flush()
+                    
+                    if count % 50 == 0:
+                        print()
+                        print(f"Progreso: {count}/{len(lenses)} ({100*count/len(lenses):.1f}%)")
+                        print(f"Objetos encontrados: {n_objects}")
+                        print()
+        except KeyboardInterrupt:
+            for future in in_flight:
+                future.cancel()
             print()
+            print("Interrumpido: lo terminado ya está guardado, relanzar para seguir.")
+            raise SystemExit(130)
     
     print("-" * 60)
     print()
-    
-    # Guardar resultados
-    print(f"Guardando resultados en {OUTPUT_FILE}...")
-    with open(OUTPUT_FILE, 'w', newline='') as f:
-        writer = csv.DictWriter(f, fieldnames=output_columns)
-        writer.writeheader()
-        writer.writerows(results)
-    
-    print()
     print("=" * 60)
     print("RESUMEN")
     print("=" * 60)
     print(f"Lentes procesados: {len(lenses)}")
-    print(f"Objetos SDSS encontrados: {len(results)}")
+    print(f"Lentes salteados (corridas anteriores): {skipped}")
+    print(f"Objetos SDSS encontrados: {n_objects}")
     print(f"Lentes sin datos: {len(errors)}")
+    print(f"Queries fallidas (pendientes): {len(failed)}")
     print(f"Archivo de salida: {OUTPUT_FILE}")
+    print(f"Estado: {STATE_FILE}")
     print()
     
     if errors:
@@ -200,6 +438,14 @@ def main():
         if len(errors) > 10:
             print(f"  ... y {len(errors)-10} más")
     
+    if failed:
+        print()
+        print(f"Queries fallidas ({len(failed)}), relanzar el script para reintentarlas:")
+        for e in failed[:10]:
+            print(f"  - {e}")
+        if len(failed) > 10:
+            print(f"  ... y {len(failed)-10} más")
+    
     print()
     print("Listo para análisis de cromaticidad!")
     print("Siguiente paso: comparar magnitudes u vs z para cada lente")
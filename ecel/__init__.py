@@ -0,0 +1,34 @@
+"""
+Núcleo numérico compartido por las escenas GravityeCEL.
+
+Solo depende de NumPy (y PyYAML para leer config_ecel.yaml); no importa Manim,
+así que se puede usar y probar fuera de un render. Las escenas convierten los
+arreglos que devuelve este paquete en Mobjects.
+
+Módulos:
+- cache: caché de geometría direccionada por contenido (disco + LRU en memoria)
+- halos: geometría de halos eCEL (puntos, radios, opacidades)
+- desplazamiento: factor de desplazamiento vectorizado desde la tabla del YAML
+- campo: densidad eCEL combinada de N masas (puntos o textura RGBA)
+- barnes_hut: mismo campo con quadtree (miles de cuerpos), con validación;
+  campo_desde_config elige directo o jerárquico según la sección `campo` del YAML
+- rejilla: coordenadas de rejilla e interpolación bilineal
+- poisson: potencial de presión eCEL por FFT (periódico o abierto) y su fuerza;
+  fuerza_discos deforma el grid y orienta las flechas de manim.py (OceanGravity)
+- oceano: océano estático con masa móvil, recalculo incremental por rejilla hash
+- sph: océano como fluido SPH con la masa como frontera móvil (efecto piscina)
+- ondas: estela de ondas 2D con fuentes móviles, altura y pendiente muestreables
+- nbody: integradores en lote (E, B, 2) para N cuerpos: leapfrog, Yoshida, Dormand-Prince
+- trayectorias: trayectorias integradas y cacheadas, remuestreo Hermite por tiempo o longitud de arco
+- geometria: puntos Bézier y longitud de arco de lotes de caminos (sin física)
+- rayos: rayos de luz curvados por el gradiente eCEL, integrados en lote (M, 2);
+  CaminoArco para animar fotones por longitud de arco
+- refraccion: índice n = 1 + alfa ρ en rejilla y trazado eikonal con búsquedas bilineales
+- deflexion: barrido α(b), ajuste de potencia y comparación con Eddington/GR (CLI)
+- paralelo: pool de procesos persistente con arreglos en memoria compartida
+- lente: imagen lenteada por trazado inverso por píxel; RenderLente reusa el pool por escena
+- cromatico: deflexión según λ (bandas ugriz) desde una sola integración perturbativa
+- causticas: magnificación y cáusticas por disparo de rayos en bloques entre procesos
+- agujero_negro: fotones por la ecuación de Binet vectorizada, clasificación y sombra
+- glow: caminos rasterizados en buffer float + pirámide gaussiana separable → una imagen
+"""
@@ -0,0 +1,215 @@
+"""
+Fotones alrededor de un agujero negro tipo Schwarzschild (plano ecuatorial).
+
+Unidades geométricas G = c = 1 y masa M en unidades de escena: radio de
+Schwarzschild r_s = 2M, esfera de fotones r = 3M, parámetro de impacto
+crítico b_c = 3√3 M. Con u = 1/r y el ángulo φ como variable, la órbita de
+un fotón cumple la ecuación de Binet
+
+    u'' + u = 3 M u²
+
+Un fotón que llega desde x = -∞ a altura b arranca con u = 0, u' = 1/b
+(con M = 0 da la recta u = sin φ / b). Todos los fotones de un paquete se
+integran juntos con RK4 de paso fijo dφ sobre arreglos (N,), y solo se
+avanzan los que siguen activos. Cada fotón termina como:
+
+- CAPTURADO: cruza el horizonte, u ≥ 1 / (2M), o choca con la superficie
+  del cuerpo si todavía es más grande que r_s (`radio_cuerpo`); el fotón
+  frontal b = 0 cae en línea recta y no se integra
+- DESVIADO: vuelve al infinito (u ≤ 0); la deflexión es φ_final - π
+- ORBITANDO: sigue dando vueltas al llegar a φ_max (b ≈ b_c)
+
+El eCEL entra por la masa: `masa_efectiva` escala M con
+calcular_factor_desplazamiento(densidad), que llega a desplazamiento total
+en densidad ≥ 100. En el colapso el cuerpo conserva su materia y se achica
+como ρ^(-1/3) (`radio_colapso`); el horizonte se forma cuando r_s = 2M
+supera al radio del cuerpo.
+
+`imagen_sombra` arma la imagen que ve un observador lejano: sombra negra
+para b < b_c, anillo de fotones donde los fotones dan vueltas extra y el
+fondo desplazado por la deflexión fuera.
+"""
+import numpy as np
+
+from ecel.desplazamiento import calcular_factor_desplazamiento
+from ecel.rejilla import centros_rejilla, muestrear_bilineal
+
+CAPTURADO = 0
+DESVIADO = 1
+ORBITANDO = 2
+
+
+def b_critico(masa):
+    """Parámetro de impacto crítico 3√3 M: debajo, el fotón cae."""
+    return 3 * np.sqrt(3) * masa
+
+
+def masa_efectiva(densidad, masa_maxima, tabla=None):
+    """M = factor de desplazamiento(densidad) × masa_maxima."""
+    return calcular_factor_desplazamiento(densidad, tabla) * masa_maxima
+
+
+def radio_colapso(densidad, radio_inicial, densidad_inicial):
+    """Radio del cuerpo al comprimirse a `densidad` (masa constante: R ∝ ρ^(-1/3))."""
+    return radio_inicial * (densidad_inicial / np.asarray(densidad, dtype=float)) ** (1 / 3)
+
+
+def _binet(u, du, masa):
+    return du, 3 * masa * u * u - u
+
+
+def integrar_fotones(b, masa, dphi=0.01, vueltas_max=3.0, guardar_caminos=False, r_max=None,
+                     radio_cuerpo=0.0):
+    """
+    Integra N fotones con parámetro de impacto b (N,) (signo = lado de la masa).
+
+    Devuelve dict 'estado' (N,) (CAPTURADO / DESVIADO / ORBITANDO),
+    'phi_final' (N,), 'deflexion' (N,) (φ_final - π, NaN si no salió) y, con
+    guardar_caminos, 'caminos': lista de N arreglos (n_i, 2) en coordenadas
+    de escena (masa en el origen, fotones viajando hacia +x) limitados a
+    r ≤ r_max.
+    """
+    b = np.atleast_1d(np.asarray(b, dtype=float))
+    n = len(b)
+    signo = np.where(b < 0, -1.0, 1.0)
+    # b = 0 es la caída radial (u' = ∞): no entra en la integración
+    radial = b == 0
+    u = np.zeros(n)
+    du = np.zeros(n)
+    du[~radial] = 1.0 / np.abs(b[~radial])
+    phi = np.zeros(n)
+    radio_absorcion = max(2 * masa, radio_cuerpo)
+    u_horizonte = 1.0 / radio_absorcion if radio_absorcion > 0 else np.inf
+    phi_max = 2 * np.pi * vueltas_max
+    u_min = 1.0 / r_max if r_max else 0.0
+
+    estado = np.full(n, ORBITANDO)
+    phi_final = np.full(n, phi_max)
+    activo = ~radial
+    registros = []
+
+    def registrar(indices, u_i, phi_i):
+        if guardar_caminos:
+            visible = u_i > u_min
+            indices, u_i, phi_i = indices[visible], u_i[visible], phi_i[visible]
+            r = 1.0 / u_i
+            registros.append((indices, np.column_stack([-r * np.cos(phi_i),
+                                                        signo[indices] * r * np.sin(phi_i)])))
+
+    if radial.any():
+        indices = np.nonzero(radial)[0]
+        if np.isfinite(u_horizonte):
+            # Cae en línea recta sobre el eje hasta el horizonte (o la superficie)
+            estado[indices] = CAPTURADO
+            phi_final[indices] = 0.0
+            for u_i in np.linspace(u_min, u_horizonte, 64)[1:]:
+                registrar(indices, np.full(len(indices), u_i), np.zeros(len(indices)))
+        else:
+            # Sin masa ni cuerpo atraviesa el origen sin desviarse
+            estado[indices] = DESVIADO
+            phi_final[indices] = np.pi
+
+    for _ in range(int(np.ceil(phi_max / dphi))):
+        a = np.nonzero(activo)[0]
+        if not len(a):
+            break
+        u0, v0 = u[a], du[a]
+
+        k1u, k1v = _binet(u0, v0, masa)
+        k2u, k2v = _binet(u0 + 0.5 * dphi * k1u, v0 + 0.5 * dphi * k1v, masa)
+        k3u, k3v = _binet(u0 + 0.5 * dphi * k2u, v0 + 0.5 * dphi * k2v, masa)
+        k4u, k4v = _binet(u0 + dphi * k3u, v0 + dphi * k3v, masa)
+        u1 = u0 + (dphi / 6) * (k1u + 2 * k2u + 2 * k3u + k4u)
+        v1 = v0 + (dphi / 6) * (k1v + 2 * k2v + 2 * k3v + k4v)
+        phi1 = phi[a] + dphi
+
+        # Cruce de u = 0 (escape) o u = u_horizonte (captura) interpolado en el paso
+        escapa = u1 <= 0
+        cae = u1 >= u_horizonte
+        with np.errstate(divide='ignore', invalid='ignore'):
+            phi_cruce = np.where(escapa, phi[a] + dphi * u0 / (u0 - u1),
+                                 phi[a] + dphi * (u_horizonte - u0) / (u1 - u0))
+        u1 = np.where(escapa, 0.0, np.where(cae, u_horizonte, u1))
+        phi1 = np.where(escapa | cae, phi_cruce, phi1)
+
+        u[a], du[a], phi[a] = u1, v1, phi1
+        registrar(a, u1, phi1)
+
+        termina = escapa | cae
+        estado[a[escapa]] = DESVIADO
+        estado[a[cae]] = CAPTURADO
+        phi_final[a[termina]] = phi1[termina]
+        activo[a[termina]] = False
+
+    deflexion = np.where(estado == DESVIADO, phi_final - np.pi, np.nan)
+    resultado = {'estado': estado, 'phi_final': phi_final, 'deflexion': deflexion}
+    if guardar_caminos:
+        if registros:
+            indices = np.concatenate([r[0] for r in registros])
+            puntos = np.concatenate([r[1] for r in registros])
+        else:
+            indices, puntos = np.zeros(0, dtype=int), np.zeros((0, 2))
+        orden = np.argsort(indices, kind='stable')
+        cortes = np.cumsum(np.bincount(indices, minlength=n))[:-1]
+        resultado['caminos'] = np.split(puntos[orden], cortes)
+    return resultado
+
+
+def perfil_sombra(masa, b_max, n=4000, dphi=0.005, vueltas_max=3.0):
+    """Perfil 1D sobre b ∈ (0, b_max]: dict 'b', 'estado', 'deflexion', 'vueltas'."""
+    b = np.linspace(b_max / n, b_max, n)
+    fotones = integrar_fotones(b, masa, dphi=dphi, vueltas_max=vueltas_max)
+    return {
+        'b': b,
+        'estado': fotones['estado'],
+        'deflexion': fotones['deflexion'],
+        'vueltas': fotones['phi_final'] / (2 * np.pi),
+    }
+
+
+def imagen_sombra(masa, extent, nx, ny, fondo, extent_fuente, distancia_fuente,
+                  perfil=None, color_anillo=(255, 214, 150), brillo_anillo=1.5):
+    """
+    Imagen RGBA uint8 (ny, nx, 4) con la fila 0 arriba (para ImageMobject).
+
+    fondo: RGBA (hy, hx, 4) con la fila 0 en y mínimo sobre extent_fuente
+    (se repite periódicamente). Cada píxel a distancia b del centro toma el
+    fondo en β = θ - D δ(b) r̂; b < b_c queda negro y los fotones que dan
+    vueltas extra alrededor de la esfera de fotones encienden el anillo.
+    """
+    xs, ys = centros_rejilla(extent, nx, ny)
+    gx, gy = np.meshgrid(xs, ys)
+    puntos = np.column_stack([gx.ravel(), gy.ravel()])
+    b = np.linalg.norm(puntos, axis=1)
+
+    if perfil is None:
+        b_max = float(b.max()) if masa > 0 else 1.0
+        perfil = perfil_sombra(masa, b_max)
+    b_tabla = perfil['b']
+    escapa = perfil['estado'] == DESVIADO
+    deflexion = np.interp(b, b_tabla[escapa], perfil['deflexion'][escapa]) if escapa.any() \
+        else np.zeros_like(b)
+    capturado = np.interp(b, b_tabla, (perfil['estado'] != DESVIADO).astype(float)) > 0.5
+
+    # Fuera de la tabla: cola de campo débil 4M / b
+    fuera = b > b_tabla[-1]
+    deflexion[fuera] = 4 * masa / b[fuera]
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        direccion = np.where(b[:, None] > 0, puntos / b[:, None], 0.0)
+    beta = puntos - distancia_fuente * deflexion[:, None] * direccion
+    x_min, x_max, y_min, y_max = extent_fuente
+    beta = np.column_stack([
+        x_min + np.mod(beta[:, 0] - x_min, x_max - x_min),
+        y_min + np.mod(beta[:, 1] - y_min, y_max - y_min),
+    ])
+    color = muestrear_bilineal(np.asarray(fondo, dtype=float), extent_fuente, beta)
+
+    # Anillo de fotones: media vuelta de más ya lo enciende, satura hacia b_c
+    vueltas = np.interp(b, b_tabla, perfil['vueltas'])
+    extra = np.clip((vueltas - 0.5) * 2, 0.0, 1.0) ** 4
+    color[:, :3] += brillo_anillo * extra[:, None] * np.asarray(color_anillo, dtype=float)
+    color[capturado] = (0, 0, 0, 255)
+
+    rgba = np.clip(color, 0, 255).astype(np.uint8).reshape(ny, nx, 4)
+    return np.flipud(rgba)
@@ -0,0 +1,214 @@
+"""
+Evaluación jerárquica (Barnes-Hut) del campo eCEL para miles de cuerpos.
+
+Jerarquía galaxia → sol → planeta → luna: sumar 1/r² de cada cuerpo en cada
+punto cuesta O(N·M). Aquí los cuerpos se agrupan en un quadtree; un nodo
+lejano se aproxima por su monopolo
+
+    ρ_nodo(x) ≈ W / |x - x_W|²,    W = Σ peso_i,   x_W = centroide por peso
+
+y solo los nodos cercanos se abren. El criterio es el clásico s/d < θ
+(s = lado de la caja, d = distancia al centroide): θ = 0 es suma directa,
+θ ≈ 0.5 es un buen equilibrio, θ más grande es más rápido y menos exacto.
+
+`CampoJerarquico` tiene la misma interfaz que `CampoMasas`
+(densidad, gradiente, imagen, mover), así que los renderizadores no cambian.
+`validar()` compara contra la suma directa y reporta el error.
+`campo_desde_config` elige entre los dos según la sección `campo` del YAML.
+"""
+import time
+
+import numpy as np
+
+from ecel.campo import CampoMasas, MAX_ELEMENTOS
+
+
+class CampoJerarquico(CampoMasas):
+    """
+    Campo eCEL de N masas evaluado con un quadtree.
+
+    theta: ángulo de apertura (s/d); hoja_max: cuerpos por hoja.
+    """
+
+    def __init__(self, centros, radios, densidades, base=0.0, theta=0.5,
+                 hoja_max=8, max_elementos=MAX_ELEMENTOS):
+        super().__init__(centros, radios, densidades, base=base, max_elementos=max_elementos)
+        self.theta = theta
+        self.hoja_max = hoja_max
+        self._construir()
+
+    def mover(self, centros):
+        """Actualiza posiciones y reconstruye el árbol (O(N log N))."""
+        super().mover(centros)
+        self._construir()
+
+    def _construir(self):
+        """Arma el quadtree sobre una permutación de los cuerpos."""
+        centros = self.centros
+        n = len(centros)
+        self.orden = np.arange(n)
+
+        minimo = centros.min(axis=0)
+        maximo = centros.max(axis=0)
+        mitad_raiz = max(float((maximo - minimo).max()) / 2, 1e-9) * (1 + 1e-9)
+
+        cajas = []        # (cx, cy, mitad)
+        rangos = []       # (inicio, fin) en self.orden
+        hijos = []        # lista de índices de hijos
+        pila = [((minimo + maximo) / 2, mitad_raiz, 0, n, None)]
+
+        while pila:
+            centro_caja, mitad, inicio, fin, padre = pila.pop()
+            nodo = len(cajas)
+            cajas.append((centro_caja[0], centro_caja[1], mitad))
+            rangos.append((inicio, fin))
+            hijos.append([])
+            if padre is not None:
+                hijos[padre].append(nodo)
+
+            if fin - inicio <= self.hoja_max or mitad < 1e-12:
+                continue
+
+            idx = self.orden[inicio:fin]
+            p = centros[idx]
+            cuadrante = (p[:, 0] >= centro_caja[0]).astype(int) + 2 * (p[:, 1] >= centro_caja[1])
+            permutacion = np.argsort(cuadrante, kind='stable')
+            self.orden[inicio:fin] = idx[permutacion]
+            cuenta = np.bincount(cuadrante, minlength=4)
+
+            desplazamientos = np.array([[-1, -1], [1, -1], [-1, 1], [1, 1]]) * (mitad / 2)
+            pos = inicio
+            for q in range(4):
+                if cuenta[q]:
+                    pila.append((centro_caja + desplazamientos[q], mitad / 2,
+                                 pos, pos + cuenta[q], nodo))
+                pos += cuenta[q]
+
+        self.nodo_rango = np.array(rangos)
+        self.nodo_tam2 = (2 * np.array(cajas)[:, 2]) ** 2
+        self.nodo_hijos = hijos
+
+        # Monopolo de cada nodo (peso total y centroide ponderado)
+        pesos_ord = self.pesos[self.orden]
+        centros_ord = centros[self.orden]
+        acum_w = np.concatenate([[0.0], np.cumsum(pesos_ord)])
+        acum_wx = np.vstack([[0.0, 0.0], np.cumsum(pesos_ord[:, None] * centros_ord, axis=0)])
+        acum_x = np.vstack([[0.0, 0.0], np.cumsum(centros_ord, axis=0)])
+        ini, fin = self.nodo_rango[:, 0], self.nodo_rango[:, 1]
+        self.nodo_peso = acum_w[fin] - acum_w[ini]
+        geometrico = (acum_x[fin] - acum_x[ini]) / (fin - ini)[:, None]
+        con_peso = self.nodo_peso > 0
+        self.nodo_centroide = geometrico
+        self.nodo_centroide[con_peso] = (
+            (acum_wx[fin] - acum_wx[ini])[con_peso] / self.nodo_peso[con_peso, None]
+        )
+
+    def evaluar(self, puntos, vaciar_interior=True):
+        """Densidad (M,) y gradiente (M, 2) en un solo recorrido del árbol."""
+        puntos = np.asarray(puntos, dtype=float)[:, :2]
+        m = len(puntos)
+        rho = np.zeros(m)
+        grad = np.zeros((m, 2))
+        dentro = np.zeros(m, dtype=bool)
+        theta2 = self.theta ** 2
+
+        pila = [(0, np.arange(m))]
+        while pila:
+            nodo, idx = pila.pop()
+            peso = self.nodo_peso[nodo]
+            delta = puntos[idx] - self.nodo_centroide[nodo]
+            r2 = np.einsum('mk,mk->m', delta, delta)
+
+            lejos = self.nodo_tam2[nodo] < theta2 * r2
+            if peso > 0 and lejos.any():
+                i = idx[lejos]
+                rho[i] += peso / r2[lejos]
+                grad[i] += (-2.0 * peso / r2[lejos] ** 2)[:, None] * delta[lejos]
+
+            cerca = idx[~lejos]
+            if not len(cerca):
+                continue
+            if self.nodo_hijos[nodo]:
+                for hijo in self.nodo_hijos[nodo]:
+                    pila.append((hijo, cerca))
+            else:
+                self._directo(puntos, cerca, nodo, rho, grad, dentro)
+
+        rho += self.base
+        if vaciar_interior:
+            rho[dentro] = 0.0
+        return rho, grad
+
+    def _directo(self, puntos, idx, nodo, rho, grad, dentro):
+        """Suma directa contra los cuerpos de una hoja (mismo kernel que CampoMasas)."""
+        inicio, fin = self.nodo_rango[nodo]
+        cuerpos = self.orden[inicio:fin]
+        centros = self.centros[cuerpos]
+        pesos = self.pesos[cuerpos]
+        r_min2 = self.radios[cuerpos] ** 2
+
+        tam = max(1, self.max_elementos // len(cuerpos))
+        for a in range(0, len(idx), tam):
+            i = idx[a:a + tam]
+            delta = puntos[i, None, :] - centros[None, :, :]
+            r2 = np.einsum('mnk,mnk->mn', delta, delta)
+            r2c = np.maximum(r2, r_min2)
+            rho[i] += (pesos / r2c).sum(axis=1)
+            coef = np.where(r2 >= r_min2, -2.0 * pesos / r2c ** 2, 0.0)
+            grad[i] += np.einsum('mn,mnk->mk', coef, delta)
+            dentro[i] |= (r2 < r_min2).any(axis=1)
+
+    def densidad(self, puntos, vaciar_interior=True):
+        return self.evaluar(puntos, vaciar_interior)[0]
+
+    def gradiente(self, puntos):
+        return self.evaluar(puntos)[1]
+
+    def validar(self, puntos):
+        """
+        Error de la aproximación contra la suma directa (CampoMasas).
+
+        Devuelve un dict con errores relativos máximo y medio de densidad y
+        gradiente, y los tiempos de ambos métodos en segundos.
+        """
+        directo = CampoMasas(self.centros, self.radios, self.densidades,
+                             base=self.base, max_elementos=self.max_elementos)
+
+        t0 = time.perf_counter()
+        rho_a, grad_a = self.evaluar(puntos)
+        t1 = time.perf_counter()
+        rho_d = directo.densidad(puntos)
+        grad_d = directo.gradiente(puntos)
+        t2 = time.perf_counter()
+
+        validos = rho_d > 0
+        err_rho = np.abs(rho_a - rho_d)[validos] / rho_d[validos]
+        norma = np.linalg.norm(grad_d, axis=1)
+        validos_g = norma > 0
+        err_grad = np.linalg.norm(grad_a - grad_d, axis=1)[validos_g] / norma[validos_g]
+
+        return {
+            'theta': self.theta,
+            'cuerpos': len(self.centros),
+            'puntos': len(puntos),
+            'error_densidad_max': float(err_rho.max()) if err_rho.size else 0.0,
+            'error_densidad_medio': float(err_rho.mean()) if err_rho.size else 0.0,
+            'error_gradiente_max': float(err_grad.max()) if err_grad.size else 0.0,
+            'error_gradiente_medio': float(err_grad.mean()) if err_grad.size else 0.0,
+            'tiempo_arbol': t1 - t0,
+            'tiempo_directo': t2 - t1,
+        }
+
+
+def campo_desde_config(config, centros, radios, densidades, base=0.0):
+    """
+    Campo de N masas según la sección `campo` de config_ecel.yaml:
+    CampoJerarquico si `jerarquico` es true, si no CampoMasas (suma directa).
+    """
+    cfg = config.get('campo', {})
+    max_elementos = cfg.get('max_elementos', MAX_ELEMENTOS)
+    if cfg.get('jerarquico', False):
+        return CampoJerarquico(centros, radios, densidades, base=base,
+                               theta=cfg.get('theta', 0.5), hoja_max=cfg.get('hoja_max', 8),
+                               max_elementos=max_elementos)
+    return CampoMasas(centros, radios, densidades, base=base, max_elementos=max_elementos)
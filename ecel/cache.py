@@ -0,0 +1,134 @@
+"""
+Caché de geometría direccionada por contenido.
+
+Cada resultado es un diccionario de arreglos NumPy. Se guarda en disco como
+`.npz` comprimido cuyo nombre es el hash SHA-256 de (tipo, parámetros), y se
+mantiene una capa LRU en memoria para que escenas que repiten el mismo halo
+(ej. ComparacionDensidades) no vuelvan a leer el disco.
+
+Los arreglos devueltos son de solo lectura: se comparten entre llamadas.
+"""
+import hashlib
+import json
+import os
+from collections import OrderedDict
+from pathlib import Path
+
+import numpy as np
+
+# Subir si cambia la lógica de algún generador (invalida todo lo guardado)
+VERSION_CACHE = 1
+
+RAIZ_REPO = Path(__file__).resolve().parent.parent
+DIRECTORIO_DEFECTO = RAIZ_REPO / "media" / "cache_ecel"
+
+
+def _normalizar(valor):
+    """Convierte parámetros a algo serializable en JSON de forma estable."""
+    if isinstance(valor, dict):
+        return {str(k): _normalizar(v) for k, v in sorted(valor.items())}
+    if isinstance(valor, (list, tuple)):
+        return [_normalizar(v) for v in valor]
+    if isinstance(valor, np.ndarray):
+        arr = np.ascontiguousarray(valor)
+        return {
+            'dtype': str(arr.dtype),
+            'shape': list(arr.shape),
+            'sha256': hashlib.sha256(arr.tobytes()).hexdigest(),
+        }
+    if isinstance(valor, np.generic):
+        return valor.item()
+    if isinstance(valor, float):
+        return repr(valor)  # repr es exacto y estable
+    return valor
+
+
+def clave_cache(tipo, params):
+    """Hash SHA-256 (hex) de tipo + parámetros + versión de caché."""
+    contenido = {
+        'tipo': tipo,
+        'version': VERSION_CACHE,
+        'params': _normalizar(params),
+    }
+    texto = json.dumps(contenido, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(texto.encode('utf-8')).hexdigest()
+
+
+class CacheGeometria:
+    """
+    Caché en dos niveles: LRU en memoria sobre archivos .npz en disco.
+
+    Uso:
+        cache = CacheGeometria()
+        geo = cache.obtener('halo_cascada', params, lambda: generar(**params))
+    """
+
+    def __init__(self, directorio=None, max_memoria=64, en_disco=True):
+        self.directorio = Path(directorio) if directorio else DIRECTORIO_DEFECTO
+        self.max_memoria = max_memoria
+        self.en_disco = en_disco
+        self._memoria = OrderedDict()
+        self.aciertos_memoria = 0
+        self.aciertos_disco = 0
+        self.fallos = 0
+
+    @classmethod
+    def desde_config(cls, config):
+        """Crea la caché desde la sección `cache` de config_ecel.yaml."""
+        cfg = config.get('cache', {})
+        directorio = cfg.get('directorio')
+        if directorio and not Path(directorio).is_absolute():
+            directorio = RAIZ_REPO / directorio
+        return cls(
+            directorio=directorio,
+            max_memoria=cfg.get('max_memoria', 64),
+            en_disco=cfg.get('habilitado', True),
+        )
+
+    def obtener(self, tipo, params, generador):
+        """
+        Devuelve el resultado cacheado para (tipo, params) o lo genera.
+
+        `generador` es un callable sin argumentos que retorna un dict
+        {nombre: arreglo}.
+        """
+        clave = clave_cache(tipo, params)
+
+        if clave in self._memoria:
+            self._memoria.move_to_end(clave)
+            self.aciertos_memoria += 1
+            return self._memoria[clave]
+
+        ruta = self.directorio / f"{tipo}-{clave[:32]}.npz"
+        datos = None
+        if self.en_disco and ruta.exists():
+            try:
+                with np.load(ruta, allow_pickle=False) as npz:
+                    datos = {nombre: npz[nombre] for nombre in npz.files}
+                self.aciertos_disco += 1
+            except (OSError, ValueError):
+                datos = None  # archivo corrupto o truncado: se regenera
+
+        if datos is None:
+            datos = {k: np.asarray(v) for k, v in generador().items()}
+            self.fallos += 1
+            if self.en_disco:
+                self._guardar(ruta, datos)
+
+        for arr in datos.values():
+            arr.setflags(write=False)
+
+        self._memoria[clave] = datos
+        if len(self._memoria) > self.max_memoria:
+            self._memoria.popitem(last=False)
+        return datos
+
+    def _guardar(self, ruta, datos):
+        """Escritura atómica: archivo temporal + rename."""
+        ruta.parent.mkdir(parents=True, exist_ok=True)
+        temporal = ruta.with_name(f"{ruta.stem}.{os.getpid()}.tmp.npz")
+        np.savez_compressed(temporal, **datos)
+        os.replace(temporal, ruta)
+
+    def limpiar_memoria(self):
+        self._memoria.clear()
@@ -0,0 +1,126 @@
+"""
+Superposición del campo eCEL desplazado de N masas.
+
+Cada masa i (centro c_i, radio R_i, densidad d_i) acumula en su superficie
+el eCEL que desplaza y este decae con 1/r²:
+
+    ρ_i(r) = f(d_i) × (R_i / r)²        para r >= R_i
+
+con f = factor de desplazamiento (ecel.desplazamiento). La densidad total es
+la suma de todas las masas más la densidad base del océano; dentro de un
+cuerpo el eCEL está desplazado (ρ = 0).
+
+La evaluación se hace con broadcasting (puntos × masas) en bloques, de modo
+que la memoria queda acotada por `max_elementos` sin importar el tamaño de
+la rejilla. Sirve a los dos renderizadores de halo:
+- puntos (Dots): `CampoMasas.densidad(puntos)` → opacidad/tamaño por punto
+- textura (ImageMobject): `CampoMasas.imagen(...)` → arreglo RGBA uint8
+"""
+import numpy as np
+
+from ecel.desplazamiento import calcular_factor_desplazamiento
+
+# Elementos (puntos × masas) por bloque: ~32 MB de float64 por arreglo temporal
+MAX_ELEMENTOS = 4_000_000
+
+
+def hex_a_rgb(color):
+    """'#7986cb' → array([r, g, b]) en 0-1."""
+    color = color.lstrip('#')
+    return np.array([int(color[i:i + 2], 16) for i in (0, 2, 4)]) / 255.0
+
+
+def rejilla_puntos(extent, ancho, alto):
+    """
+    Centros de píxel de una rejilla `alto × ancho` sobre
+    extent = (x_min, x_max, y_min, y_max). La fila 0 es la de arriba
+    (y máximo), igual que en una imagen. Devuelve (alto*ancho, 2).
+    """
+    x_min, x_max, y_min, y_max = extent
+    dx = (x_max - x_min) / ancho
+    dy = (y_max - y_min) / alto
+    xs = x_min + dx * (np.arange(ancho) + 0.5)
+    ys = y_max - dy * (np.arange(alto) + 0.5)
+    gx, gy = np.meshgrid(xs, ys)
+    return np.column_stack([gx.ravel(), gy.ravel()])
+
+
+class CampoMasas:
+    """
+    Campo eCEL combinado de N masas.
+
+    centros: (N, 2) o (N, 3) — se usan x, y
+    radios: (N,)
+    densidades: (N,) en g/cm³ (pasan por la tabla de desplazamiento)
+    """
+
+    def __init__(self, centros, radios, densidades, base=0.0, max_elementos=MAX_ELEMENTOS):
+        self.centros = np.atleast_2d(np.asarray(centros, dtype=float))[:, :2].copy()
+        self.radios = np.broadcast_to(np.asarray(radios, dtype=float), len(self.centros)).copy()
+        self.densidades = np.broadcast_to(np.asarray(densidades, dtype=float), len(self.centros)).copy()
+        self.factores = np.atleast_1d(calcular_factor_desplazamiento(self.densidades))
+        # ρ_i(r) = peso_i / r²  con  peso_i = f_i × R_i²
+        self.pesos = self.factores * self.radios ** 2
+        self.base = base
+        self.max_elementos = max_elementos
+
+    def mover(self, centros):
+        """Actualiza las posiciones (para updaters por frame)."""
+        self.centros[:] = np.asarray(centros, dtype=float)[:, :2]
+
+    def _bloques(self, n_puntos):
+        tam = max(1, self.max_elementos // max(1, len(self.centros)))
+        for inicio in range(0, n_puntos, tam):
+            yield slice(inicio, min(inicio + tam, n_puntos))
+
+    def densidad(self, puntos, vaciar_interior=True):
+        """Densidad eCEL total en cada punto. puntos: (M, 2) o (M, 3)."""
+        puntos = np.asarray(puntos, dtype=float)[:, :2]
+        rho = np.empty(len(puntos))
+        r_min2 = self.radios ** 2
+
+        for bloque in self._bloques(len(puntos)):
+            delta = puntos[bloque, None, :] - self.centros[None, :, :]
+            r2 = np.einsum('mnk,mnk->mn', delta, delta)
+            rho[bloque] = self.base + (self.pesos / np.maximum(r2, r_min2)).sum(axis=1)
+            if vaciar_interior:
+                rho[bloque][(r2 < r_min2).any(axis=1)] = 0.0
+        return rho
+
+    def gradiente(self, puntos):
+        """∇ρ en cada punto, (M, 2). Dentro de un cuerpo su aporte es 0."""
+        puntos = np.asarray(puntos, dtype=float)[:, :2]
+        grad = np.empty((len(puntos), 2))
+        r_min2 = self.radios ** 2
+
+        for bloque in self._bloques(len(puntos)):
+            delta = puntos[bloque, None, :] - self.centros[None, :, :]
+            r2 = np.einsum('mnk,mnk->mn', delta, delta)
+            # ∂(w/r²)/∂x = -2 w x / r⁴
+            coef = np.where(r2 >= r_min2, -2.0 * self.pesos / np.maximum(r2, r_min2) ** 2, 0.0)
+            grad[bloque] = np.einsum('mn,mnk->mk', coef, delta)
+        return grad
+
+    def densidad_rejilla(self, extent, ancho, alto):
+        """Densidad sobre una rejilla `alto × ancho` (fila 0 = arriba)."""
+        return self.densidad(rejilla_puntos(extent, ancho, alto)).reshape(alto, ancho)
+
+    def imagen(self, extent, ancho, alto, color_bajo, color_alto,
+               opacidad_min=0.0, opacidad_max=1.0, rho_ref=1.0):
+        """
+        Textura RGBA uint8 (alto, ancho, 4) del campo para ImageMobject.
+
+        Color y alfa se interpolan con t = ρ / rho_ref (recortado a 0-1).
+        """
+        rho = self.densidad_rejilla(extent, ancho, alto)
+        return rgba_desde_densidad(rho, color_bajo, color_alto,
+                                   opacidad_min, opacidad_max, rho_ref)
+
+
+def rgba_desde_densidad(rho, color_bajo, color_alto, opacidad_min=0.0,
+                        opacidad_max=1.0, rho_ref=1.0):
+    """Mapea un arreglo de densidades a RGBA uint8 (colores en hex)."""
+    t = np.clip(np.asarray(rho) / rho_ref, 0.0, 1.0)[..., None]
+    rgb = (1 - t) * hex_a_rgb(color_bajo) + t * hex_a_rgb(color_alto)
+    alfa = opacidad_min + (opacidad_max - opacidad_min) * t
+    return (np.concatenate([rgb, alfa], axis=-1) * 255).astype(np.uint8)
@@ -0,0 +1,148 @@
+"""
+Mapas de magnificación y cáusticas por disparo de rayos hacia adelante.
+
+Se disparan millones de rayos desde una rejilla uniforme del plano de la
+lente, cada uno se lleva al plano de la fuente con `Lente.fuente` (mismo
+β = θ - D Σ α(b) r̂ de ecel.lente) y los puntos de llegada se cuentan en un
+histograma. Sin lente cada píxel de la fuente recibiría
+
+    N_esperado = (rayos / área disparada) × área del píxel
+
+así que μ = cuenta / N_esperado. Las cáusticas (μ → ∞) son las líneas
+brillantes donde el mapa θ → β se pliega.
+
+Los rayos se generan dentro de cada proceso (nada de mandar arreglos de
+millones de puntos): cada proceso recibe un rango de filas de la rejilla de
+disparo, lo recorre en bloques de `filas_por_bloque` filas (memoria acotada)
+y acumula su propio histograma; al final se suman. Los procesos son los de
+ecel.paralelo: se puede pasar un `PoolCompartido` ya abierto (por ejemplo el
+de `RenderLente`) para no levantar otro.
+
+El resultado se exporta como RGBA para ImageMobject con
+`imagen_magnificacion`.
+"""
+import os
+
+import numpy as np
+
+from ecel.paralelo import TRABAJO, PoolCompartido
+from ecel.rayos import colores_lut
+from ecel.rejilla import paso_rejilla
+
+# Escala de color por defecto: negro → azul → blanco (cáusticas blancas)
+COLORES_DEFECTO = ['#000000', '#1a237e', '#3f51b5', '#90caf9', '#ffffff']
+
+
+def _histograma_rango(rango):
+    """Histograma (ny, nx) de los rayos de las filas [fila_0, fila_1)."""
+    t = TRABAJO
+    x_min, x_max, y_min, y_max = t['extent_rayos']
+    fx_min, fx_max, fy_min, fy_max = t['extent_fuente']
+    nx, ny = t['nx'], t['ny']
+    dx, dy = paso_rejilla(t['extent_rayos'], t['rayos_x'], t['rayos_y'])
+    xs = x_min + dx * (np.arange(t['rayos_x']) + 0.5)
+
+    cuenta = np.zeros(ny * nx)
+    for fila in range(rango[0], rango[1], t['filas_por_bloque']):
+        filas = np.arange(fila, min(fila + t['filas_por_bloque'], rango[1]))
+        gx, gy = np.meshgrid(xs, y_min + dy * (filas + 0.5))
+        puntos = np.column_stack([gx.ravel(), gy.ravel()])
+        if t['jitter']:
+            # Jitter estratificado: reproducible por bloque, sin patrones de moiré
+            rng = np.random.default_rng((t['semilla'], fila))
+            puntos += (rng.random(puntos.shape) - 0.5) * [dx, dy]
+
+        beta, oculto = t['lente'].fuente(puntos)
+        ix = np.floor((beta[:, 0] - fx_min) / (fx_max - fx_min) * nx).astype(np.int64)
+        iy = np.floor((beta[:, 1] - fy_min) / (fy_max - fy_min) * ny).astype(np.int64)
+        dentro = ~oculto & (ix >= 0) & (ix < nx) & (iy >= 0) & (iy < ny)
+        cuenta += np.bincount(iy[dentro] * nx + ix[dentro], minlength=ny * nx)
+    return cuenta
+
+
+def mapa_magnificacion(lente, extent_fuente, nx, ny, extent_rayos, rayos_x, rayos_y,
+                       procesos=None, filas_por_bloque=64, jitter=True, semilla=0, pool=None):
+    """
+    Magnificación μ (ny, nx) sobre el plano de la fuente (fila 0 = y mínimo).
+
+    extent_rayos: zona del plano de la lente donde se disparan
+    rayos_x × rayos_y rayos (debe cubrir todo lo que puede caer en
+    extent_fuente). Con `pool` (PoolCompartido) se reusan sus procesos y
+    `procesos` se ignora. Devuelve dict 'magnificacion', 'cuenta' y 'rayos'
+    (total disparado).
+    """
+    procesos = pool.procesos if pool is not None else procesos or os.cpu_count() or 1
+    # Cortes en múltiplos del bloque: el jitter no depende de cuántos procesos haya
+    bloques = -(-rayos_y // filas_por_bloque)
+    cortes = np.minimum(np.linspace(0, bloques, procesos + 1).astype(int) * filas_por_bloque, rayos_y)
+    rangos = [(a, b) for a, b in zip(cortes[:-1], cortes[1:]) if b > a]
+
+    estado = {
+        'lente': lente,
+        'extent_fuente': extent_fuente,
+        'nx': nx,
+        'ny': ny,
+        'extent_rayos': extent_rayos,
+        'rayos_x': rayos_x,
+        'rayos_y': rayos_y,
+        'filas_por_bloque': filas_por_bloque,
+        'jitter': jitter,
+        'semilla': semilla,
+    }
+    if pool is not None:
+        partes = pool.mapear(_histograma_rango, rangos, estado)
+    else:
+        with PoolCompartido(procesos) as pool:
+            partes = pool.mapear(_histograma_rango, rangos, estado)
+    cuenta = sum(partes).reshape(ny, nx)
+
+    x_min, x_max, y_min, y_max = extent_rayos
+    densidad = rayos_x * rayos_y / ((x_max - x_min) * (y_max - y_min))
+    dx, dy = paso_rejilla(extent_fuente, nx, ny)
+    return {
+        'magnificacion': cuenta / (densidad * dx * dy),
+        'cuenta': cuenta,
+        'rayos': np.array(rayos_x * rayos_y),
+    }
+
+
+def mapa_magnificacion_cacheado(cache, lente, extent_fuente, nx, ny, extent_rayos, rayos_x,
+                                rayos_y, procesos=None, filas_por_bloque=64, jitter=True, semilla=0,
+                                pool=None):
+    """`mapa_magnificacion` leído de la caché si nada cambió."""
+    params = {
+        'lente': lente.params(),
+        'extent_fuente': list(extent_fuente),
+        'nx': nx,
+        'ny': ny,
+        'extent_rayos': list(extent_rayos),
+        'rayos_x': rayos_x,
+        'rayos_y': rayos_y,
+        'filas_por_bloque': filas_por_bloque,  # fija la semilla del jitter por bloque
+        'jitter': jitter,
+        'semilla': semilla,
+    }
+    return cache.obtener('magnificacion', params, lambda: mapa_magnificacion(
+        lente, extent_fuente, nx, ny, extent_rayos, rayos_x, rayos_y,
+        procesos=procesos, filas_por_bloque=filas_por_bloque, jitter=jitter, semilla=semilla,
+        pool=pool))
+
+
+def imagen_magnificacion(magnificacion, colores=None, mu_max=None, opacidad_min=1.0):
+    """
+    RGBA uint8 (ny, nx, 4) con la fila 0 arriba (para ImageMobject).
+
+    Escala logarítmica log(1 + μ) hasta `mu_max` (por defecto el percentil
+    99.5). Con opacidad_min < 1 la zona poco magnificada queda semitransparente.
+    """
+    mu = np.asarray(magnificacion, dtype=float)
+    if mu_max is None:
+        mu_max = max(np.percentile(mu[mu > 0], 99.5) if (mu > 0).any() else 1.0, 2.0)
+    valor = np.log1p(mu) / np.log1p(mu_max)
+    t = np.clip(valor, 0.0, 1.0)
+
+    lut = colores_lut(colores or COLORES_DEFECTO, 256)
+    rgba = np.empty(mu.shape + (4,), dtype=np.uint8)
+    rgba[..., :3] = (lut[(t * 255).astype(int)] * 255).astype(np.uint8)
+    rgba[..., 3] = (255 * (opacidad_min + (1 - opacidad_min) * t)).astype(np.uint8)
+    return np.flipud(rgba)
@@ -0,0 +1,229 @@
+"""
+Deflexión cromática: un solo paquete de rayos para todas las longitudes de onda.
+
+Hipótesis GRF-RGB: el eCEL dispersa la luz como un vidrio, la curvatura
+depende de λ con una ley tipo Cauchy (n - 1 ∝ A + B / λ²):
+
+    k(λ) = k0 (1 + κ(λ)),    κ(λ) = dispersion × ((λ_ref / λ)² - 1)
+
+κ = 0 en λ_ref (banda r por defecto); el azul se dobla más que el rojo.
+
+En vez de integrar una vez por banda, se integra el paquete con κ = -δ, 0, +δ
+en una sola llamada a `integrar_rayos` (3M rayos, k por rayo) y cualquier
+longitud de onda sale del desarrollo de segundo orden
+
+    x(κ) ≈ x0 + κ ∂x/∂κ + ½ κ² ∂²x/∂κ²
+
+con derivadas por diferencias centradas. δ se toma del κ más grande pedido
+(u o z), así el desarrollo interpola y no extrapola: las cinco bandas SDSS
+y cualquier λ visible cuestan lo mismo que tres integraciones.
+
+Con `extent` el paquete usa el mismo integrador que el rayo principal de
+la escena (Dormand-Prince adaptativo, ecel.rayos): el rayo base (κ = 0) se
+corta al salir del cuadro, los κ = ±δ se integran hasta su mismo tiempo
+final y los tres se muestrean en `steps` instantes equiespaciados con la
+salida densa (Hermite) del integrador. Así las derivadas comparan puntos a
+igual tiempo recorrido sin el ruido de interpolar cuerdas de pasos largos
+distintos para cada κ, las bandas terminan donde termina el rayo blanco y
+no se arma geometría fuera de cuadro. Sin `extent` se usa el Euler de paso
+fijo (tabla_bandas).
+
+Los rayos que rozan la masa (b ≲ 1.5 R con el k del YAML) dependen de k de
+forma muy no lineal. Para cada rayo se estima el resto del desarrollo (el
+término cúbico, segundo² / primero) y solo los que superan `tolerancia`
+(unidades de escena) se integran completos por λ. Con el YAML de las
+escenas el rayo principal queda en el desarrollo (resto ≈ 0.004) y en un
+abanico de 50 rayos solo los dos que cruzan el borde de la masa se
+integran aparte; el desarrollo queda a ≈ 0.01 de la solución exacta, lo
+mismo que la integración completa con las tolerancias de la escena.
+
+`RayosCromaticos.caminos(λ)` alimenta el arcoíris de crear_rayo_luz y
+`desvio_angular` / `tabla_bandas` dan los corrimientos entre bandas.
+"""
+import numpy as np
+
+from ecel.rayos import integrar_rayos, integrar_rayos_adaptativo
+
+# Longitudes de onda efectivas de los filtros SDSS (nm)
+BANDAS_SDSS = {'u': 354.3, 'g': 477.0, 'r': 623.1, 'i': 762.5, 'z': 913.4}
+
+
+def kappa(longitudes, dispersion, lambda_ref=BANDAS_SDSS['r']):
+    """Cambio relativo de curvatura κ(λ) = k(λ) / k0 - 1 (λ en nm)."""
+    longitudes = np.asarray(longitudes, dtype=float)
+    return dispersion * ((lambda_ref / longitudes) ** 2 - 1)
+
+
+def longitud_onda_a_rgb(longitudes, gamma=0.8):
+    """
+    Color RGB (N, 3) en 0-1 para λ en nm (aproximación de Bruton).
+
+    Fuera de 380-780 nm se usa el color del borde (u violeta, z rojo oscuro)
+    para poder dibujar todas las bandas SDSS.
+    """
+    lam = np.clip(np.atleast_1d(np.asarray(longitudes, dtype=float)), 380.0, 780.0)
+    r = np.zeros_like(lam)
+    g = np.zeros_like(lam)
+    b = np.zeros_like(lam)
+
+    tramo = lam < 440
+    r[tramo] = (440 - lam[tramo]) / 60
+    b[tramo] = 1.0
+    tramo = (lam >= 440) & (lam < 490)
+    g[tramo] = (lam[tramo] - 440) / 50
+    b[tramo] = 1.0
+    tramo = (lam >= 490) & (lam < 510)
+    g[tramo] = 1.0
+    b[tramo] = (510 - lam[tramo]) / 20
+    tramo = (lam >= 510) & (lam < 580)
+    r[tramo] = (lam[tramo] - 510) / 70
+    g[tramo] = 1.0
+    tramo = (lam >= 580) & (lam < 645)
+    r[tramo] = 1.0
+    g[tramo] = (645 - lam[tramo]) / 65
+    r[lam >= 645] = 1.0
+
+    # El ojo pierde sensibilidad en los extremos
+    intensidad = np.ones_like(lam)
+    intensidad[lam < 420] = 0.3 + 0.7 * (lam[lam < 420] - 380) / 40
+    intensidad[lam > 700] = 0.3 + 0.7 * (780 - lam[lam > 700]) / 80
+
+    return (np.column_stack([r, g, b]) * intensidad[:, None]) ** gamma
+
+
+class RayosCromaticos:
+    """
+    Paquete de M rayos integrado una vez, evaluable en cualquier λ.
+
+    Uso:
+        rayos = RayosCromaticos(inicios, direccion, centro, R, cfg_luz, dispersion=0.2)
+        caminos = rayos.caminos([354.3, 477.0, 623.1])   # (3, M, steps, 2)
+
+    Con extent=(x_min, x_max, y_min, y_max) se integra con
+    cfg_luz['adaptativo'] (rtol, atol, dt_max) y el rayo base termina al
+    salir de extent, como integrar_caminos de las escenas. `resto` (M,) es
+    el error estimado del desarrollo en κ = δ y `no_lineal` los rayos donde
+    supera `tolerancia`.
+    """
+
+    def __init__(self, inicios, direcciones, centro, radio_masa, cfg_luz, dispersion,
+                 lambda_ref=BANDAS_SDSS['r'], longitudes=tuple(BANDAS_SDSS.values()), delta=None,
+                 tolerancia=0.01, extent=None):
+        self.dispersion = dispersion
+        self.lambda_ref = lambda_ref
+        self.k0 = cfg_luz['k_curvatura']
+        self.speed = cfg_luz['speed']
+        self.dt = cfg_luz['dt']
+        self.steps = cfg_luz['steps']
+        self.extent = extent
+        self._integrar = dict(centro=centro, radio_masa=radio_masa, speed=self.speed,
+                              min_dist_factor=cfg_luz['min_dist_factor'])
+        if extent is not None:
+            adaptativo = cfg_luz['adaptativo']
+            self._integrar.update(rtol=adaptativo['rtol'], atol=adaptativo['atol'],
+                                  dt_max=adaptativo['dt_max'])
+
+        if delta is None:
+            delta = np.abs(kappa(longitudes, dispersion, lambda_ref)).max()
+        self.delta = max(float(delta), 1e-4)
+
+        inicios = np.atleast_2d(np.asarray(inicios, dtype=float))[:, :2]
+        m = len(inicios)
+        direcciones = np.broadcast_to(np.atleast_2d(np.asarray(direcciones, dtype=float))[:, :2],
+                                      inicios.shape)
+        self.inicios, self.direcciones = inicios, direcciones
+
+        if extent is None:
+            k = self.k0 * np.repeat([1 - self.delta, 1.0, 1 + self.delta], m)
+            menos, self.base, mas = self._integrar_rayos(np.tile(np.arange(m), 3), k).reshape(
+                3, m, -1, 2)
+        else:
+            # El rayo base fija dónde termina cada rayo (borde del cuadro)
+            self.base, _, self.t_fin = integrar_rayos_adaptativo(
+                inicios, direcciones, k=self.k0, extent=extent, t_max=self.steps * self.dt,
+                muestras=self.steps, tiempos=True, **self._integrar)
+            k = self.k0 * np.repeat([1 - self.delta, 1 + self.delta], m)
+            menos, mas = self._integrar_rayos(np.tile(np.arange(m), 2), k).reshape(2, m, -1, 2)
+
+        self.d1 = (mas - menos) / (2 * self.delta)
+        self.d2 = (mas - 2 * self.base + menos) / self.delta ** 2
+
+        # Resto del desarrollo en κ = δ: si los términos de la serie decrecen
+        # como una geométrica de razón segundo / primero, el primero que se
+        # omite (cúbico) vale segundo² / primero
+        primero = np.linalg.norm(self.delta * self.d1, axis=-1).max(axis=1)
+        segundo = np.linalg.norm(0.5 * self.delta ** 2 * self.d2, axis=-1).max(axis=1)
+        self.resto = segundo ** 2 / np.maximum(primero, 1e-12)
+        self.no_lineal = self.resto > tolerancia
+
+    def _integrar_rayos(self, indices, k):
+        """Caminos (len(indices), steps, 2) de los rayos `indices` con curvatura k (por rayo)."""
+        if self.extent is None:
+            return integrar_rayos(self.inicios[indices], self.direcciones[indices], k=k,
+                                  dt=self.dt, steps=self.steps, **self._integrar)
+        # Hasta el mismo tiempo que el rayo base, sin cortar por el cuadro
+        caminos, _ = integrar_rayos_adaptativo(
+            self.inicios[indices], self.direcciones[indices], k=k,
+            extent=(-np.inf, np.inf, -np.inf, np.inf), t_max=self.t_fin[indices],
+            muestras=self.steps, **self._integrar)
+        return caminos
+
+    def caminos(self, longitudes):
+        """
+        Caminos (L, M, steps, 2) para L longitudes de onda (nm). Los rayos
+        `no_lineal` se integran completos (una sola llamada para todas las λ).
+        """
+        kap = kappa(np.atleast_1d(longitudes), self.dispersion, self.lambda_ref)
+        caminos = (self.base[None] + kap[:, None, None, None] * self.d1[None]
+                   + 0.5 * kap[:, None, None, None] ** 2 * self.d2[None])
+
+        malos = np.nonzero(self.no_lineal)[0]
+        if len(malos):
+            exactos = self._integrar_rayos(np.tile(malos, len(kap)),
+                                           self.k0 * np.repeat(1 + kap, len(malos)))
+            caminos[:, malos] = exactos.reshape(len(kap), len(malos), -1, 2)
+            caminos[kap == 0] = self.base  # λ_ref es exactamente el rayo base
+        return caminos
+
+    def bandas(self):
+        """Caminos por banda SDSS: {'u': (M, steps, 2), ...}."""
+        caminos = self.caminos(list(BANDAS_SDSS.values()))
+        return dict(zip(BANDAS_SDSS, caminos))
+
+    def direccion_final(self, longitudes):
+        """Ángulo (L, M) de la dirección de salida de cada rayo (radianes)."""
+        caminos = self.caminos(longitudes)
+        paso = caminos[:, :, -1] - caminos[:, :, -2]
+        return np.arctan2(paso[..., 1], paso[..., 0])
+
+    def desvio_angular(self, longitudes):
+        """Corrimiento angular (L, M) de cada λ respecto de λ_ref (radianes)."""
+        referencia = self.direccion_final([self.lambda_ref])  # κ = 0: camino base
+        return self.direccion_final(longitudes) - referencia
+
+
+def tabla_bandas(cfg_luz, radio_masa, b, dispersion, lambda_ref=BANDAS_SDSS['r'],
+                 distancia=200.0):
+    """
+    Deflexión por banda SDSS para rayos paralelos con parámetro de impacto b
+    (en unidades de escena): {'b': (B,), 'u': {'lambda_nm', 'kappa',
+    'alfa_rad', 'desvio_rad'}, ...}. α > 0 hacia la masa.
+    """
+    b = np.atleast_1d(np.asarray(b, dtype=float))
+    largo = distancia * radio_masa
+    cfg = dict(cfg_luz, steps=int(np.ceil(2 * largo / (cfg_luz['speed'] * cfg_luz['dt']))))
+    rayos = RayosCromaticos(np.column_stack([np.full(len(b), -largo), b]), [1.0, 0.0],
+                            np.zeros(2), radio_masa, cfg, dispersion, lambda_ref)
+
+    longitudes = list(BANDAS_SDSS.values())
+    alfa = -rayos.direccion_final(longitudes)
+    desvio = -rayos.desvio_angular(longitudes)
+    tabla = {'b': b}
+    for i, (banda, lam) in enumerate(BANDAS_SDSS.items()):
+        tabla[banda] = {
+            'lambda_nm': lam,
+            'kappa': float(kappa(lam, dispersion, lambda_ref)),
+            'alfa_rad': alfa[i],
+            'desvio_rad': desvio[i],
+        }
+    return tabla
@@ -0,0 +1,216 @@
+"""
+Barrido de ángulos de deflexión y validación contra Eddington / GR.
+
+Dispara miles de rayos paralelos con parámetro de impacto b contra una masa
+en el origen, con la física de crear_rayo_luz (ecel.rayos, mismo `dt`,
+`speed`, `k_curvatura` del YAML), y mide el ángulo asintótico de salida.
+
+Para el modelo a⊥ = -k R² / r³ la deflexión débil es analítica:
+
+    α(b) = π k R² / (2 speed b²)      (∝ 1/b²)
+
+mientras que la relatividad general da α = 4GM / (c² b) (∝ 1/b), 1.75" en
+el limbo del Sol. El reporte incluye:
+- ajuste log-log α = A b^(-p) sobre la zona de campo débil (α pequeño)
+- error numérico contra la fórmula analítica del mismo tramo finito
+  (detecta regresiones del integrador)
+- k que hace que el α medido en b = 2R coincida con GR (0.875") y el
+  cociente α medido / GR en 2, 5, 10 y 50 R con ese k (muestra que la forma
+  1/b² no es la de GR; si el integrador se rompe, los cocientes lo delatan).
+  No se calibra en el limbo (b = R): queda dentro del recorte
+  min_dist_factor × R y mediría el recorte, no la ley 1/r³. El α en el
+  limbo se informa aparte
+
+Uso:
+    python -m ecel.deflexion --n 4000 --salida media/deflexion.json
+Sale con código 1 si el error numérico supera --tolerancia.
+"""
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import yaml
+
+from ecel.rayos import integrar_rayos
+
+CONFIG_DEFECTO = Path(__file__).resolve().parent.parent / "config_ecel.yaml"
+
+# 4GM☉/(c² R☉) en segundos de arco
+EDDINGTON_ARCSEC = 1.75
+RAD_A_ARCSEC = 180 / np.pi * 3600
+# b / R donde se compara con GR; el primero es el punto de calibración y
+# tiene que quedar fuera del recorte min_dist_factor × R
+MULTIPLOS_GR = (2, 5, 10, 50)
+
+
+def deflexion_analitica(b, k, radio_masa, speed, largo=None):
+    """
+    α(b) del modelo k R²/r³ en campo débil (radianes).
+
+    Con `largo` se integra solo el tramo recto x ∈ [-largo, largo]
+    (lo que ve un barrido numérico finito) en vez de la recta infinita.
+    """
+    b = np.asarray(b, dtype=float)
+    coef = k * radio_masa ** 2 / speed
+    if largo is None:
+        return np.pi * coef / (2 * b ** 2)
+    # ∫ b ds / (s² + b²)² entre -largo y largo
+    return coef * (largo / (b * (largo ** 2 + b ** 2)) + np.arctan(largo / b) / b ** 2)
+
+
+def barrer_deflexion(b, k, radio_masa, speed, dt, min_dist_factor, distancia=200.0):
+    """
+    Ángulo asintótico de deflexión (radianes, > 0 hacia la masa) para cada b.
+
+    Los rayos parten de x = -distancia × R hacia +x y se integran hasta
+    x ≈ +distancia × R; el resto de la deflexión más allá es ~ (R / x)³.
+    """
+    b = np.asarray(b, dtype=float)
+    largo = distancia * radio_masa
+    inicios = np.column_stack([np.full(len(b), -largo), b])
+    pasos = int(np.ceil(2 * largo / (speed * dt)))
+    caminos = integrar_rayos(inicios, [1.0, 0.0], np.zeros(2), radio_masa,
+                             k=k, speed=speed, dt=dt, steps=pasos,
+                             min_dist_factor=min_dist_factor)
+    direccion = caminos[:, -1] - caminos[:, -2]
+    return -np.arctan2(direccion[:, 1], direccion[:, 0])
+
+
+def ajustar_potencia(b, alfa):
+    """Ajuste log-log α = A b^(-p): devuelve (p, A, R²)."""
+    x = np.log(b)
+    y = np.log(alfa)
+    pendiente, intercepto = np.polyfit(x, y, 1)
+    residuo = y - (pendiente * x + intercepto)
+    r2 = 1 - residuo.var() / y.var() if y.var() > 0 else 1.0
+    return -pendiente, float(np.exp(intercepto)), float(r2)
+
+
+def reporte(cfg_luz, radio_masa, n=2000, b_min=1.2, b_max=50.0, alfa_debil=0.01, distancia=200.0):
+    """Corre el barrido y arma el reporte (dict serializable en JSON)."""
+    k = cfg_luz['k_curvatura']
+    speed = cfg_luz['speed']
+    dt = cfg_luz['dt']
+    min_dist_factor = cfg_luz['min_dist_factor']
+
+    b = radio_masa * np.geomspace(b_min, b_max, n)
+    inicio = time.perf_counter()
+    alfa = barrer_deflexion(b, k, radio_masa, speed, dt, min_dist_factor, distancia)
+    tiempo = time.perf_counter() - inicio
+
+    analitica = deflexion_analitica(b, k, radio_masa, speed, largo=distancia * radio_masa)
+    # Campo débil: fuera de ahí las correcciones de orden α² dominan la diferencia
+    zona = analitica <= alfa_debil
+    if not zona.any():
+        raise ValueError(f"ningún b con α < {alfa_debil}: subir --b-max")
+    error_rel = np.abs(alfa[zona] - analitica[zona]) / analitica[zona]
+    p, amplitud, r2 = ajustar_potencia(b[zona], alfa[zona])
+
+    # Calibración: el α medido en b = MULTIPLOS_GR[0] R vale lo que da GR ahí.
+    # α no es lineal en k con el k del YAML (campo fuerte), así que se corrige
+    # una vez más con el k ya calibrado, donde α ∝ k
+    alfa_limbo = EDDINGTON_ARCSEC / RAD_A_ARCSEC
+    multiplos = np.array(MULTIPLOS_GR, dtype=float)
+    if multiplos[0] <= min_dist_factor:
+        raise ValueError(f"calibrar en b = {multiplos[0]:g}R mide el recorte "
+                         f"min_dist_factor = {min_dist_factor}")
+    # b = R (limbo) va al final: se mide con el mismo k pero no entra en la calibración
+    b_gr = radio_masa * np.append(multiplos, 1.0)
+    alfa_gr = alfa_limbo / multiplos  # 4GM / (c² b) con b = m R
+
+    def medir(k_medido):
+        return barrer_deflexion(b_gr, k_medido, radio_masa, speed, dt, min_dist_factor, distancia)
+
+    k_eddington = k * alfa_gr[0] / medir(k)[0]
+    k_eddington *= alfa_gr[0] / medir(k_eddington)[0]
+    alfa_calibrada = medir(k_eddington)
+    alfa_limbo_medida = alfa_calibrada[-1]
+    alfa_calibrada = alfa_calibrada[:-1]
+    cocientes = {f"{m:g}R": float(a / g) for m, a, g in zip(multiplos, alfa_calibrada, alfa_gr)}
+
+    return {
+        'parametros': {
+            'k_curvatura': k,
+            'speed': speed,
+            'dt': dt,
+            'min_dist_factor': min_dist_factor,
+            'radio_masa': radio_masa,
+            'rayos': n,
+            'b_min_R': b_min,
+            'b_max_R': b_max,
+            'alfa_debil_rad': alfa_debil,
+            'campo_debil_desde_R': float(b[zona].min() / radio_masa),
+            'distancia_R': distancia,
+        },
+        'tiempo_s': tiempo,
+        'ajuste': {
+            'exponente': float(p),
+            'amplitud': amplitud,
+            'r2': r2,
+            'exponente_modelo': 2.0,
+            'exponente_gr': 1.0,
+        },
+        'error_numerico': {
+            'max_relativo': float(error_rel.max()),
+            'medio_relativo': float(error_rel.mean()),
+        },
+        'eddington': {
+            'alfa_limbo_arcsec': EDDINGTON_ARCSEC,
+            'calibrado_en_R': float(multiplos[0]),
+            'k_calibrado': float(k_eddington),
+            'alfa_medido_arcsec': {f"{m:g}R": float(a * RAD_A_ARCSEC)
+                                   for m, a in zip(multiplos, alfa_calibrada)},
+            'cociente_modelo_gr': cocientes,
+            # b = R está dentro del recorte: informativo, no valida la ley 1/r³
+            'limbo': {
+                'alfa_medido_arcsec': float(alfa_limbo_medida * RAD_A_ARCSEC),
+                'cociente_modelo_gr': float(alfa_limbo_medida / alfa_limbo),
+                'dentro_del_recorte': bool(1.0 <= min_dist_factor),
+            },
+        },
+        'muestras': {
+            'b_R': (b / radio_masa)[::max(1, n // 20)].tolist(),
+            'alfa_rad': alfa[::max(1, n // 20)].tolist(),
+        },
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Barrido de deflexión de luz y validación vs GR")
+    parser.add_argument('--config', type=Path, default=CONFIG_DEFECTO)
+    parser.add_argument('--n', type=int, default=2000, help="parámetros de impacto")
+    parser.add_argument('--b-min', type=float, default=1.2, help="b mínimo en radios")
+    parser.add_argument('--b-max', type=float, default=50.0, help="b máximo en radios")
+    parser.add_argument('--alfa-debil', type=float, default=0.01,
+                        help="α máximo (rad) considerado campo débil para ajuste y error")
+    parser.add_argument('--distancia', type=float, default=200.0,
+                        help="los rayos van de -distancia·R a +distancia·R")
+    parser.add_argument('--tolerancia', type=float, default=0.02,
+                        help="error relativo máximo aceptado vs la fórmula analítica")
+    parser.add_argument('--salida', type=Path, help="archivo JSON (por defecto stdout)")
+    args = parser.parse_args()
+
+    with open(args.config, 'r') as f:
+        config = yaml.safe_load(f)
+
+    datos = reporte(config['luz'], config['masa_actual']['radio_visual'], n=args.n,
+                    b_min=args.b_min, b_max=args.b_max, alfa_debil=args.alfa_debil,
+                    distancia=args.distancia)
+    texto = json.dumps(datos, indent=2, ensure_ascii=False)
+    if args.salida:
+        args.salida.parent.mkdir(parents=True, exist_ok=True)
+        args.salida.write_text(texto + "\n", encoding='utf-8')
+    else:
+        print(texto)
+
+    error = datos['error_numerico']['max_relativo']
+    if error > args.tolerancia:
+        print(f"error numérico {error:.3g} > tolerancia {args.tolerancia}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
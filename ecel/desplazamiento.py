@@ -0,0 +1,65 @@
+"""
+Factor de desplazamiento eCEL (0-1) según densidad, vectorizado.
+
+La tabla se arma UNA vez desde config_ecel.yaml:
+- `tabla_desplazamiento`: densidad (g/cm³) de cada material
+- `factores_desplazamiento`: fracción desplazada de ese material
+- `desplazamiento.densidad_maxima`: desde aquí el desplazamiento es total
+
+Entre puntos de la tabla se interpola linealmente (np.interp), igual que la
+cadena if/elif original; bajo la primera entrada se interpola desde (0, 0).
+Materiales con densidad mayor que `densidad_maxima` (enana blanca, estrella
+de neutrones) quedan saturados en 1.0.
+"""
+from functools import lru_cache
+from pathlib import Path
+
+import numpy as np
+import yaml
+
+CONFIG_DEFECTO = Path(__file__).resolve().parent.parent / "config_ecel.yaml"
+
+
+def tabla_desde_config(config):
+    """Devuelve (densidades, factores) ordenados, listos para np.interp."""
+    densidades_material = config['tabla_desplazamiento']
+    factores_material = config['factores_desplazamiento']
+    densidad_maxima = float(config['desplazamiento']['densidad_maxima'])
+
+    puntos = {0.0: 0.0, densidad_maxima: 1.0}
+    for material, factor in factores_material.items():
+        densidad = float(densidades_material[material])
+        if densidad < densidad_maxima:
+            puntos[densidad] = float(factor)
+
+    densidades = np.array(sorted(puntos))
+    factores = np.array([puntos[d] for d in densidades])
+    if np.any(np.diff(factores) < 0):
+        raise ValueError("factores_desplazamiento debe crecer con la densidad")
+    return densidades, factores
+
+
+@lru_cache(maxsize=None)
+def cargar_tabla(ruta_config=None):
+    """Lee el YAML una sola vez por ruta y cachea la tabla."""
+    ruta = Path(ruta_config) if ruta_config else CONFIG_DEFECTO
+    with open(ruta, 'r') as f:
+        config = yaml.safe_load(f)
+    densidades, factores = tabla_desde_config(config)
+    densidades.setflags(write=False)
+    factores.setflags(write=False)
+    return densidades, factores
+
+
+def calcular_factor_desplazamiento(densidad, tabla=None):
+    """
+    Factor de desplazamiento (0-1) para un escalar o un arreglo de densidades.
+
+    Un escalar devuelve float; un arreglo devuelve un arreglo de igual forma.
+    `tabla` = (densidades, factores); por defecto la de config_ecel.yaml.
+    """
+    densidades, factores = tabla if tabla is not None else cargar_tabla()
+    resultado = np.interp(densidad, densidades, factores)
+    if np.ndim(resultado) == 0:
+        return float(resultado)
+    return resultado
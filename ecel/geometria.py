@@ -0,0 +1,33 @@
+"""
+Geometría de caminos como arreglos: curvas Bézier y longitud de arco.
+
+Helpers genéricos sin física, compartidos por la rejilla deformada de
+OceanGravity (manim.py), los rayos de luz (ecel.rayos) y el glow
+rasterizado (ecel.glow). Trabajan sobre el último par de ejes (..., N, d),
+así que un lote de caminos se procesa en una sola llamada.
+"""
+import numpy as np
+
+
+def puntos_bezier(anclas):
+    """
+    Puntos Bézier cúbicos (..., 4 (n - 1), 3) de curvas suaves que pasan por
+    anclas (..., n, 3), con tangentes tipo Catmull-Rom (misma estructura que
+    VMobject.points).
+    """
+    tangentes = np.empty_like(anclas)
+    tangentes[..., 1:-1, :] = (anclas[..., 2:, :] - anclas[..., :-2, :]) / 2
+    tangentes[..., 0, :] = anclas[..., 1, :] - anclas[..., 0, :]
+    tangentes[..., -1, :] = anclas[..., -1, :] - anclas[..., -2, :]
+
+    inicio = anclas[..., :-1, :]
+    fin = anclas[..., 1:, :]
+    curvas = np.stack([inicio, inicio + tangentes[..., :-1, :] / 3,
+                       fin - tangentes[..., 1:, :] / 3, fin], axis=-2)
+    return curvas.reshape(*anclas.shape[:-2], -1, anclas.shape[-1])
+
+
+def longitud_arco(caminos):
+    """Longitud de arco acumulada (..., N) de caminos (..., N, d), empezando en 0."""
+    tramos = np.linalg.norm(np.diff(caminos, axis=-2), axis=-1)
+    return np.concatenate([np.zeros(tramos.shape[:-1] + (1,)), np.cumsum(tramos, axis=-1)], axis=-1)
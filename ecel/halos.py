@@ -0,0 +1,86 @@
+"""
+Geometría de halos eCEL como arreglos (sin Mobjects).
+
+Cada generador reproduce la lógica de su método original en las escenas y
+devuelve un dict con:
+- puntos:     (N, 2) posiciones relativas al centro de la masa
+- radios:     (N,)   radio de cada partícula
+- opacidades: (N,)   fill_opacity de cada partícula
+- t_color:    (N,)   posición 0-1 en el gradiente de color (si aplica)
+
+Al ser relativos al centro, el mismo halo sirve para cualquier posición
+en pantalla y se puede cachear con `ecel.cache.CacheGeometria`.
+"""
+import numpy as np
+
+
+def _distribuir_en_anillos(radios_capa, particulas_capa):
+    """Índice de capa y ángulo exacto de cada partícula (anillos uniformes)."""
+    capa_de = np.repeat(np.arange(len(radios_capa)), particulas_capa)
+    inicio = np.repeat(np.cumsum(particulas_capa) - particulas_capa, particulas_capa)
+    i_local = np.arange(len(capa_de)) - inicio
+    angulos = 2 * np.pi * i_local / particulas_capa[capa_de]
+    return capa_de, angulos
+
+
+def geometria_cascada_suave(factor, radio_masa, radio_particula, opacidad_max,
+                            num_capas=65):
+    """
+    Halo con efecto cascada y difuminación suave (v2.1.4 en adelante).
+
+    Las capas cuya opacidad cae bajo 1% no se generan.
+    """
+    distancia_minima = radio_particula * 2.5
+    espaciado_base = distancia_minima * 1.2
+
+    capas = np.arange(num_capas)
+    r = radio_masa + 0.05 + capas * espaciado_base
+    factor_r2 = (radio_masa / r) ** 2
+    factor_cascada = 1.0 + 0.3 * np.exp(-capas / 5)
+
+    opacidad = np.minimum(opacidad_max * factor_r2 * factor * factor_cascada, opacidad_max)
+    visibles = opacidad >= 0.01
+
+    r = r[visibles]
+    factor_r2 = factor_r2[visibles]
+    opacidad = opacidad[visibles]
+    t_capa = capas[visibles] / num_capas
+
+    particulas = np.maximum(10, (2 * np.pi * r / distancia_minima).astype(int))
+    capa_de, angulos = _distribuir_en_anillos(r, particulas)
+
+    radio_p = np.maximum(radio_particula * (0.8 + factor_r2 * 0.4), radio_particula * 0.5)
+
+    return {
+        'puntos': np.column_stack([r[capa_de] * np.cos(angulos), r[capa_de] * np.sin(angulos)]),
+        'radios': radio_p[capa_de],
+        'opacidades': opacidad[capa_de],
+        't_color': t_capa[capa_de],
+    }
+
+
+def geometria_homogenea(factor, radio_masa, radio_particula, opacidad_max,
+                        num_capas=12, opacidad_min=0.15, min_particulas=8):
+    """
+    Halo de distribución homogénea: anillos perfectos, sin aleatorio (v2.1.1).
+
+    Con num_capas=6, opacidad_max=0.9 y min_particulas=6 reproduce la versión
+    simplificada de ComparacionDensidades.
+    """
+    distancia_minima = radio_particula * 2.5
+
+    capas = np.arange(num_capas)
+    r = radio_masa + 0.05 + capas * distancia_minima * 1.2
+    factor_r2 = (radio_masa / r) ** 2
+    opacidad = np.clip(opacidad_max * factor_r2 * factor, opacidad_min, opacidad_max)
+
+    particulas = np.maximum(min_particulas, (2 * np.pi * r / distancia_minima).astype(int))
+    capa_de, angulos = _distribuir_en_anillos(r, particulas)
+
+    return {
+        'puntos': np.column_stack([r[capa_de] * np.cos(angulos), r[capa_de] * np.sin(angulos)]),
+        'radios': (radio_particula * (0.8 + factor_r2 * 0.4))[capa_de],
+        'opacidades': opacidad[capa_de],
+        't_color': (capas / num_capas)[capa_de],
+    }
+
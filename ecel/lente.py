@@ -0,0 +1,285 @@
+"""
+Lente gravitacional eCEL: imagen de un fondo visto a través de las masas.
+
+Trazado hacia atrás, un rayo por píxel. Desde el observador, el píxel en la
+posición θ (plano de la lente) pasa a distancia b = |θ - c| de cada masa y
+se desvía α(b) hacia ella; llega al plano de la fuente en
+
+    β = θ - D Σ α(b_i) r̂_i        (r̂_i de la masa i hacia θ)
+
+y el píxel toma el color de la imagen de fondo en β. Donde β cae cerca del
+centro de la masa aparecen el anillo de Einstein (θ_E = D α(θ_E)) y los arcos.
+
+El α(b) no se toma de la fórmula de campo débil: sale de integrar rayos con
+la física de crear_rayo_luz (ecel.deflexion.barrer_deflexion) y se guarda en
+la caché como perfil 1D por radio de masa. Así:
+- mover una masa o la fuente solo reinterpola el perfil (nada de integrar)
+- un mapa píxel → β completo también se cachea (`mapa_deflexion_cacheado`)
+  para escenas donde las masas no se mueven y solo cambia la fuente
+
+El trabajo por píxel se reparte en franjas de filas entre procesos
+(ecel.paralelo); con procesos=1 corre en el proceso actual. Para animar,
+`RenderLente` mantiene el pool vivo toda la escena y sube el fondo (y el
+mapa) a memoria compartida una sola vez: cada frame solo manda el extent
+de la fuente o la lente movida.
+
+Píxeles dentro del disco de una masa quedan ocultos (la masa tapa el fondo).
+"""
+import numpy as np
+
+from ecel.deflexion import barrer_deflexion
+from ecel.paralelo import TRABAJO, PoolCompartido
+from ecel.rejilla import centros_rejilla, muestrear_bilineal
+
+
+def perfil_deflexion(cache, cfg_luz, radio_masa, b_max=40.0, n=400, distancia=200.0):
+    """
+    α(b) numérico (dict 'b', 'alfa') para una masa de `radio_masa`, cacheado.
+
+    b va de R a b_max × R en escala logarítmica. Más allá se extrapola con la
+    cola de campo débil α ∝ 1/b² (ver `Lente`).
+    """
+    params = {
+        'k': cfg_luz['k_curvatura'],
+        'speed': cfg_luz['speed'],
+        'dt': cfg_luz['dt'],
+        'min_dist_factor': cfg_luz['min_dist_factor'],
+        'radio_masa': radio_masa,
+        'b_max': b_max,
+        'n': n,
+        'distancia': distancia,
+    }
+
+    def generar():
+        b = radio_masa * np.geomspace(1.0, b_max, n)
+        alfa = barrer_deflexion(b, params['k'], radio_masa, params['speed'], params['dt'],
+                                params['min_dist_factor'], distancia)
+        return {'b': b, 'alfa': alfa}
+
+    return cache.obtener('perfil_deflexion', params, generar)
+
+
+class Lente:
+    """
+    Masas puntuales con perfil α(b) cada una y fuente a distancia D.
+
+    centros: (N, 2); radios: (N,); perfiles: lista de dicts de
+    `perfil_deflexion` (uno por masa); distancia_fuente: D en unidades de
+    escena (factor D_ls / D_s ya incluido).
+    """
+
+    def __init__(self, centros, radios, perfiles, distancia_fuente):
+        self.centros = np.atleast_2d(np.asarray(centros, dtype=float))[:, :2]
+        self.radios = np.atleast_1d(np.asarray(radios, dtype=float))
+        self.perfiles = [(np.asarray(p['b']), np.asarray(p['alfa'])) for p in perfiles]
+        self.distancia_fuente = float(distancia_fuente)
+        if not (len(self.centros) == len(self.radios) == len(self.perfiles)):
+            raise ValueError("centros, radios y perfiles deben tener el mismo largo")
+
+    def movida(self, centros):
+        """Misma lente con las masas en otros centros (reusa los perfiles)."""
+        perfiles = [{'b': b, 'alfa': alfa} for b, alfa in self.perfiles]
+        return Lente(centros, self.radios, perfiles, self.distancia_fuente)
+
+    def params(self):
+        """Parámetros que identifican la lente (para la clave de caché)."""
+        return {
+            'centros': self.centros,
+            'radios': self.radios,
+            'perfiles': [np.concatenate([b, a]) for b, a in self.perfiles],
+            'distancia_fuente': self.distancia_fuente,
+        }
+
+    def fuente(self, puntos):
+        """Posiciones β (M, 2) en el plano de la fuente y máscara oculta (M,)."""
+        puntos = np.asarray(puntos, dtype=float)[:, :2]
+        beta = puntos.copy()
+        oculto = np.zeros(len(puntos), dtype=bool)
+        for centro, radio, (b_tabla, alfa_tabla) in zip(self.centros, self.radios, self.perfiles):
+            r_vec = puntos - centro
+            b = np.sqrt(np.einsum('mk,mk->m', r_vec, r_vec))
+            oculto |= b < radio
+            b = np.maximum(b, b_tabla[0])
+            alfa = np.interp(np.log(b), np.log(b_tabla), alfa_tabla)
+            cola = b > b_tabla[-1]
+            alfa[cola] = alfa_tabla[-1] * (b_tabla[-1] / b[cola]) ** 2
+            beta -= (self.distancia_fuente * alfa / b)[:, None] * r_vec
+        return beta, oculto
+
+    def radio_einstein(self, indice=0):
+        """θ_E de la masa `indice` sola: raíz de b = D α(b) (None si no hay anillo)."""
+        b, alfa = self.perfiles[indice]
+        resto = b - self.distancia_fuente * alfa
+        cambio = np.nonzero(np.diff(np.sign(resto)) > 0)[0]
+        if not len(cambio):
+            return None
+        i = cambio[0]
+        return float(b[i] - resto[i] * (b[i + 1] - b[i]) / (resto[i + 1] - resto[i]))
+
+
+def _franjas(ny, filas_por_franja):
+    return [(i, min(i + filas_por_franja, ny)) for i in range(0, ny, filas_por_franja)]
+
+
+def _puntos_franja(franja):
+    xs, ys = centros_rejilla(TRABAJO['extent'], TRABAJO['nx'], TRABAJO['ny'])
+    gx, gy = np.meshgrid(xs, ys[franja[0]:franja[1]])
+    return np.column_stack([gx.ravel(), gy.ravel()])
+
+
+def _mapa_franja(franja):
+    beta, oculto = TRABAJO['lente'].fuente(_puntos_franja(franja))
+    return beta.astype(np.float32), oculto
+
+
+def _muestrear(beta, oculto):
+    """Colores RGBA (M, 4) de la fuente en β (periódica: el fondo se repite)."""
+    x_min, x_max, y_min, y_max = TRABAJO['extent_fuente']
+    beta = np.column_stack([
+        x_min + np.mod(beta[:, 0] - x_min, x_max - x_min),
+        y_min + np.mod(beta[:, 1] - y_min, y_max - y_min),
+    ])
+    color = muestrear_bilineal(TRABAJO['imagen'], TRABAJO['extent_fuente'], beta)
+    color[oculto] = TRABAJO['color_oculto']
+    return color
+
+
+def _imagen_franja(franja):
+    if 'lente' in TRABAJO:
+        beta, oculto = TRABAJO['lente'].fuente(_puntos_franja(franja))
+    else:
+        beta = TRABAJO['mapa_fuente'][franja[0]:franja[1]].reshape(-1, 2)
+        oculto = TRABAJO['mapa_oculto'][franja[0]:franja[1]].ravel()
+    return _muestrear(beta, oculto)
+
+
+def mapa_deflexion(lente, extent, nx, ny, procesos=None, filas_por_franja=64):
+    """
+    Mapa píxel → plano de la fuente sobre la rejilla (ny, nx) (fila 0 = y mínimo).
+
+    Devuelve dict 'fuente' (ny, nx, 2) float32 y 'oculto' (ny, nx) bool.
+    """
+    estado = {'lente': lente, 'extent': extent, 'nx': nx, 'ny': ny}
+    with PoolCompartido(procesos) as pool:
+        partes = pool.mapear(_mapa_franja, _franjas(ny, filas_por_franja), estado)
+    return {
+        'fuente': np.concatenate([p[0] for p in partes]).reshape(ny, nx, 2),
+        'oculto': np.concatenate([p[1] for p in partes]).reshape(ny, nx),
+    }
+
+
+def mapa_deflexion_cacheado(cache, lente, extent, nx, ny, procesos=None):
+    """`mapa_deflexion` leído de la caché si la lente y la rejilla no cambiaron."""
+    params = {'lente': lente.params(), 'extent': list(extent), 'nx': nx, 'ny': ny}
+    return cache.obtener('mapa_lente', params,
+                         lambda: mapa_deflexion(lente, extent, nx, ny, procesos))
+
+
+class RenderLente:
+    """
+    Imágenes lenteadas repetidas (un frame por llamada) sobre un pool persistente.
+
+    imagen: fuente (hy, hx, 4) en 0-255 con la fila 0 en y mínimo. Se sube a
+    memoria compartida al crear el objeto, igual que `mapa` (de
+    `mapa_deflexion[_cacheado]`) si se da; después cada frame manda solo el
+    extent de la fuente y, si las masas se mueven, la lente.
+
+    Uso:
+        with RenderLente(fondo, extent, nx, ny, mapa=mapa, procesos=4) as render:
+            rgba = render(extent_fuente)                # muestrea el mapa
+            rgba = render(extent_fuente, lente=lente)   # lente por franja
+    """
+
+    def __init__(self, imagen, extent, nx, ny, mapa=None, color_oculto=(0, 0, 0, 255),
+                 procesos=None, filas_por_franja=64):
+        self.extent = extent
+        self.nx = nx
+        self.ny = ny
+        self.franjas = _franjas(ny, filas_por_franja)
+        self.pool = PoolCompartido(procesos)
+        self.estado = {
+            'imagen': self.pool.compartir(np.asarray(imagen, dtype=np.float32)),
+            'extent': extent,
+            'nx': nx,
+            'ny': ny,
+            'color_oculto': np.asarray(color_oculto, dtype=np.float32),
+        }
+        if mapa is not None:
+            self.estado['mapa_fuente'] = self.pool.compartir(mapa['fuente'])
+            self.estado['mapa_oculto'] = self.pool.compartir(mapa['oculto'])
+
+    def __call__(self, extent_fuente, lente=None):
+        """RGBA uint8 (ny, nx, 4) con la fila 0 arriba (lista para ImageMobject)."""
+        estado = dict(self.estado, extent_fuente=extent_fuente)
+        if lente is not None:
+            estado['lente'] = lente
+        elif 'mapa_fuente' not in estado:
+            raise ValueError("sin `mapa` hay que pasar `lente`")
+        partes = self.pool.mapear(_imagen_franja, self.franjas, estado)
+        rgba = np.concatenate(partes).reshape(self.ny, self.nx, 4)
+        return np.flipud(np.clip(rgba, 0, 255).astype(np.uint8))
+
+    def cerrar(self):
+        self.pool.cerrar()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *excepcion):
+        self.cerrar()
+
+
+def renderizar_lente(imagen, extent_fuente, extent, nx, ny, lente=None, mapa=None,
+                     color_oculto=(0, 0, 0, 255), procesos=None, filas_por_franja=64):
+    """
+    Imagen lenteada RGBA uint8 (ny, nx, 4) con la fila 0 arriba (lista para
+    ImageMobject), en una sola llamada.
+
+    imagen: fuente (hy, hx, 4) en 0-255 con la fila 0 en y mínimo, cubriendo
+    extent_fuente. Se pasa `lente` (el mapa se calcula por franja) o un
+    `mapa` ya hecho con `mapa_deflexion[_cacheado]` (solo se muestrea). Para
+    varios frames usar `RenderLente` (no rearma el pool cada vez).
+    """
+    if (lente is None) == (mapa is None):
+        raise ValueError("pasar exactamente uno de `lente` o `mapa`")
+    with RenderLente(imagen, extent, nx, ny, mapa=mapa, color_oculto=color_oculto,
+                     procesos=procesos, filas_por_franja=filas_por_franja) as render:
+        return render(extent_fuente, lente=lente)
+
+
+def fondo_estrellas(nx, ny, num_estrellas=600, semilla=0, paso_rejilla=None,
+                    color_rejilla=(80, 110, 200), brillo_fondo=(4, 6, 18)):
+    """
+    Fondo RGBA uint8 (ny, nx, 4) con estrellas gaussianas y, opcionalmente,
+    una rejilla cada `paso_rejilla` píxeles (fila 0 = y mínimo).
+    """
+    rng = np.random.default_rng(semilla)
+    imagen = np.empty((ny, nx, 4), dtype=np.float32)
+    imagen[..., :3] = brillo_fondo
+    imagen[..., 3] = 255
+
+    if paso_rejilla:
+        lineas = np.zeros((ny, nx), dtype=bool)
+        lineas[:, ::paso_rejilla] = True
+        lineas[::paso_rejilla, :] = True
+        imagen[lineas, :3] = color_rejilla
+
+    x = rng.uniform(0, nx, num_estrellas)
+    y = rng.uniform(0, ny, num_estrellas)
+    sigma = rng.uniform(0.6, 2.0, num_estrellas)
+    brillo = rng.uniform(0.4, 1.0, num_estrellas) ** 2
+    tinte = np.column_stack([np.ones(num_estrellas), rng.uniform(0.8, 1.0, num_estrellas),
+                             rng.uniform(0.7, 1.0, num_estrellas)])
+    radio = int(np.ceil(3 * sigma.max()))
+    desplazamientos = np.arange(-radio, radio + 1)
+    for dy in desplazamientos:
+        for dx in desplazamientos:
+            ix = (x.astype(int) + dx) % nx
+            iy = (y.astype(int) + dy) % ny
+            # Distancia sobre el toro: el fondo se repite sin cortar estrellas
+            ex = (ix + 0.5 - x + nx / 2) % nx - nx / 2
+            ey = (iy + 0.5 - y + ny / 2) % ny - ny / 2
+            d2 = ex ** 2 + ey ** 2
+            peso = brillo * np.exp(-d2 / (2 * sigma ** 2))
+            np.add.at(imagen[..., :3], (iy, ix), 255 * peso[:, None] * tinte)
+    return np.clip(imagen, 0, 255).astype(np.uint8)
@@ -0,0 +1,380 @@
+"""
+Integración en lote de muchos sistemas de N cuerpos (escena TresCuerpos).
+
+El estado son arreglos (E, B, 2): E ensambles independientes de B cuerpos en
+2D, avanzados a la vez con broadcasting. Así se pueden probar miles de
+condiciones iniciales en segundos y quedarse con las órbitas más vistosas
+antes de renderizar.
+
+Modelos de fuerza (callables pos (E, B, 2) → aceleración (E, B, 2)):
+- `Newton`: a_j = G Σ m_i (x_i - x_j) / (r² + ε²)^(3/2)
+- `ModeloECEL`: cada cuerpo es empujado hacia el eCEL acumulado por los
+  otros, a_j = acople ∇ρ_otros(x_j) con ρ_i = f_i R_i² / r² (ecel.campo);
+  una fuerza 1/r³, así que las órbitas no se cierran como en Newton
+
+Integradores:
+- `leapfrog` (orden 2) y `yoshida` (orden 4): simplécticos, paso fijo,
+  guardan cada `guardar_cada` pasos y siempre el estado final
+- `dopri5`: Dormand-Prince 5(4) adaptativo con dt propio por ensamble
+  (aceptar/rechazar por ensamble) y salida densa Hermite cúbica en una
+  malla de tiempos común, lista para reproducir frame a frame
+
+`explorar()` genera condiciones aleatorias, integra todo el lote y ordena
+las órbitas por un puntaje de "interés". También se puede correr como
+`python -m ecel.nbody --n 2000` para listar las mejores.
+"""
+import argparse
+import time
+
+import numpy as np
+
+from ecel.desplazamiento import calcular_factor_desplazamiento
+
+# Yoshida (1990): composición simétrica de tres pasos de leapfrog
+_W1 = 1.0 / (2.0 - 2.0 ** (1.0 / 3.0))
+_W0 = -(2.0 ** (1.0 / 3.0)) * _W1
+
+# Tablero de Butcher de Dormand-Prince 5(4); público: ecel.rayos lo comparte
+DP_C = np.array([0.0, 1 / 5, 3 / 10, 4 / 5, 8 / 9, 1.0, 1.0])
+DP_A = [
+    [],
+    [1 / 5],
+    [3 / 40, 9 / 40],
+    [44 / 45, -56 / 15, 32 / 9],
+    [19372 / 6561, -25360 / 2187, 64448 / 6561, -212 / 729],
+    [9017 / 3168, -355 / 33, 46732 / 5247, 49 / 176, -5103 / 18656],
+    [35 / 384, 0.0, 500 / 1113, 125 / 192, -2187 / 6784, 11 / 84],
+]
+DP_B = np.array([35 / 384, 0.0, 500 / 1113, 125 / 192, -2187 / 6784, 11 / 84, 0.0])
+DP_E = DP_B - np.array([5179 / 57600, 0.0, 7571 / 16695, 393 / 640,
+                          -92097 / 339200, 187 / 2100, 1 / 40])
+
+
+def _diferencias(pos):
+    """delta[e, j, i] = x_i - x_j y r² (E, B, B) con la diagonal en infinito."""
+    delta = pos[:, None, :, :] - pos[:, :, None, :]
+    r2 = np.einsum('ejik,ejik->eji', delta, delta)
+    idx = np.arange(pos.shape[1])
+    r2[:, idx, idx] = np.inf
+    return delta, r2
+
+
+class Newton:
+    """Gravedad newtoniana con suavizado ε. masas: (B,) o (E, B)."""
+
+    def __init__(self, masas, G=1.0, suavizado=0.01):
+        self.masas = np.asarray(masas, dtype=float)
+        self.G = G
+        self.eps2 = suavizado ** 2
+
+    def __call__(self, pos):
+        delta, r2 = _diferencias(pos)
+        inv_r3 = (r2 + self.eps2) ** -1.5
+        masas = np.broadcast_to(self.masas, pos.shape[:2])
+        return self.G * np.einsum('eji,ei,ejik->ejk', inv_r3, masas, delta)
+
+    def energia(self, pos, vel):
+        """Energía total por ensamble (E,), para verificar la conservación."""
+        masas = np.broadcast_to(self.masas, pos.shape[:2])
+        cinetica = 0.5 * np.einsum('eb,ebk,ebk->e', masas, vel, vel)
+        _, r2 = _diferencias(pos)
+        par = masas[:, :, None] * masas[:, None, :] / np.sqrt(r2 + self.eps2)
+        return cinetica - 0.5 * self.G * par.sum(axis=(1, 2))
+
+
+class ModeloECEL:
+    """
+    Empuje eCEL entre cuerpos: a_j = acople Σ_i 2 peso_i (x_i - x_j) / r⁴.
+
+    peso_i = f(d_i) R_i² (igual que CampoMasas); el suavizado por defecto es
+    la suma de radios, para que dos cuerpos en contacto no se disparen.
+    """
+
+    def __init__(self, radios, densidades, acople=1.0, suavizado=None):
+        self.radios = np.asarray(radios, dtype=float)
+        factores = np.asarray(calcular_factor_desplazamiento(np.asarray(densidades, dtype=float)))
+        self.pesos = factores * self.radios ** 2
+        self.acople = acople
+        if suavizado is None:
+            self.eps2 = (self.radios[..., :, None] + self.radios[..., None, :]) ** 2
+        else:
+            self.eps2 = suavizado ** 2
+
+    def __call__(self, pos):
+        delta, r2 = _diferencias(pos)
+        coef = 2.0 * self.acople * (r2 + self.eps2) ** -2
+        pesos = np.broadcast_to(self.pesos, pos.shape[:2])
+        return np.einsum('eji,ei,ejik->ejk', coef, pesos, delta)
+
+
+def _simplectico(pos, vel, aceleracion, dt, n_pasos, guardar_cada, coeficientes):
+    """
+    Composición drift-kick genérica; coeficientes = [(c_drift, d_kick), ...].
+
+    Guarda cada `guardar_cada` pasos y siempre el estado final: si n_pasos
+    no es múltiplo, el último intervalo guardado es más corto ('t' es el
+    tiempo real de cada muestra).
+    """
+    pos = np.array(pos, dtype=float)
+    vel = np.array(vel, dtype=float)
+    pasos_guardados = np.arange(0, n_pasos + 1, guardar_cada)
+    if pasos_guardados[-1] != n_pasos:
+        pasos_guardados = np.append(pasos_guardados, n_pasos)
+    tray_pos = np.empty((len(pasos_guardados),) + pos.shape)
+    tray_vel = np.empty((len(pasos_guardados),) + vel.shape)
+    tray_pos[0] = pos
+    tray_vel[0] = vel
+    siguiente = 1
+
+    for n in range(1, n_pasos + 1):
+        for c, d in coeficientes:
+            pos += c * dt * vel
+            if d:
+                vel += d * dt * aceleracion(pos)
+        if n == pasos_guardados[siguiente]:
+            tray_pos[siguiente] = pos
+            tray_vel[siguiente] = vel
+            siguiente += 1
+
+    return {
+        't': dt * pasos_guardados,
+        'pos': tray_pos,
+        'vel': tray_vel,
+    }
+
+
+def leapfrog(pos, vel, aceleracion, dt, n_pasos, guardar_cada=1):
+    """Leapfrog drift-kick-drift (orden 2). Devuelve dict con 't', 'pos', 'vel'."""
+    return _simplectico(pos, vel, aceleracion, dt, n_pasos, guardar_cada,
+                        [(0.5, 1.0), (0.5, 0.0)])
+
+
+def yoshida(pos, vel, aceleracion, dt, n_pasos, guardar_cada=1):
+    """Yoshida de orden 4 (3 evaluaciones de fuerza por paso)."""
+    return _simplectico(pos, vel, aceleracion, dt, n_pasos, guardar_cada, [
+        (0.5 * _W1, _W1),
+        (0.5 * (_W0 + _W1), _W0),
+        (0.5 * (_W0 + _W1), _W1),
+        (0.5 * _W1, 0.0),
+    ])
+
+
+def dopri5(pos, vel, aceleracion, t_salida, rtol=1e-8, atol=1e-10, dt_inicial=1e-3,
+           dt_min=1e-9, max_pasos=1_000_000, detener=None):
+    """
+    Dormand-Prince 5(4) adaptativo, un dt por ensamble.
+
+    t_salida: tiempos (T,) crecientes desde 0 donde se quiere el estado; se
+    llenan con interpolación Hermite cúbica dentro de cada paso aceptado.
+    Un ensamble cuyo dt cae bajo `dt_min` (choque cercano), o para el que
+    `detener(pos, vel) -> (E,) bool` da True tras un paso, se detiene y sus
+    salidas restantes quedan en NaN.
+
+    Devuelve dict con 't', 'pos' (T, E, B, 2), 'vel', 'detenido' (E,) y
+    'evaluaciones' (número de llamadas a la fuerza).
+    """
+    t_salida = np.asarray(t_salida, dtype=float)
+    forma = np.shape(pos)
+    n_ens = forma[0]
+    y = np.concatenate([np.asarray(pos, dtype=float), np.asarray(vel, dtype=float)], axis=-1)
+
+    def derivada(estado):
+        return np.concatenate([estado[..., 2:], aceleracion(estado[..., :2])], axis=-1)
+
+    salida = np.full((len(t_salida),) + y.shape, np.nan)
+    sig = np.zeros(n_ens, dtype=int)
+    en_cero = t_salida[0] <= 0.0
+    if en_cero:
+        salida[0] = y
+        sig[:] = 1
+
+    t = np.zeros(n_ens)
+    h = np.full(n_ens, float(dt_inicial))
+    t_final = t_salida[-1]
+    activo = sig < len(t_salida)
+    detenido = np.zeros(n_ens, dtype=bool)
+    f = derivada(y)
+    evaluaciones = 1
+
+    for _ in range(max_pasos):
+        # Solo se evalúan los ensambles que siguen corriendo
+        act = np.nonzero(activo)[0]
+        if not len(act):
+            break
+        y0, f0, t0 = y[act], f[act], t[act]
+        ha = np.minimum(h[act], t_final - t0)
+        hb = ha[:, None, None]
+
+        k = [f0]
+        for etapa in range(1, 7):
+            incremento = sum(a * ki for a, ki in zip(DP_A[etapa], k) if a)
+            k.append(derivada(y0 + hb * incremento))
+        evaluaciones += 6
+        y1 = y0 + hb * sum(b * ki for b, ki in zip(DP_B, k) if b)
+        error = hb * sum(e * ki for e, ki in zip(DP_E, k) if e)
+
+        escala = atol + rtol * np.maximum(np.abs(y0), np.abs(y1))
+        norma = np.sqrt(np.mean((error / escala) ** 2, axis=(1, 2)))
+        aceptado = norma <= 1.0
+
+        # Salida densa: Hermite cúbica con y, f en ambos extremos (FSAL: f1 = k7)
+        f1 = k[6]
+        t1 = t0 + ha
+        while True:
+            llenar = aceptado & (sig[act] < len(t_salida))
+            llenar[llenar] = t_salida[sig[act][llenar]] <= t1[llenar] + 1e-12
+            if not llenar.any():
+                break
+            loc = np.nonzero(llenar)[0]
+            e = act[loc]
+            th = ((t_salida[sig[e]] - t0[loc]) / ha[loc])[:, None, None]
+            he = ha[loc][:, None, None]
+            salida[sig[e], e] = (
+                (2 * th ** 3 - 3 * th ** 2 + 1) * y0[loc]
+                + (th ** 3 - 2 * th ** 2 + th) * he * f0[loc]
+                + (-2 * th ** 3 + 3 * th ** 2) * y1[loc]
+                + (th ** 3 - th ** 2) * he * f1[loc]
+            )
+            sig[e] += 1
+
+        e = act[aceptado]
+        y[e] = y1[aceptado]
+        f[e] = f1[aceptado]
+        t[e] = t1[aceptado]
+
+        with np.errstate(divide='ignore'):
+            factor = np.clip(0.9 * norma ** -0.2, 0.2, 5.0)
+        h[act] = ha * np.where(np.isfinite(factor), factor, 0.2)
+
+        parar = h[act] < dt_min
+        if detener is not None:
+            parar |= aceptado & detener(y1[..., :2], y1[..., 2:])
+        detenido[act] |= parar & (sig[act] < len(t_salida))
+        activo = (sig < len(t_salida)) & ~detenido
+
+    return {
+        't': t_salida,
+        'pos': salida[..., :2],
+        'vel': salida[..., 2:],
+        'detenido': detenido,
+        'evaluaciones': evaluaciones,
+    }
+
+
+def figura_ocho():
+    """Coreografía en ocho (Chenciner-Montgomery), G = m = 1; período ≈ 6.3259."""
+    x1 = np.array([0.97000436, -0.24308753])
+    v3 = np.array([-0.93240737, -0.86473146])
+    pos = np.array([x1, -x1, [0.0, 0.0]])
+    vel = np.array([-v3 / 2, -v3 / 2, v3])
+    return pos[None], vel[None]
+
+
+def condiciones_aleatorias(n, masas, escala=1.0, velocidad=0.5, semilla=0):
+    """
+    n ensambles de B cuerpos en reposo en el centro de masa.
+
+    Posiciones uniformes en un disco de radio `escala`, velocidades
+    gaussianas de desviación `velocidad`; se resta el centro de masa y el
+    momento total de cada ensamble.
+    """
+    masas = np.asarray(masas, dtype=float)
+    rng = np.random.default_rng(semilla)
+    b = len(masas)
+    radio = escala * np.sqrt(rng.random((n, b)))
+    angulo = 2 * np.pi * rng.random((n, b))
+    pos = np.stack([radio * np.cos(angulo), radio * np.sin(angulo)], axis=-1)
+    vel = rng.normal(scale=velocidad, size=(n, b, 2))
+
+    peso = (masas / masas.sum())[None, :, None]
+    pos -= (peso * pos).sum(axis=1, keepdims=True)
+    vel -= (peso * vel).sum(axis=1, keepdims=True)
+    return pos, vel
+
+
+def puntuar(resultado, limite=4.0, separacion_min=0.05):
+    """
+    Puntaje de "interés" visual por ensamble (E,), 0 = descartar.
+
+    Se descartan órbitas que se escapan (algún cuerpo a más de `limite` del
+    origen), que chocan (par a menos de `separacion_min`) o que se detuvieron.
+    Entre las que quedan, gana la que más baraja las distancias entre pares
+    (coeficiente de variación medio): un binario rígido con un tercero
+    lejano puntúa bajo, un baile caótico y confinado puntúa alto.
+    """
+    pos = resultado['pos']
+    valido = np.isfinite(pos).all(axis=(0, 2, 3))
+    pos = np.nan_to_num(pos)
+    confinado = (np.linalg.norm(pos, axis=-1) < limite).all(axis=(0, 2))
+
+    b = pos.shape[2]
+    i, j = np.triu_indices(b, 1)
+    dist = np.linalg.norm(pos[:, :, i] - pos[:, :, j], axis=-1)
+    sin_choque = (dist > separacion_min).all(axis=(0, 2))
+    variacion = (dist.std(axis=0) / np.maximum(dist.mean(axis=0), 1e-12)).mean(axis=1)
+
+    if 'detenido' in resultado:
+        valido &= ~resultado['detenido']
+    return np.where(valido & confinado & sin_choque, variacion, 0.0)
+
+
+def explorar(n, masas, duracion, fuerza, fps=30, escala=2.0, velocidad=0.5,
+             semilla=0, rtol=1e-6, limite=4.0, separacion_min=0.05):
+    """
+    Integra n condiciones aleatorias con dopri5 y las ordena por puntaje.
+
+    Los ensambles que se escapan o chocan (que `puntuar` descarta igual) se
+    detienen en cuanto pasa, en vez de frenar al lote entero con pasos
+    diminutos.
+
+    Devuelve (orden de mejor a peor, puntajes (n,), condiciones (pos, vel),
+    resultado de dopri5).
+    """
+    pos, vel = condiciones_aleatorias(n, masas, escala, velocidad, semilla)
+    t_salida = np.arange(int(round(duracion * fps)) + 1) / fps
+    i, j = np.triu_indices(len(masas), 1)
+
+    def descartable(p, v):
+        escapa = (np.einsum('ebk,ebk->eb', p, p) > limite ** 2).any(axis=1)
+        separacion = np.linalg.norm(p[:, i] - p[:, j], axis=-1).min(axis=1)
+        return escapa | (separacion < separacion_min)
+
+    resultado = dopri5(pos, vel, fuerza, t_salida, rtol=rtol, atol=rtol * 1e-2,
+                       detener=descartable)
+    puntajes = puntuar(resultado, limite=limite, separacion_min=separacion_min)
+    orden = np.argsort(-puntajes, kind='stable')
+    return orden, puntajes, (pos, vel), resultado
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Busca órbitas vistosas de 3 cuerpos")
+    parser.add_argument('--n', type=int, default=1000, help="condiciones iniciales")
+    parser.add_argument('--duracion', type=float, default=10.0, help="tiempo simulado")
+    parser.add_argument('--modelo', choices=['newton', 'ecel'], default='newton')
+    parser.add_argument('--escala', type=float, default=2.0, help="radio del disco inicial")
+    parser.add_argument('--velocidad', type=float, default=0.5, help="dispersión de velocidades")
+    parser.add_argument('--semilla', type=int, default=0)
+    parser.add_argument('--mejores', type=int, default=5, help="cuántas listar")
+    args = parser.parse_args()
+
+    masas = np.ones(3)
+    if args.modelo == 'newton':
+        fuerza = Newton(masas)
+    else:
+        fuerza = ModeloECEL(radios=np.full(3, 0.1), densidades=np.full(3, 5.5), acople=50.0)
+
+    inicio = time.perf_counter()
+    orden, puntajes, (pos, vel), resultado = explorar(
+        args.n, masas, args.duracion, fuerza, escala=args.escala,
+        velocidad=args.velocidad, semilla=args.semilla
+    )
+    print(f"{args.n} sistemas en {time.perf_counter() - inicio:.1f} s "
+          f"({resultado['evaluaciones']} evaluaciones, {int((puntajes > 0).sum())} válidos)")
+    for e in orden[:args.mejores]:
+        print(f"\n# ensamble {e}, puntaje {puntajes[e]:.3f}")
+        print(f"posiciones: {np.round(pos[e], 6).tolist()}")
+        print(f"velocidades: {np.round(vel[e], 6).tolist()}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,117 @@
+"""
+Océano eCEL estático con una masa que se mueve (recalculo incremental).
+
+Las partículas del océano tienen una posición base fija y viven en una
+rejilla hash espacial (celdas ordenadas + searchsorted). Cuando la masa se
+mueve, solo se recalculan las partículas dentro del radio de influencia de
+la posición anterior o de la nueva: el costo por frame depende del tamaño
+del halo, no del océano completo.
+
+Desplazamiento (Arquímedes en 2D, área conservada): una partícula a
+distancia d del centro pasa a
+
+    r = d + w(d) × (sqrt(d² + f R²) - d)
+
+con f el factor de desplazamiento y w(d) = (1 - (d / R_inf)²)² un corte suave
+que vale 0 fuera del radio de influencia R_inf. Con f = 1 todo el eCEL del
+interior termina en la superficie. La opacidad y el tamaño crecen con la
+acumulación f (R / r)².
+"""
+import numpy as np
+
+
+class RejillaHash:
+    """Índice espacial de puntos fijos (N, 2) en celdas cuadradas."""
+
+    def __init__(self, puntos, tam_celda):
+        self.puntos = np.asarray(puntos, dtype=float)[:, :2]
+        self.tam_celda = float(tam_celda)
+        self.origen = self.puntos.min(axis=0)
+
+        celdas = np.floor((self.puntos - self.origen) / self.tam_celda).astype(np.int64)
+        self.n_celdas_y = int(celdas[:, 1].max()) + 1
+        claves = celdas[:, 0] * self.n_celdas_y + celdas[:, 1]
+        self.orden = np.argsort(claves, kind='stable')
+        self.claves_ordenadas = claves[self.orden]
+
+    def indices_en_radio(self, centro, radio):
+        """Índices de los puntos a distancia < radio de centro."""
+        centro = np.asarray(centro, dtype=float)[:2]
+        c_min = np.floor((centro - radio - self.origen) / self.tam_celda).astype(np.int64)
+        c_max = np.floor((centro + radio - self.origen) / self.tam_celda).astype(np.int64)
+        c_min[1] = max(c_min[1], 0)
+        c_max[1] = min(c_max[1], self.n_celdas_y - 1)
+        if c_min[1] > c_max[1]:
+            return np.empty(0, dtype=np.int64)
+
+        # Para cada columna de celdas, el rango [iy_min, iy_max] es contiguo en la clave
+        columnas = np.arange(max(c_min[0], 0), c_max[0] + 1)
+        inicios = np.searchsorted(self.claves_ordenadas, columnas * self.n_celdas_y + c_min[1])
+        finales = np.searchsorted(self.claves_ordenadas, columnas * self.n_celdas_y + c_max[1], side='right')
+        if not len(columnas) or (finales - inicios).sum() == 0:
+            return np.empty(0, dtype=np.int64)
+
+        candidatos = self.orden[np.concatenate([np.arange(a, b) for a, b in zip(inicios, finales)])]
+        delta = self.puntos[candidatos] - centro
+        return candidatos[np.einsum('nk,nk->n', delta, delta) < radio ** 2]
+
+
+class OceanoDesplazable:
+    """
+    Estado del océano eCEL con una masa móvil.
+
+    posiciones/opacidades/radios contienen el estado actual de TODAS las
+    partículas; `mover()` solo toca las que están cerca de la masa.
+    """
+
+    def __init__(self, puntos_base, radio_masa, factor, radio_influencia,
+                 opacidad_min, opacidad_max, radio_particula):
+        self.base = np.asarray(puntos_base, dtype=float)[:, :2]
+        self.radio_masa = radio_masa
+        self.factor = factor
+        self.radio_influencia = radio_influencia
+        self.opacidad_min = opacidad_min
+        self.opacidad_max = opacidad_max
+        self.radio_particula = radio_particula
+
+        self.rejilla = RejillaHash(self.base, radio_influencia)
+        self.posiciones = self.base.copy()
+        self.opacidades = np.full(len(self.base), float(opacidad_min))
+        self.radios = np.full(len(self.base), float(radio_particula))
+        self.centro = None
+
+    def _estado(self, idx, centro):
+        """Posición, opacidad y radio de las partículas idx con la masa en centro."""
+        delta = self.base[idx] - centro
+        d = np.sqrt(np.einsum('nk,nk->n', delta, delta))
+        direccion = np.divide(delta, d[:, None], out=np.zeros_like(delta), where=d[:, None] > 0)
+        # Partícula exactamente en el centro: se empuja hacia +x
+        direccion[d == 0] = (1.0, 0.0)
+
+        corte = np.clip(1 - (d / self.radio_influencia) ** 2, 0, 1) ** 2
+        r = d + corte * (np.sqrt(d ** 2 + self.factor * self.radio_masa ** 2) - d)
+
+        acumulacion = corte * np.minimum(1.0, self.factor * (self.radio_masa / np.maximum(r, self.radio_masa)) ** 2)
+        opacidad = self.opacidad_min + (self.opacidad_max - self.opacidad_min) * acumulacion
+        radio = self.radio_particula * (1 + 0.5 * acumulacion)
+        return centro + direccion * r[:, None], opacidad, radio
+
+    def mover(self, centro):
+        """
+        Mueve la masa a `centro` y recalcula solo el halo afectado.
+
+        Devuelve los índices de las partículas que cambiaron (las cercanas a
+        la posición anterior o a la nueva).
+        """
+        centro = np.asarray(centro, dtype=float)[:2]
+        afectados = self.rejilla.indices_en_radio(centro, self.radio_influencia)
+        if self.centro is not None:
+            anteriores = self.rejilla.indices_en_radio(self.centro, self.radio_influencia)
+            afectados = np.union1d(afectados, anteriores)
+        self.centro = centro
+
+        pos, op, rad = self._estado(afectados, centro)
+        self.posiciones[afectados] = pos
+        self.opacidades[afectados] = op
+        self.radios[afectados] = rad
+        return afectados
@@ -0,0 +1,210 @@
+"""
+Estela eCEL en 2D ("Bow Riding"): ecuación de onda con fuentes móviles.
+
+Cada masa cava un surco en la superficie del océano eCEL. La altura h(x, y, t)
+cumple
+
+    ∂²h/∂t² = c² ∇²h - κ² h - γ ∂h/∂t - Σ A_i G(x - x_i(t))
+
+con G una gaussiana de ancho ~ radio de la masa. κ da un alcance finito al
+surco estático (tipo Yukawa, κ = 0 lo desactiva) y γ es el amortiguamiento.
+Los cuerpos menores no se atraen: surfean el surco, con aceleración
+a = -acople × ∇h (bajan por la pendiente hacia el fondo del surco).
+
+Métodos de avance:
+- 'diferencias': salto de rana (leapfrog) con Laplaciano de 5 puntos y
+  bordes fijos (h = 0); estable si c·dt ≤ 1/sqrt(1/dx² + 1/dy²), así que
+  `avanzar()` subdivide el paso cuando hace falta
+- 'espectral': cada modo de Fourier avanza con su recurrencia exacta
+  ĥ⁺ = 2 cos(ω dt) ĥ - ĥ⁻ + (2 (1 - cos ω dt) / ω²) ŝ, ω² = c²k² + κ²;
+  sin límite de CFL (dt lo fija solo la fuente), dominio periódico
+
+En ambos, una capa esponja en los bordes absorbe las ondas salientes para
+que no vuelvan a entrar. Convención de rejilla: ver ecel/rejilla.py.
+"""
+import numpy as np
+
+from ecel.rejilla import centros_rejilla, muestrear_bilineal, paso_rejilla
+
+
+class EstelaOndas:
+    """
+    Superficie del océano eCEL sobre una rejilla nx × ny que cubre `extent`.
+
+    Uso:
+        estela = EstelaOndas(extent, 256, 144, velocidad=2.0)
+        estela.fuentes(centros, radios, amplitudes)
+        estela.avanzar(dt)
+        h = estela.altura(puntos); g = estela.gradiente(puntos)
+    """
+
+    def __init__(self, extent, nx, ny, velocidad=1.0, alcance=0.0, amortiguamiento=0.0,
+                 metodo='diferencias', esponja=0.1):
+        if metodo not in ('diferencias', 'espectral'):
+            raise ValueError(f"metodo desconocido: {metodo!r}")
+        self.extent = extent
+        self.nx = nx
+        self.ny = ny
+        self.velocidad = velocidad
+        self.kappa2 = alcance ** 2
+        self.amortiguamiento = amortiguamiento
+        self.metodo = metodo
+        self.dx, self.dy = paso_rejilla(extent, nx, ny)
+        self.xs, self.ys = centros_rejilla(extent, nx, ny)
+
+        self.h = np.zeros((ny, nx))
+        self.h_prev = np.zeros((ny, nx))
+        self.fuente = np.zeros((ny, nx))
+        self.t = 0.0
+        self._grad = None
+
+        self._esponja = self._perfil_esponja(esponja)
+
+        if metodo == 'espectral':
+            kx = 2 * np.pi * np.fft.rfftfreq(nx, self.dx)
+            ky = 2 * np.pi * np.fft.fftfreq(ny, self.dy)
+            self._omega2 = velocidad ** 2 * (kx[None, :] ** 2 + ky[:, None] ** 2) + self.kappa2
+            self._dt_coef = None
+
+    def _perfil_esponja(self, ancho):
+        """Tasa de absorción (ny, nx): 0 en el interior, crece cuadrático en los bordes."""
+        if ancho <= 0:
+            return None
+        x_min, x_max, y_min, y_max = self.extent
+        capa = ancho * min(x_max - x_min, y_max - y_min)
+        dist_x = np.minimum(self.xs - x_min, x_max - self.xs)
+        dist_y = np.minimum(self.ys - y_min, y_max - self.ys)
+        dist = np.minimum(dist_x[None, :], dist_y[:, None])
+        # Con γ_max ~ c / capa la onda se apaga en un cruce de la capa
+        return (self.velocidad / capa) * 3.0 * np.clip(1 - dist / capa, 0, 1) ** 2
+
+    def paso_maximo(self):
+        """dt estable del esquema de diferencias (infinito en el espectral)."""
+        if self.metodo == 'espectral':
+            return np.inf
+        return 0.9 / (self.velocidad * np.sqrt(1 / self.dx ** 2 + 1 / self.dy ** 2))
+
+    def fuentes(self, centros, radios, amplitudes):
+        """
+        Fija las fuentes del instante actual: gaussianas de ancho = radio.
+
+        La suma de B gaussianas separables es un producto (ny, B) @ (B, nx).
+        """
+        centros = np.atleast_2d(np.asarray(centros, dtype=float))[:, :2]
+        sigma = np.maximum(np.atleast_1d(np.asarray(radios, dtype=float)), 1.5 * max(self.dx, self.dy))
+        amplitudes = np.broadcast_to(np.asarray(amplitudes, dtype=float), sigma.shape)
+        gx = np.exp(-0.5 * ((self.xs[None, :] - centros[:, :1]) / sigma[:, None]) ** 2)
+        gy = np.exp(-0.5 * ((self.ys[None, :] - centros[:, 1:2]) / sigma[:, None]) ** 2)
+        self.fuente = -(gy.T * amplitudes) @ gx
+
+    def _laplaciano(self, h):
+        lap = np.zeros_like(h)
+        centro = h[1:-1, 1:-1]
+        lap[1:-1, 1:-1] = (
+            (h[1:-1, 2:] + h[1:-1, :-2] - 2 * centro) / self.dx ** 2
+            + (h[2:, 1:-1] + h[:-2, 1:-1] - 2 * centro) / self.dy ** 2
+        )
+        return lap
+
+    def _paso_diferencias(self, dt):
+        gamma = 0.5 * self.amortiguamiento * dt
+        aceleracion = (self.velocidad ** 2 * self._laplaciano(self.h)
+                       - self.kappa2 * self.h + self.fuente)
+        nuevo = (2 * self.h - (1 - gamma) * self.h_prev + dt ** 2 * aceleracion) / (1 + gamma)
+        nuevo[[0, -1], :] = 0.0
+        nuevo[:, [0, -1]] = 0.0
+        return nuevo
+
+    def _paso_espectral(self, dt):
+        if self._dt_coef != dt:
+            omega = np.sqrt(self._omega2)
+            coseno = np.cos(omega * dt)
+            self._dos_cos = 2 * coseno
+            with np.errstate(divide='ignore', invalid='ignore'):
+                self._coef_fuente = np.where(self._omega2 > 0, 2 * (1 - coseno) / self._omega2, dt ** 2)
+            self._dt_coef = dt
+        h_hat = np.fft.rfft2(self.h)
+        prev_hat = np.fft.rfft2(self.h_prev)
+        nuevo_hat = self._dos_cos * h_hat - prev_hat + self._coef_fuente * np.fft.rfft2(self.fuente)
+        nuevo = np.fft.irfft2(nuevo_hat, s=self.h.shape)
+        if self.amortiguamiento:
+            # Amortiguamiento uniforme: frena ∂h/∂t en cada paso
+            nuevo -= (1 - np.exp(-self.amortiguamiento * dt)) * (nuevo - self.h)
+        return nuevo
+
+    def avanzar(self, dt):
+        """Avanza dt (subdividido si el esquema lo exige). Las fuentes quedan fijas."""
+        sub = max(1, int(np.ceil(dt / self.paso_maximo())))
+        paso = dt / sub
+        for _ in range(sub):
+            if self.metodo == 'diferencias':
+                nuevo = self._paso_diferencias(paso)
+            else:
+                nuevo = self._paso_espectral(paso)
+            if self._esponja is not None:
+                atenuacion = np.exp(-self._esponja * paso)
+                nuevo *= atenuacion
+                self.h *= atenuacion
+            self.h_prev = self.h
+            self.h = nuevo
+            self.t += paso
+        self._grad = None
+
+    # --- muestreo ------------------------------------------------------
+    def altura(self, puntos):
+        """h interpolada en puntos (M, 2) o (M, 3)."""
+        return muestrear_bilineal(self.h, self.extent, puntos)
+
+    def gradiente(self, puntos):
+        """∇h interpolado en puntos: (M, 2)."""
+        if self._grad is None:
+            gy, gx = np.gradient(self.h, self.dy, self.dx)
+            self._grad = np.stack([gx, gy], axis=-1)
+        return muestrear_bilineal(self._grad, self.extent, puntos)
+
+    def simular(self, trayectoria, radios, amplitudes, posiciones, velocidades,
+                duracion, dt, acople=1.0, guardar_cada=1, guardar_altura=True):
+        """
+        Masas con `trayectoria(t) -> (B, 2)` y cuerpos (K, 2) que surfean la estela.
+
+        Los cuerpos avanzan con kick-drift-kick sobre a = -acople ∇h. Devuelve
+        un dict con 't' (F,), 'masas' (F, B, 2), 'cuerpos' (F, K, 2) y, si
+        `guardar_altura`, 'altura' (F, ny, nx) en float32.
+        """
+        pos = np.array(posiciones, dtype=float)[:, :2]
+        vel = np.array(velocidades, dtype=float)[:, :2]
+        n_pasos = int(round(duracion / dt))
+
+        tiempos, masas, cuerpos, alturas = [], [], [], []
+
+        def guardar(centros):
+            tiempos.append(self.t)
+            masas.append(centros)
+            cuerpos.append(pos.copy())
+            if guardar_altura:
+                alturas.append(self.h.astype(np.float32))
+
+        centros = np.atleast_2d(np.asarray(trayectoria(self.t), dtype=float))[:, :2]
+        self.fuentes(centros, radios, amplitudes)
+        acc = -acople * self.gradiente(pos)
+        guardar(centros)
+
+        for n in range(1, n_pasos + 1):
+            vel += 0.5 * dt * acc
+            pos += dt * vel
+            self.avanzar(dt)
+            centros = np.atleast_2d(np.asarray(trayectoria(self.t), dtype=float))[:, :2]
+            self.fuentes(centros, radios, amplitudes)
+            acc = -acople * self.gradiente(pos)
+            vel += 0.5 * dt * acc
+            if n % guardar_cada == 0:
+                guardar(centros)
+
+        resultado = {
+            't': np.array(tiempos),
+            'masas': np.array(masas),
+            'cuerpos': np.array(cuerpos),
+        }
+        if guardar_altura:
+            resultado['altura'] = np.array(alturas)
+        return resultado
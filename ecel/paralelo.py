@@ -0,0 +1,130 @@
+"""
+Pool de procesos persistente con arreglos en memoria compartida.
+
+Las funciones de trabajo (lente, cáusticas) reparten franjas de filas entre
+procesos y leen su estado del diccionario global `TRABAJO`. Crear un
+ProcessPoolExecutor por frame y mandarle el fondo entero con cada llamada
+cuesta más que el trazado que paraleliza, así que:
+
+- `PoolCompartido` crea el pool una sola vez y lo reusa en cada `mapear`
+- `compartir(arreglo)` copia un arreglo grande (fondo, mapa de deflexión)
+  a memoria compartida una vez; lo que viaja con cada llamada es un
+  `ArregloCompartido` de unos pocos bytes que cada proceso abre una vez y
+  guarda abierto
+- el resto del estado de la llamada (extent de la fuente, la lente) es
+  chico y se manda con cada franja
+
+Con procesos=1 todo corre en el proceso actual y `compartir` no copia nada.
+
+Uso:
+    with PoolCompartido(procesos=4) as pool:
+        fondo = pool.compartir(imagen)
+        for frame in ...:
+            partes = pool.mapear(funcion, franjas, {'imagen': fondo, 'extent': ...})
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import count, repeat
+from multiprocessing import shared_memory
+
+import numpy as np
+
+# Estado de la llamada en curso, visible para las funciones de trabajo
+TRABAJO = {}
+
+# Arreglos compartidos ya abiertos en este proceso: nombre → (memoria, vista)
+_ABIERTOS = {}
+_CONTADOR = count()
+
+
+class ArregloCompartido:
+    """Referencia liviana (picklable) a un arreglo de `PoolCompartido.compartir`."""
+
+    def __init__(self, nombre, forma, dtype):
+        self.nombre = nombre
+        self.forma = tuple(forma)
+        self.dtype = np.dtype(dtype).str
+
+    def abrir(self):
+        """Vista NumPy de solo lectura; se abre una vez por proceso."""
+        if self.nombre not in _ABIERTOS:
+            memoria = shared_memory.SharedMemory(name=self.nombre)
+            vista = np.ndarray(self.forma, dtype=self.dtype, buffer=memoria.buf)
+            vista.flags.writeable = False
+            _ABIERTOS[self.nombre] = (memoria, vista)
+        return _ABIERTOS[self.nombre][1]
+
+
+def _resolver(estado):
+    return {clave: valor.abrir() if isinstance(valor, ArregloCompartido) else valor
+            for clave, valor in estado.items()}
+
+
+def _ejecutar(funcion, estado, tarea):
+    TRABAJO.clear()
+    TRABAJO.update(_resolver(estado))
+    return funcion(tarea)
+
+
+class PoolCompartido:
+    """
+    Pool de `procesos` trabajadores que vive hasta `cerrar()` (o el fin del
+    `with`). procesos=None usa todos los núcleos.
+    """
+
+    def __init__(self, procesos=None):
+        self.procesos = procesos or os.cpu_count() or 1
+        self._pool = None
+        self._memorias = []
+        self._nombres = []
+
+    def compartir(self, arreglo):
+        """Copia `arreglo` a memoria compartida (una vez) y devuelve su referencia."""
+        arreglo = np.ascontiguousarray(arreglo)
+        nombre = f"ecel_{os.getpid()}_{next(_CONTADOR)}"
+        if self.procesos <= 1:
+            # En línea: la "referencia" apunta al arreglo local, sin copiar
+            _ABIERTOS[nombre] = (None, arreglo)
+        else:
+            memoria = shared_memory.SharedMemory(create=True, size=max(arreglo.nbytes, 1),
+                                                 name=nombre)
+            np.ndarray(arreglo.shape, dtype=arreglo.dtype, buffer=memoria.buf)[...] = arreglo
+            self._memorias.append(memoria)
+            _ABIERTOS[nombre] = (memoria, np.ndarray(arreglo.shape, dtype=arreglo.dtype,
+                                                     buffer=memoria.buf))
+        self._nombres.append(nombre)
+        return ArregloCompartido(nombre, arreglo.shape, arreglo.dtype)
+
+    def mapear(self, funcion, tareas, estado):
+        """[funcion(tarea) for tarea in tareas] con TRABAJO = estado en cada proceso."""
+        tareas = list(tareas)
+        if self.procesos <= 1 or len(tareas) <= 1:
+            TRABAJO.clear()
+            TRABAJO.update(_resolver(estado))
+            try:
+                return [funcion(tarea) for tarea in tareas]
+            finally:
+                TRABAJO.clear()
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.procesos)
+        return list(self._pool.map(_ejecutar, repeat(funcion), repeat(estado), tareas))
+
+    def cerrar(self):
+        """Termina los procesos y libera la memoria compartida."""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+        # Primero soltar las vistas locales: close() falla si quedan exportadas
+        for nombre in self._nombres:
+            _ABIERTOS.pop(nombre, None)
+        self._nombres = []
+        for memoria in self._memorias:
+            memoria.close()
+            memoria.unlink()
+        self._memorias = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *excepcion):
+        self.cerrar()
@@ -0,0 +1,155 @@
+"""
+Potencial de presión eCEL ("push gravity") por inversión FFT de Poisson.
+
+Dado un mapa de densidad de masa ρ(x, y) se resuelve
+
+    ∇²P = constante × ρ
+
+y la fuerza de empuje por unidad de masa es F = -∇P: el océano empuja a los
+cuerpos hacia donde la presión es menor, es decir, hacia las otras masas.
+
+Fronteras:
+- 'periodica': P̂(k) = -constante × ρ̂(k) / k²  (modo k = 0 se anula)
+- 'abierta':   convolución con la función de Green 2D, G = ln(r) / 2π,
+               sobre una rejilla rellenada con ceros al doble de tamaño
+               (método de Hockney), sin imágenes periódicas
+
+La FFT de la función de Green y los números de onda se precalculan en
+`SolverPresion`, así que resolver cada frame cuesta solo un par de FFT.
+Convención de rejilla: ver ecel/rejilla.py (fila 0 = y mínimo).
+"""
+import numpy as np
+
+from ecel.desplazamiento import calcular_factor_desplazamiento
+from ecel.rejilla import centros_rejilla, muestrear_bilineal, paso_rejilla
+
+
+class SolverPresion:
+    """
+    Solver de Poisson sobre una rejilla fija nx × ny que cubre `extent`.
+
+    Uso:
+        solver = SolverPresion(extent, 1024, 1024, frontera='abierta')
+        P, gx, gy = solver.resolver(rho)
+        fuerza = solver.fuerza(puntos)   # -∇P interpolado
+    """
+
+    def __init__(self, extent, nx, ny, frontera='periodica', constante=1.0):
+        if frontera not in ('periodica', 'abierta'):
+            raise ValueError(f"frontera desconocida: {frontera!r}")
+        self.extent = extent
+        self.nx = nx
+        self.ny = ny
+        self.frontera = frontera
+        self.constante = constante
+        self.dx, self.dy = paso_rejilla(extent, nx, ny)
+        self.presion = None
+        self.grad = None
+
+        if frontera == 'periodica':
+            kx = 2 * np.pi * np.fft.rfftfreq(nx, self.dx)
+            ky = 2 * np.pi * np.fft.fftfreq(ny, self.dy)
+            self._kx = kx[None, :]
+            self._ky = ky[:, None]
+            k2 = self._kx ** 2 + self._ky ** 2
+            k2[0, 0] = 1.0
+            self._inv_k2 = -1.0 / k2
+            self._inv_k2[0, 0] = 0.0
+        else:
+            self._green_hat = np.fft.rfft2(self._green_rellenada())
+
+    def _green_rellenada(self):
+        """G(r) = ln(r)/2π en la rejilla 2ny × 2nx con distancias envueltas."""
+        ix = np.arange(2 * self.nx)
+        iy = np.arange(2 * self.ny)
+        x = np.minimum(ix, 2 * self.nx - ix) * self.dx
+        y = np.minimum(iy, 2 * self.ny - iy) * self.dy
+        r = np.hypot(x[None, :], y[:, None])
+        r[0, 0] = 1.0
+        green = np.log(r) / (2 * np.pi)
+        # Celda propia: promedio de ln r sobre un disco de igual área
+        a = np.sqrt(self.dx * self.dy / np.pi)
+        green[0, 0] = (np.log(a) - 0.5) / (2 * np.pi)
+        return green
+
+    def resolver(self, rho):
+        """Devuelve (P, dP/dx, dP/dy), cada uno de forma (ny, nx)."""
+        rho = np.asarray(rho, dtype=float)
+        if rho.shape != (self.ny, self.nx):
+            raise ValueError(f"rho debe tener forma {(self.ny, self.nx)}, no {rho.shape}")
+
+        if self.frontera == 'periodica':
+            p_hat = np.fft.rfft2(rho) * (self.constante * self._inv_k2)
+            presion = np.fft.irfft2(p_hat, s=rho.shape)
+            gx = np.fft.irfft2(1j * self._kx * p_hat, s=rho.shape)
+            gy = np.fft.irfft2(1j * self._ky * p_hat, s=rho.shape)
+        else:
+            rho_hat = np.fft.rfft2(rho, s=(2 * self.ny, 2 * self.nx))
+            conv = np.fft.irfft2(rho_hat * self._green_hat, s=(2 * self.ny, 2 * self.nx))
+            presion = conv[:self.ny, :self.nx] * (self.constante * self.dx * self.dy)
+            gy, gx = np.gradient(presion, self.dy, self.dx)
+
+        self.presion = presion
+        self.grad = np.stack([gx, gy], axis=-1)
+        return presion, gx, gy
+
+    def fuerza(self, puntos):
+        """F = -∇P interpolado en puntos (M, 2) o (M, 3). Requiere resolver() antes."""
+        if self.grad is None:
+            raise RuntimeError("llamar a resolver() antes de fuerza()")
+        return -muestrear_bilineal(self.grad, self.extent, puntos)
+
+
+def mapa_densidad_masas(centros, radios, densidades, extent, nx, ny, desplazamiento=False):
+    """
+    Rasteriza discos de masa sobre la rejilla (fila 0 = y mínimo).
+
+    Cada celda dentro de un cuerpo recibe su densidad (g/cm³). Con
+    `desplazamiento=True` se usa en cambio su factor de desplazamiento,
+    para que la fuente sea el eCEL desplazado y no la masa.
+    """
+    xs, ys = centros_rejilla(extent, nx, ny)
+    dx, dy = paso_rejilla(extent, nx, ny)
+    x_min, _, y_min, _ = extent
+    mapa = np.zeros((ny, nx))
+
+    valores = np.atleast_1d(np.asarray(densidades, dtype=float))
+    if desplazamiento:
+        valores = np.atleast_1d(calcular_factor_desplazamiento(valores))
+
+    for (cx, cy, *_), radio, valor in zip(np.atleast_2d(centros), np.atleast_1d(radios), valores):
+        # Solo la caja que contiene al disco
+        i0 = max(int((cx - radio - x_min) / dx), 0)
+        i1 = min(int((cx + radio - x_min) / dx) + 2, nx)
+        j0 = max(int((cy - radio - y_min) / dy), 0)
+        j1 = min(int((cy + radio - y_min) / dy) + 2, ny)
+        if i0 >= i1 or j0 >= j1:
+            continue
+        dentro = (xs[None, i0:i1] - cx) ** 2 + (ys[j0:j1, None] - cy) ** 2 <= radio ** 2
+        mapa[j0:j1, i0:i1][dentro] += valor
+    return mapa
+
+
+def fuerza_discos(solver, centros, radios, puntos, masas=None):
+    """
+    F = -∇P en `puntos` (M, 2) o (M, 3) para discos de masa resueltos con `solver`.
+
+    Cada disco se rasteriza por separado y se renormaliza a su masa exacta
+    (π R² si no se da `masas`): así la fuerza no parpadea cuando un disco que
+    se mueve gana o pierde celdas de la rejilla.
+    """
+    centros = np.atleast_2d(np.asarray(centros, dtype=float))
+    radios = np.broadcast_to(np.asarray(radios, dtype=float), len(centros))
+    if masas is None:
+        masas = np.pi * radios ** 2
+    masas = np.broadcast_to(np.asarray(masas, dtype=float), len(centros))
+
+    area_celda = solver.dx * solver.dy
+    rho = np.zeros((solver.ny, solver.nx))
+    for centro, radio, masa in zip(centros, radios, masas):
+        disco = mapa_densidad_masas([centro], [radio], [1.0], solver.extent, solver.nx, solver.ny)
+        celdas = disco.sum()
+        if celdas > 0:
+            rho += disco * (masa / (celdas * area_celda))
+    solver.resolver(rho)
+    return solver.fuerza(puntos)
@@ -0,0 +1,55 @@
+"""
+Campos sobre rejillas regulares: coordenadas e interpolación bilineal.
+
+Convención de este módulo: un campo de forma (ny, nx[, k]) cubre
+extent = (x_min, x_max, y_min, y_max) con la fila 0 en y_min (eje y hacia
+arriba, como en Manim). Los valores están en los centros de celda.
+Para una imagen (fila 0 arriba) usar np.flipud antes.
+"""
+import numpy as np
+
+
+def paso_rejilla(extent, nx, ny):
+    """Tamaño de celda (dx, dy)."""
+    x_min, x_max, y_min, y_max = extent
+    return (x_max - x_min) / nx, (y_max - y_min) / ny
+
+
+def centros_rejilla(extent, nx, ny):
+    """Coordenadas de los centros de celda: (xs (nx,), ys (ny,))."""
+    x_min, _, y_min, _ = extent
+    dx, dy = paso_rejilla(extent, nx, ny)
+    return x_min + dx * (np.arange(nx) + 0.5), y_min + dy * (np.arange(ny) + 0.5)
+
+
+def muestrear_bilineal(campo, extent, puntos):
+    """
+    Interpola `campo` (ny, nx[, k]) en puntos arbitrarios (M, 2) o (M, 3).
+
+    Fuera de la rejilla se usa el valor del borde. Devuelve (M,) o (M, k).
+    """
+    campo = np.asarray(campo)
+    ny, nx = campo.shape[:2]
+    x_min, _, y_min, _ = extent
+    dx, dy = paso_rejilla(extent, nx, ny)
+    puntos = np.asarray(puntos, dtype=float)
+
+    fx = np.clip((puntos[:, 0] - x_min) / dx - 0.5, 0, nx - 1)
+    fy = np.clip((puntos[:, 1] - y_min) / dy - 0.5, 0, ny - 1)
+    ix = np.minimum(fx.astype(int), nx - 2) if nx > 1 else np.zeros(len(fx), dtype=int)
+    iy = np.minimum(fy.astype(int), ny - 2) if ny > 1 else np.zeros(len(fy), dtype=int)
+    tx = fx - ix
+    ty = fy - iy
+    ix1 = np.minimum(ix + 1, nx - 1)
+    iy1 = np.minimum(iy + 1, ny - 1)
+
+    if campo.ndim == 3:
+        tx = tx[:, None]
+        ty = ty[:, None]
+
+    return (
+        campo[iy, ix] * (1 - tx) * (1 - ty)
+        + campo[iy, ix1] * tx * (1 - ty)
+        + campo[iy1, ix] * (1 - tx) * ty
+        + campo[iy1, ix1] * tx * ty
+    )
@@ -0,0 +1,209 @@
+"""
+Fluido eCEL con SPH 2D (smoothed particle hydrodynamics) - "efecto piscina".
+
+Las partículas del océano (la malla de crear_oceano_fondo) se tratan como un
+fluido débilmente compresible; la masa es una frontera móvil circular que
+las empuja. Así el eCEL se abre adelante de la masa y se acomoda atrás.
+
+- Vecinos: lista de celdas (cell list) vectorizada, con margen (skin) para
+  reutilizar la lista de pares varios pasos (lista de Verlet); cada par se
+  guarda una sola vez (i < j) y las fuerzas se aplican con signo opuesto
+- Kernel: spline cúbico 2D, soporte 2h
+- Presión: p = k (ρ - ρ0), recortada a >= 0 (sin tensión, evita grumos)
+- Viscosidad artificial de Monaghan
+- Integración: Euler semi-implícito (simpléctico), paso limitado por CFL
+- Frontera móvil: penalización + proyección fuera del disco, con la
+  velocidad de la masa; paredes reflectantes en `extent`
+
+La salida son arreglos por frame (posiciones y densidades) listos para
+renderizar con Dots.
+"""
+import numpy as np
+
+_VECINOS = [(ox, oy) for ox in (-1, 0, 1) for oy in (-1, 0, 1)]
+
+
+def _kernel(r, h):
+    """W(r) y dW/dr del spline cúbico 2D (r ya dentro del soporte 2h)."""
+    sigma = 10.0 / (7.0 * np.pi * h ** 2)
+    q = r / h
+    resto = 2 - q
+    w = 0.25 * resto ** 3
+    dw = -0.75 * resto ** 2
+    interior = q < 1
+    qi = q[interior]
+    w[interior] = 1 - 1.5 * qi ** 2 + 0.75 * qi ** 3
+    dw[interior] = -3 * qi + 2.25 * qi ** 2
+    return w * sigma, dw * (sigma / h)
+
+
+class FluidoSPH:
+    """
+    posiciones: (N, 2) estado inicial (ej. malla del océano, espaciado uniforme)
+    espaciado: distancia entre partículas de la malla
+    extent: (x_min, x_max, y_min, y_max) caja con paredes
+    """
+
+    def __init__(self, posiciones, espaciado, extent, rigidez=20.0, viscosidad=0.3,
+                 factor_h=1.3, skin=0.3, reconstruir_cada=5):
+        self.pos = np.array(posiciones, dtype=float)[:, :2]
+        self.vel = np.zeros_like(self.pos)
+        self.n = len(self.pos)
+        self.extent = extent
+        self.h = factor_h * espaciado
+        self.rigidez = rigidez
+        self.viscosidad = viscosidad
+        self.c_sonido = np.sqrt(rigidez)
+        self.skin = skin * self.h
+        self.reconstruir_cada = reconstruir_cada
+        self.masa = espaciado ** 2
+        self._w_propio = 10.0 / (7.0 * np.pi * self.h ** 2)  # W(0)
+
+        self._pares = None
+        self._pasos_desde_lista = 0
+        # ρ0 de referencia = densidad de una partícula interior de la malla
+        self.rho0 = 1.0
+        i, j, _, r = self._vecinos()
+        self.rho = self._densidad(i, j, _kernel(r, self.h)[0])
+        self.rho0 = float(np.median(self.rho))
+
+    # --- vecinos -------------------------------------------------------
+    def _lista_pares(self):
+        """Pares (i, j), i < j, con r < 2h + skin, por lista de celdas."""
+        radio = 2 * self.h + self.skin
+        x_min, _, y_min, _ = self.extent
+        celdas = np.floor((self.pos - [x_min, y_min]) / radio).astype(np.int64)
+        celdas -= celdas.min(axis=0)
+        ncx, ncy = celdas.max(axis=0) + 1
+        claves = celdas[:, 0] * ncy + celdas[:, 1]
+        orden = np.argsort(claves, kind='stable')
+        ordenadas = claves[orden]
+        todas = np.arange(ncx * ncy)
+        inicio = np.searchsorted(ordenadas, todas)
+        fin = np.searchsorted(ordenadas, todas, side='right')
+
+        lista_i, lista_j = [], []
+        indices = np.arange(self.n)
+        for ox, oy in _VECINOS:
+            cx = celdas[:, 0] + ox
+            cy = celdas[:, 1] + oy
+            validos = (cx >= 0) & (cx < ncx) & (cy >= 0) & (cy < ncy)
+            i = indices[validos]
+            vecina = cx[validos] * ncy + cy[validos]
+            s, e = inicio[vecina], fin[vecina]
+            cuenta = e - s
+            total = cuenta.sum()
+            if not total:
+                continue
+            desde = np.repeat(s - (np.cumsum(cuenta) - cuenta), cuenta) + np.arange(total)
+            lista_i.append(np.repeat(i, cuenta))
+            lista_j.append(orden[desde])
+
+        i = np.concatenate(lista_i)
+        j = np.concatenate(lista_j)
+        delta = self.pos[i] - self.pos[j]
+        cerca = (i < j) & (np.einsum('nk,nk->n', delta, delta) < radio ** 2)
+        return i[cerca], j[cerca]
+
+    def _vecinos(self):
+        """Pares dentro del soporte 2h, con vector y distancia (reutiliza la lista)."""
+        if self._pares is None or self._pasos_desde_lista >= self.reconstruir_cada:
+            self._pares = self._lista_pares()
+            self._pasos_desde_lista = 0
+        self._pasos_desde_lista += 1
+        i, j = self._pares
+        delta = self.pos[i] - self.pos[j]
+        r = np.sqrt(np.einsum('nk,nk->n', delta, delta))
+        soporte = r < 2 * self.h
+        return i[soporte], j[soporte], delta[soporte], r[soporte]
+
+    # --- física --------------------------------------------------------
+    def _densidad(self, i, j, w):
+        suma = np.bincount(i, weights=w, minlength=self.n) + np.bincount(j, weights=w, minlength=self.n)
+        return self.masa * (suma + self._w_propio)
+
+    def _aceleracion(self, i, j, delta, r):
+        w, dw = _kernel(r, self.h)
+        self.rho = self._densidad(i, j, w)
+        presion = np.maximum(self.rigidez * (self.rho - self.rho0), 0.0)
+
+        termino = presion[i] / self.rho[i] ** 2 + presion[j] / self.rho[j] ** 2
+
+        # Viscosidad artificial (Monaghan): solo pares que se acercan
+        dv = self.vel[i] - self.vel[j]
+        vr = np.einsum('nk,nk->n', dv, delta)
+        mu = self.h * vr / (r ** 2 + 0.01 * self.h ** 2)
+        rho_media = 0.5 * (self.rho[i] + self.rho[j])
+        termino -= np.where(vr < 0, self.viscosidad * self.c_sonido * mu / rho_media, 0.0)
+
+        # Fuerza sobre i; sobre j es la opuesta
+        fuerza = (-self.masa * termino * dw / np.maximum(r, 1e-12))[:, None] * delta
+        acc = np.empty_like(self.pos)
+        for eje in range(2):
+            acc[:, eje] = (np.bincount(i, weights=fuerza[:, eje], minlength=self.n)
+                           - np.bincount(j, weights=fuerza[:, eje], minlength=self.n))
+        return acc
+
+    def _frontera_masa(self, acc, centro, radio, vel_masa):
+        """Penalización cerca del disco + proyección de las que quedaron dentro."""
+        delta = self.pos - centro
+        d = np.sqrt(np.einsum('nk,nk->n', delta, delta))
+        normal = delta / np.maximum(d, 1e-12)[:, None]
+
+        capa = radio + self.h
+        cerca = d < capa
+        acc[cerca] += (self.rigidez * (capa - d[cerca]) / self.h)[:, None] * normal[cerca]
+
+        dentro = d < radio
+        if dentro.any():
+            self.pos[dentro] = centro + normal[dentro] * radio
+            v_rel = self.vel[dentro] - vel_masa
+            vn = np.einsum('nk,nk->n', v_rel, normal[dentro])
+            self.vel[dentro] -= np.minimum(vn, 0.0)[:, None] * normal[dentro]
+
+    def _paredes(self):
+        x_min, x_max, y_min, y_max = self.extent
+        for eje, (lo, hi) in enumerate(((x_min, x_max), (y_min, y_max))):
+            fuera = (self.pos[:, eje] < lo) | (self.pos[:, eje] > hi)
+            self.pos[:, eje] = np.clip(self.pos[:, eje], lo, hi)
+            self.vel[fuera, eje] *= -0.5
+
+    def paso_maximo(self):
+        """dt estable (CFL + viscosidad)."""
+        v_max = np.sqrt(np.einsum('nk,nk->n', self.vel, self.vel).max())
+        return 0.25 * self.h / (self.c_sonido + v_max)
+
+    def paso(self, dt, centro_masa, radio_masa, vel_masa):
+        """Avanza un paso de Euler semi-implícito."""
+        acc = self._aceleracion(*self._vecinos())
+        self._frontera_masa(acc, centro_masa, radio_masa, vel_masa)
+        self.vel += acc * dt
+        self.pos += self.vel * dt
+        self._paredes()
+
+    def simular(self, trayectoria, radio_masa, duracion, fps=30, pasos_por_frame=None):
+        """
+        Simula con la masa siguiendo `trayectoria(t) -> (x, y)`.
+
+        Devuelve (posiciones (F, N, 2), densidades relativas ρ/ρ0 (F, N)),
+        ambos float32, con F = duracion × fps + 1 frames.
+        """
+        n_frames = int(round(duracion * fps)) + 1
+        dt_frame = 1.0 / fps
+        frames_pos = np.empty((n_frames, self.n, 2), dtype=np.float32)
+        frames_rho = np.empty((n_frames, self.n), dtype=np.float32)
+
+        t = 0.0
+        for f in range(n_frames):
+            frames_pos[f] = self.pos
+            frames_rho[f] = self.rho / self.rho0
+            if f == n_frames - 1:
+                break
+            sub = pasos_por_frame or max(1, int(np.ceil(dt_frame / self.paso_maximo())))
+            dt = dt_frame / sub
+            for _ in range(sub):
+                centro = np.asarray(trayectoria(t), dtype=float)
+                vel_masa = (np.asarray(trayectoria(t + dt), dtype=float) - centro) / dt
+                self.paso(dt, centro, radio_masa, vel_masa)
+                t += dt
+        return frames_pos, frames_rho
@@ -0,0 +1,143 @@
+"""
+Trayectorias precalculadas: integrar una vez, reproducir muchas.
+
+La física se integra antes del render (ecel.nbody) y se guarda en la caché
+de geometría (ecel.cache) con clave = condiciones iniciales + modelo. En disco
+quedan pocas muestras por segundo (float32, posición y velocidad); al
+reproducir se interpolan con splines de Hermite cúbicos, que usan la
+velocidad real en cada muestra y son exactos hasta tercer orden.
+
+Los updaters de una escena solo indexan una tabla (F, B, 2) ya remuestreada a
+los tiempos de frame, así que cambiar colores, estelas o cámara nunca vuelve a
+correr la física.
+
+Remuestreo por longitud de arco: `por_longitud_arco()` da puntos igualmente
+espaciados sobre el camino (para dibujar órbitas sin amontonar puntos en el
+perihelio, o para mover un cuerpo a rapidez constante).
+"""
+import numpy as np
+
+from ecel.nbody import ModeloECEL, Newton, dopri5
+
+MODELOS = {'newton': Newton, 'ecel': ModeloECEL}
+
+
+class Trayectoria:
+    """
+    Camino de B cuerpos muestreado en tiempos t (T,).
+
+    pos, vel: (T, B, 2) o (T, 2). Sin velocidades se estiman con diferencias
+    centradas (spline de Catmull-Rom).
+    """
+
+    def __init__(self, t, pos, vel=None):
+        self.t = np.asarray(t, dtype=float)
+        pos = np.asarray(pos, dtype=float)
+        self.un_cuerpo = pos.ndim == 2
+        self.pos = pos[:, None, :] if self.un_cuerpo else pos
+        if vel is None:
+            self.vel = np.gradient(self.pos, self.t, axis=0)
+        else:
+            vel = np.asarray(vel, dtype=float)
+            self.vel = vel[:, None, :] if self.un_cuerpo else vel
+        self._arco = None
+
+    @property
+    def duracion(self):
+        return self.t[-1] - self.t[0]
+
+    def en_tiempos(self, tiempos):
+        """Posiciones (M, B, 2) en tiempos arbitrarios (recortados al rango)."""
+        tiempos = np.clip(np.asarray(tiempos, dtype=float), self.t[0], self.t[-1])
+        i = np.clip(np.searchsorted(self.t, tiempos, side='right') - 1, 0, len(self.t) - 2)
+        h = (self.t[i + 1] - self.t[i])[:, None, None]
+        s = ((tiempos - self.t[i]) / h[:, 0, 0])[:, None, None]
+        s2 = s * s
+        s3 = s2 * s
+        resultado = (
+            (2 * s3 - 3 * s2 + 1) * self.pos[i]
+            + (s3 - 2 * s2 + s) * h * self.vel[i]
+            + (-2 * s3 + 3 * s2) * self.pos[i + 1]
+            + (s3 - s2) * h * self.vel[i + 1]
+        )
+        return resultado[:, 0] if self.un_cuerpo else resultado
+
+    def frames(self, fps, duracion_video=None):
+        """
+        Tabla (F, B, 2) para reproducir a `fps`.
+
+        Si `duracion_video` difiere de la duración física, el tiempo se
+        estira o comprime linealmente.
+        """
+        duracion_video = self.duracion if duracion_video is None else duracion_video
+        n_frames = int(round(duracion_video * fps)) + 1
+        tiempos = self.t[0] + np.linspace(0.0, self.duracion, n_frames)
+        return self.en_tiempos(tiempos)
+
+    def _arco_denso(self, submuestras):
+        """Tiempos finos y longitud de arco acumulada (Tf, B) sobre el spline."""
+        if self._arco is None or self._arco[0] != submuestras:
+            n = (len(self.t) - 1) * submuestras + 1
+            t_fino = np.interp(np.linspace(0, len(self.t) - 1, n), np.arange(len(self.t)), self.t)
+            puntos = self.en_tiempos(t_fino)
+            if self.un_cuerpo:
+                puntos = puntos[:, None, :]
+            tramos = np.linalg.norm(np.diff(puntos, axis=0), axis=-1)
+            arco = np.vstack([np.zeros((1, tramos.shape[1])), np.cumsum(tramos, axis=0)])
+            self._arco = (submuestras, t_fino, arco)
+        return self._arco[1], self._arco[2]
+
+    def longitud(self, submuestras=8):
+        """Longitud total del camino de cada cuerpo (B,) (escalar con un cuerpo)."""
+        _, arco = self._arco_denso(submuestras)
+        return arco[-1, 0] if self.un_cuerpo else arco[-1]
+
+    def tiempos_por_arco(self, n, cuerpo=0, submuestras=8):
+        """n tiempos en los que `cuerpo` recorrió longitudes de arco equiespaciadas."""
+        t_fino, arco = self._arco_denso(submuestras)
+        objetivo = np.linspace(0.0, arco[-1, cuerpo], n)
+        return np.interp(objetivo, arco[:, cuerpo], t_fino)
+
+    def por_longitud_arco(self, n, cuerpo=0, submuestras=8):
+        """n puntos (n, 2) de `cuerpo` igualmente espaciados sobre su camino."""
+        puntos = self.en_tiempos(self.tiempos_por_arco(n, cuerpo, submuestras))
+        return puntos if self.un_cuerpo else puntos[:, cuerpo]
+
+
+def integrar_cacheado(cache, posiciones, velocidades, modelo, params_modelo, duracion,
+                      muestras_por_segundo=20, rtol=1e-10):
+    """
+    Trayectoria de un sistema de B cuerpos, integrada con dopri5 o leída de caché.
+
+    posiciones, velocidades: (B, 2). modelo: 'newton' o 'ecel';
+    params_modelo: argumentos del constructor del modelo de fuerza. Se guardan
+    `muestras_por_segundo` muestras por unidad de tiempo físico.
+    """
+    if modelo not in MODELOS:
+        raise ValueError(f"modelo desconocido: {modelo!r}")
+    posiciones = np.asarray(posiciones, dtype=float)[:, :2]
+    velocidades = np.asarray(velocidades, dtype=float)[:, :2]
+    params = {
+        'posiciones': posiciones,
+        'velocidades': velocidades,
+        'modelo': modelo,
+        'params_modelo': params_modelo,
+        'duracion': duracion,
+        'muestras_por_segundo': muestras_por_segundo,
+        'rtol': rtol,
+    }
+
+    def generar():
+        fuerza = MODELOS[modelo](**params_modelo)
+        n = int(np.ceil(duracion * muestras_por_segundo)) + 1
+        t = np.linspace(0.0, duracion, n)
+        resultado = dopri5(posiciones[None], velocidades[None], fuerza, t,
+                           rtol=rtol, atol=rtol * 1e-2)
+        return {
+            't': t,
+            'pos': resultado['pos'][:, 0].astype(np.float32),
+            'vel': resultado['vel'][:, 0].astype(np.float32),
+        }
+
+    datos = cache.obtener('trayectoria', params, generar)
+    return Trayectoria(datos['t'], datos['pos'], datos['vel'])
@@ -1,6 +1,13 @@
 from manim import *
 import numpy as np
 
+from ecel.poisson import SolverPresion, fuerza_discos
+from ecel.geometria import puntos_bezier
+
+# Presión del océano eCEL: ∇²P = ρ con frontera abierta sobre todo el frame
+PRESSURE_SOLVER = SolverPresion((-8, 8, -4.5, 4.5), 320, 180, frontera='abierta')
+PLANET_RADIUS = 0.3
+
 class OceanGravity(Scene):
     def construct(self):
         # Título
@@ -17,11 +24,11 @@ class OceanGravity(Scene):
         self.play(Create(ocean_grid), run_time=2)
         
         # Crear dos planetas
-        planet1 = Circle(radius=0.3, color=BLUE, fill_opacity=0.8)
+        planet1 = Circle(radius=PLANET_RADIUS, color=BLUE, fill_opacity=0.8)
         planet1.move_to(LEFT * 3)
         planet1_label = Text("M₁", font_size=20).next_to(planet1, UP, buff=0.1)
         
-        planet2 = Circle(radius=0.3, color=RED, fill_opacity=0.8)
+        planet2 = Circle(radius=PLANET_RADIUS, color=RED, fill_opacity=0.8)
         planet2.move_to(RIGHT * 3)
         planet2_label = Text("M₂", font_size=20).next_to(planet2, UP, buff=0.1)
         
@@ -34,8 +41,8 @@ class OceanGravity(Scene):
         self.wait(1)
         
         # Mostrar presión océano (flechas empujando)
-        arrows1 = self.create_pressure_arrows(planet1, direction="inward")
-        arrows2 = self.create_pressure_arrows(planet2, direction="inward")
+        arrows1 = self.create_pressure_arrows(planet1, planet2, direction="inward")
+        arrows2 = self.create_pressure_arrows(planet2, planet1, direction="inward")
         
         self.play(
             *[GrowArrow(arrow) for arrow in arrows1],
@@ -47,11 +54,16 @@ class OceanGravity(Scene):
         # Deformar océano (gradient de presión)
         deformed_grid = self.create_deformed_grid(planet1, planet2)
         self.play(
-            Transform(ocean_grid, deformed_grid),
+            ReplacementTransform(ocean_grid, deformed_grid),
             run_time=3
         )
         self.wait(1)
         
+        # El grid sigue a los planetas: se re-deforma cada frame
+        deformed_grid.add_updater(
+            lambda grid: self.update_deformed_grid(grid, planet1, planet2)
+        )
+        
         # Planetas se acercan (empujados por océano)
         self.play(
             planet1.animate.shift(RIGHT * 1.5),
@@ -61,6 +73,7 @@ class OceanGravity(Scene):
             run_time=3,
             rate_func=smooth
         )
+        deformed_grid.clear_updaters()
         self.wait(1)
         
         # Texto explicativo
@@ -101,35 +114,28 @@ class OceanGravity(Scene):
         grid.set_opacity(0.3)
         return grid
     
-    def create_pressure_arrows(self, obj, direction="inward"):
-        """Crea flechas de presión alrededor de objeto"""
+    def create_pressure_arrows(self, obj, *others, direction="inward"):
+        """Crea flechas de presión alrededor de objeto, a lo largo de F = -∇P de todas las masas"""
         arrows = VGroup()
         center = obj.get_center()
         radius = 1.5
         
-        for angle in np.arange(0, 2*PI, PI/4):
-            start_point = center + radius * np.array([
-                np.cos(angle), 
-                np.sin(angle), 
-                0
-            ])
-            
-            if direction == "inward":
-                end_point = center + (radius * 0.7) * np.array([
-                    np.cos(angle), 
-                    np.sin(angle), 
-                    0
-                ])
-            else:  # outward
-                end_point = center + (radius * 1.3) * np.array([
-                    np.cos(angle), 
-                    np.sin(angle), 
-                    0
-                ])
-            
+        angles = np.arange(0, 2*PI, PI/4)
+        starts = center + radius * np.stack(
+            [np.cos(angles), np.sin(angles), np.zeros_like(angles)], axis=1
+        )
+        centers = [body.get_center() for body in (obj, *others)]
+        force = fuerza_discos(PRESSURE_SOLVER, centers, PLANET_RADIUS, starts)
+        
+        # La flecha más fuerte mide 0.3 × radio, el resto proporcional a |F|
+        vectors = force * (0.3 * radius / np.linalg.norm(force, axis=1).max())
+        if direction == "outward":
+            vectors = -vectors
+        
+        for start_point, vector in zip(starts, vectors):
             arrow = Arrow(
                 start=start_point,
-                end=end_point,
+                end=start_point + np.append(vector, 0),
                 color=YELLOW,
                 stroke_width=3,
                 buff=0
@@ -138,79 +144,69 @@ class OceanGravity(Scene):
         
         return arrows
     
-    def create_deformed_grid(self, obj1, obj2):
-        """Crea grid deformado por presencia de masa"""
+    def create_deformed_grid(self, *bodies, step=0.2):
+        """Crea grid deformado por presencia de cualquier número de masas"""
         grid = VGroup()
+        centers = [body.get_center() for body in bodies]
+        
+        # Todas las líneas se deforman con una sola solución de presión
+        grid.samples = self.grid_samples(step)
+        for warped in self.warp_samples(grid.samples, centers):
+            for points in puntos_bezier(warped):
+                line = VMobject()
+                line.set_points(points)
+                line.set_color(BLUE_E)
+                line.set_stroke(width=1)
+                grid.add(line)
         
-        c1 = obj1.get_center()
-        c2 = obj2.get_center()
+        grid.set_opacity(0.3)
+        return grid
+    
+    def update_deformed_grid(self, grid, *bodies):
+        """Re-deforma el grid desde los centros actuales, escribiendo directo en los puntos de cada línea"""
+        centers = [body.get_center() for body in bodies]
+        lines = iter(grid.submobjects)
+        
+        for warped in self.warp_samples(grid.samples, centers):
+            for points, line in zip(puntos_bezier(warped), lines):
+                line.points[:] = points
+    
+    def warp_samples(self, samples, centers):
+        """Deforma todos los arreglos de muestras con un solo cálculo de presión"""
+        flat = np.concatenate([s.reshape(-1, 3) for s in samples])
+        warped = pressure_warp(flat, centers)
+        cuts = np.cumsum([s.shape[0] * s.shape[1] for s in samples])[:-1]
+        return [w.reshape(s.shape) for w, s in zip(np.split(warped, cuts), samples)]
+    
+    def grid_samples(self, step=0.2):
+        """Puntos muestreados de las líneas del grid: (horizontales, verticales), cada uno (líneas, muestras, 3)"""
+        line_ys = np.arange(-3, 3.5, 0.5)
+        line_xs = np.arange(-6, 6.5, 0.5)
         
-        # Grid deformado
-        for y in np.arange(-3, 3.5, 0.5):
-            points = []
-            for x in np.arange(-6, 6.5, 0.2):
-                point = np.array([x, y, 0])
-                
-                # Deformación por obj1
-                dist1 = np.linalg.norm(point[:2] - c1[:2])
-                if dist1 > 0:
-                    deform1 = 0.3 * np.exp(-dist1) * (c1[:2] - point[:2]) / dist1
-                else:
-                    deform1 = np.array([0, 0])
-                
-                # Deformación por obj2
-                dist2 = np.linalg.norm(point[:2] - c2[:2])
-                if dist2 > 0:
-                    deform2 = 0.3 * np.exp(-dist2) * (c2[:2] - point[:2]) / dist2
-                else:
-                    deform2 = np.array([0, 0])
-                
-                deformed = point + np.array([
-                    deform1[0] + deform2[0],
-                    deform1[1] + deform2[1],
-                    0
-                ])
-                points.append(deformed)
-            
-            line = VMobject()
-            line.set_points_smoothly(points)
-            line.set_color(BLUE_E)
-            line.set_stroke(width=1)
-            grid.add(line)
+        xs = np.arange(-6, 6.5, step)
+        hx, hy = np.meshgrid(xs, line_ys)
+        horizontal = np.stack([hx, hy, np.zeros_like(hx)], axis=-1)
         
-        # Grid vertical deformado
-        for x in np.arange(-6, 6.5, 0.5):
-            points = []
-            for y in np.arange(-3, 3.5, 0.2):
-                point = np.array([x, y, 0])
-                
-                dist1 = np.linalg.norm(point[:2] - c1[:2])
-                if dist1 > 0:
-                    deform1 = 0.3 * np.exp(-dist1) * (c1[:2] - point[:2]) / dist1
-                else:
-                    deform1 = np.array([0, 0])
-                
-                dist2 = np.linalg.norm(point[:2] - c2[:2])
-                if dist2 > 0:
-                    deform2 = 0.3 * np.exp(-dist2) * (c2[:2] - point[:2]) / dist2
-                else:
-                    deform2 = np.array([0, 0])
-                
-                deformed = point + np.array([
-                    deform1[0] + deform2[0],
-                    deform1[1] + deform2[1],
-                    0
-                ])
-                points.append(deformed)
-            
-            line = VMobject()
-            line.set_points_smoothly(points)
-            line.set_color(BLUE_E)
-            line.set_stroke(width=1)
-            grid.add(line)
+        ys = np.arange(-3, 3.5, step)
+        vy, vx = np.meshgrid(ys, line_xs)
+        vertical = np.stack([vx, vy, np.zeros_like(vx)], axis=-1)
         
-        grid.set_opacity(0.3)
-        return grid
+        return horizontal, vertical
+
+
+def pressure_warp(points, centers, strength=0.3, radius=PLANET_RADIUS):
+    """
+    Deforma puntos (N, 3) a lo largo de la fuerza de empuje F = -∇P del
+    océano eCEL (solver de Poisson), sumada sobre todas las masas. Escala:
+    un punto en la superficie de una masa aislada se mueve `strength`
+    (ahí |F| = R / 2 con la masa π R²).
+    """
+    points = np.asarray(points, dtype=float)
+    force = fuerza_discos(PRESSURE_SOLVER, centers, radius, points)
+    
+    warped = points.copy()
+    warped[:, :2] += force * (strength / (radius / 2))
+    return warped
 
 
 # Para renderizar: